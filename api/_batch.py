@@ -0,0 +1,161 @@
+"""Batch resume ingestion
+
+A batch is any mix of PDF and DOCX uploads and zip archives of them. Uploads
+are expanded into documents, identical documents are processed once (matched
+by content hash), and unique documents run through a bounded number of
+concurrent workers. Results are yielded in completion order so the route can
+stream progress as NDJSON.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import posixpath
+import zipfile
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+# Times a batch document waits out a saturated extraction pool before failing
+BATCH_POOL_RETRIES = int(os.getenv("BATCH_POOL_RETRIES", "5"))
+# Bytes of documents a batch may hold once its archives are inflated
+MAX_BATCH_BYTES = int(os.getenv("MAX_BATCH_BYTES", str(100 * 1024 * 1024)))
+MAX_FILE_BYTES = 5 * 1024 * 1024
+# PDFs and DOCX files barely compress; members past this ratio are not resumes
+MAX_COMPRESSION_RATIO = 100
+SUPPORTED_SUFFIXES = (".pdf", ".docx")
+
+
+class BatchTooLargeError(ValueError):
+    """The batch holds more than MAX_BATCH_FILES documents or MAX_BATCH_BYTES"""
+
+
+def _too_large(max_bytes: int) -> BatchTooLargeError:
+    megabytes = max_bytes // (1024 * 1024)
+    return BatchTooLargeError(f"A batch may hold at most {megabytes}MB of resumes")
+
+
+def _check_document(filename: str, size: int):
+    """Error message for a document that must be skipped, or None"""
+    if not filename.lower().endswith(SUPPORTED_SUFFIXES):
+        return "Only PDF and DOCX files are supported"
+    if size > MAX_FILE_BYTES:
+        return "File size must be less than 5MB"
+    return None
+
+
+def expand_upload(filename: str, content: bytes, max_bytes: int = MAX_BATCH_BYTES):
+    """Yield (filename, content, error) for an upload or each zip member
+
+    Members are checked from the archive directory before they are
+    decompressed, so an oversized or suspiciously compressed entry is never
+    inflated. ``zipfile`` reads no more than the size the directory states.
+    Raises BatchTooLargeError once the members would inflate past
+    ``max_bytes`` in all.
+    """
+    if not filename.lower().endswith(".zip"):
+        error = _check_document(filename, len(content))
+        yield filename, None if error else content, error
+        return
+
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(content))
+    except zipfile.BadZipFile:
+        yield filename, None, "Invalid zip archive"
+        return
+
+    inflated = 0
+    with archive:
+        for info in archive.infolist():
+            basename = posixpath.basename(info.filename)
+            # Skip folders and the metadata files macOS adds to archives
+            if info.is_dir() or basename.startswith("."):
+                continue
+            if info.filename.startswith("__MACOSX/"):
+                continue
+            member = f"{filename}/{info.filename}"
+            error = _check_document(basename, info.file_size)
+            ratio = info.file_size / max(info.compress_size, 1)
+            if not error and ratio > MAX_COMPRESSION_RATIO:
+                error = "File is compressed too far to be a resume"
+            if error:
+                yield member, None, error
+                continue
+            inflated += info.file_size
+            if inflated > max_bytes:
+                raise _too_large(max_bytes)
+            yield member, archive.read(info), None
+
+
+def expand_uploads(
+    uploads, max_files: int = MAX_BATCH_FILES, max_bytes: int = MAX_BATCH_BYTES
+) -> list:
+    """Expand (filename, content) uploads into a list of documents"""
+    documents = []
+    total = 0
+    for filename, content in uploads:
+        for document in expand_upload(filename, content, max_bytes - total):
+            documents.append(document)
+            if len(documents) > max_files:
+                raise BatchTooLargeError(
+                    f"A batch may contain at most {max_files} resumes"
+                )
+            if document[1] is not None:
+                total += len(document[1])
+                if total > max_bytes:
+                    raise _too_large(max_bytes)
+    return documents
+
+
+async def run_batch(documents, process, workers: int = BATCH_WORKERS):
+    """Yield one result dict per document, in completion order
+
+    ``process`` is a coroutine function taking (filename, content) and
+    returning a dict of fields for the result; an exception becomes a failed
+    result. A document identical to an earlier one is not processed again:
+    its result is yielded right after the original's, marked ``duplicateOf``.
+    """
+    semaphore = asyncio.Semaphore(workers)
+    duplicates = {}
+    unique = []
+
+    for index, (filename, content, error) in enumerate(documents):
+        if error:
+            yield {
+                "index": index,
+                "filename": filename,
+                "success": False,
+                "error": error,
+            }
+            continue
+        digest = hashlib.sha256(content).hexdigest()
+        if digest in duplicates:
+            duplicates[digest].append((index, filename))
+            continue
+        duplicates[digest] = []
+        unique.append((index, filename, content, digest))
+
+    async def run(index, filename, content, digest):
+        async with semaphore:
+            try:
+                fields = {"success": True, **await process(filename, content)}
+            except Exception as e:
+                fields = {"success": False, "error": str(e)}
+        return index, filename, digest, fields
+
+    tasks = [asyncio.ensure_future(run(*document)) for document in unique]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, filename, digest, fields = await next_done
+            yield {"index": index, "filename": filename, **fields}
+            for duplicate_index, duplicate_name in duplicates[digest]:
+                yield {
+                    "index": duplicate_index,
+                    "filename": duplicate_name,
+                    "duplicateOf": index,
+                    **fields,
+                }
+    finally:
+        # The client went away; stop the documents still waiting for a worker
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,215 @@
+"""Pluggable result caches shared by the API handlers
+
+Two backends are available, selected with the CACHE_BACKEND environment
+variable:
+
+- ``memory``: in-process LRU with a TTL (default)
+- ``sqlite``: on-disk store that survives serverless cold starts
+
+Both keep at most ``CACHE_MAX_ENTRIES`` per namespace.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from _contact import CONTACT_PROMPT_VERSION
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+# Bump when the fields cached per resume change, so old entries are not reused
+RESUME_CACHE_VERSION = "2"
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# Resumes whose contact details fell back to regex are tried again sooner
+CACHE_FALLBACK_TTL_SECONDS = float(os.getenv("CACHE_FALLBACK_TTL_SECONDS", "600"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+# /tmp is the only writable location on Vercel
+CACHE_SQLITE_PATH = os.getenv(
+    "CACHE_SQLITE_PATH", "/tmp/interview-assistant-cache.sqlite3"
+)
+
+
+class MemoryCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(
+        self, namespace, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SQLiteCache:
+    """SQLite-backed cache; hit/miss counters are persisted alongside entries
+
+    Writes delete the namespace's expired rows and, past ``max_entries``,
+    the rows closest to expiring.
+    """
+
+    def __init__(
+        self,
+        namespace,
+        path=CACHE_SQLITE_PATH,
+        ttl=CACHE_TTL_SECONDS,
+        max_entries=CACHE_MAX_ENTRIES,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT, key TEXT, value TEXT, expires_at REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_expires_at "
+                "ON cache_entries (namespace, expires_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_stats ("
+                "namespace TEXT PRIMARY KEY, hits INTEGER, misses INTEGER)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache_stats VALUES (?, 0, 0)", (namespace,)
+            )
+
+    def _count(self, column):
+        self._conn.execute(
+            f"UPDATE cache_stats SET {column} = {column} + 1 WHERE namespace = ?",
+            (self.namespace,),
+        )
+
+    def get(self, key):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None or row[1] < time.time():
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                self._count("misses")
+                return None
+
+            self._count("hits")
+            return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), expires_at),
+            )
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND expires_at < ?",
+                (self.namespace, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache_entries WHERE namespace = ? "
+                "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()[0]
+            hits, misses = self._conn.execute(
+                "SELECT hits, misses FROM cache_stats WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+        }
+
+
+CACHE_BACKENDS = {"memory": MemoryCache, "sqlite": SQLiteCache}
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str):
+    """Return the process-wide cache for ``namespace``, creating it on first use"""
+    with _caches_lock:
+        if namespace not in _caches:
+            backend = CACHE_BACKENDS.get(CACHE_BACKEND)
+            if backend is None:
+                raise ValueError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+            _caches[namespace] = backend(namespace)
+        return _caches[namespace]
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for every cache used by this process"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.namespace: cache.stats() for cache in caches}
+
+
+def resume_cache_key(file_content: bytes, model_name: str) -> str:
+    """Content-addressed key for a parsed resume"""
+    digest = hashlib.sha256(file_content).hexdigest()
+    return f"{model_name}:{CONTACT_PROMPT_VERSION}.{RESUME_CACHE_VERSION}:{digest}"
+
+
+def resume_cache_ttl(contact_info: dict):
+    """TTL for a parsed resume; None keeps the cache's default
+
+    Contact details from the regex fallback are cached briefly, so the
+    model gets another go once it is reachable again.
+    """
+    if contact_info.get("source") == "regex":
+        return CACHE_FALLBACK_TTL_SECONDS
+    return None
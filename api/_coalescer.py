@@ -0,0 +1,130 @@
+"""Micro-batching of concurrent model calls
+
+Concurrent uploads each used to make their own contact-extraction call. A
+``Coalescer`` holds submitted items for a short window, or until a batch is
+full, sends them as one batched call and fans the results back out to the
+waiting requests. Items the batched call could not answer are retried one by
+one when fallback is enabled.
+
+Configured with environment variables:
+
+- ``CONTACT_COALESCE``: ``1`` to enable coalescing (default off)
+- ``CONTACT_COALESCE_WINDOW_MS``: how long the first item waits for company
+- ``CONTACT_COALESCE_MAX_BATCH``: flush as soon as this many items are waiting
+- ``CONTACT_COALESCE_FALLBACK``: ``0`` to fail unanswered items instead of
+  retrying them with single calls
+"""
+
+import asyncio
+import os
+
+CONTACT_COALESCE = os.getenv("CONTACT_COALESCE", "0") == "1"
+CONTACT_COALESCE_WINDOW_MS = float(os.getenv("CONTACT_COALESCE_WINDOW_MS", "10"))
+CONTACT_COALESCE_MAX_BATCH = int(os.getenv("CONTACT_COALESCE_MAX_BATCH", "8"))
+CONTACT_COALESCE_FALLBACK = os.getenv("CONTACT_COALESCE_FALLBACK", "1") == "1"
+
+
+class Coalescer:
+    """Gather concurrent single-item calls into batched calls
+
+    ``batch_call`` is a coroutine function taking a list of items and
+    returning a list of the same length, with None for items it could not
+    answer. ``single_call`` is a coroutine function for one item, used for a
+    lone item and for fallback.
+    """
+
+    def __init__(
+        self,
+        batch_call,
+        single_call,
+        window: float = CONTACT_COALESCE_WINDOW_MS / 1000,
+        max_batch: int = CONTACT_COALESCE_MAX_BATCH,
+        fallback: bool = CONTACT_COALESCE_FALLBACK,
+    ):
+        self.batch_call = batch_call
+        self.single_call = single_call
+        self.window = window
+        self.max_batch = max_batch
+        self.fallback = fallback
+        self.batches = 0
+        self.items = 0
+        self.fallbacks = 0
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def submit(self, item):
+        """Queue ``item`` and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        # Requests that went away while waiting need no answer
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+
+        if len(batch) == 1:
+            # Nobody else arrived within the window; no need for the batch prompt
+            await self._single(*batch[0])
+            return
+
+        error = None
+        try:
+            results = await self.batch_call([item for item, _ in batch])
+        except Exception as e:
+            results, error = [None] * len(batch), e
+
+        retries = []
+        for (item, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is not None:
+                future.set_result(result)
+            elif self.fallback:
+                retries.append((item, future))
+            else:
+                future.set_exception(
+                    error or ValueError("The batched call returned no result")
+                )
+
+        self.fallbacks += len(retries)
+        await asyncio.gather(*(self._single(item, future) for item, future in retries))
+
+    async def _single(self, item, future):
+        try:
+            result = await self.single_call(item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "fallbacks": self.fallbacks,
+            "windowMs": self.window * 1000,
+            "maxBatch": self.max_batch,
+        }
@@ -0,0 +1,348 @@
+"""Contact-information extraction shared by the resume parsing endpoints"""
+
+import os
+import re
+
+from _llm_json import extract_json
+from _metrics import timed
+from _resume_text import compact_resume
+
+CONTACT_FIELDS = ("name", "email", "phone")
+
+# Bump whenever the prompts or the local extractor change meaningfully, so
+# cached results produced by the old logic are not reused
+CONTACT_PROMPT_VERSION = "3"
+
+# Fields whose local confidence is at or above this skip the model call
+FAST_PATH_THRESHOLD = float(os.getenv("CONTACT_FAST_PATH_THRESHOLD", "0.8"))
+
+# Contact details are expected in the first few lines of a resume
+HEADER_LINES = 8
+
+MAILTO_PATTERN = re.compile(
+    r"mailto:([\w.%+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,})", re.I
+)
+EMAIL_PATTERN = re.compile(r"\b[\w.%+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}\b")
+
+# Ordered from most to least specific; the first pattern to match wins
+PHONE_PATTERNS = [
+    # International: +44 20 7946 0958, +91-98765-43210, +1 (415) 555-0134
+    re.compile(r"\+\d{1,3}[\s.-]?\(?\d{1,4}\)?(?:[\s.-]?\d{2,5}){1,4}"),
+    # North American: (415) 555-0134, 415.555.0134
+    re.compile(r"(?<!\d)\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)"),
+    # National trunk prefix: 020 7946 0958, 0151-496-0123
+    re.compile(r"(?<!\d)0\d{2,4}[\s.-]?\d{3,4}[\s.-]?\d{3,4}(?!\d)"),
+    # Ten digits split in the middle: 98765 43210
+    re.compile(r"(?<!\d)\d{5}[\s-]\d{5}(?!\d)"),
+]
+
+NAME_LABEL_PATTERN = re.compile(r"^\s*name\s*[:\-]\s*(.+)$", re.I | re.M)
+NAME_STOP_WORDS = {
+    "resume",
+    "curriculum",
+    "vitae",
+    "cv",
+    "profile",
+    "summary",
+    "experience",
+    "education",
+    "skills",
+    "contact",
+    "objective",
+    "engineer",
+    "developer",
+    "manager",
+    "street",
+    "road",
+    "avenue",
+}
+
+# Schema handed to Gemini so the response is constrained to a single JSON object
+CONTACT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "nullable": True},
+        "email": {"type": "string", "nullable": True},
+        "phone": {"type": "string", "nullable": True},
+        "confidence": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "number"},
+                "email": {"type": "number"},
+                "phone": {"type": "number"},
+            },
+            "required": list(CONTACT_FIELDS),
+        },
+    },
+    "required": list(CONTACT_FIELDS) + ["confidence"],
+}
+
+CONTACT_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": CONTACT_RESPONSE_SCHEMA,
+    "temperature": 0,
+}
+
+
+# Several resumes in one call: one schema-constrained object per document
+MULTI_CONTACT_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        **CONTACT_RESPONSE_SCHEMA,
+        "properties": {
+            "document": {"type": "integer"},
+            **CONTACT_RESPONSE_SCHEMA["properties"],
+        },
+        "required": ["document"] + CONTACT_RESPONSE_SCHEMA["required"],
+    },
+}
+
+MULTI_CONTACT_GENERATION_CONFIG = {
+    **CONTACT_GENERATION_CONFIG,
+    "response_schema": MULTI_CONTACT_RESPONSE_SCHEMA,
+}
+
+
+@timed("prompt_build")
+def build_contact_prompt(text: str) -> str:
+    """Build the single-pass contact extraction prompt"""
+    text = compact_resume(text, "contact")
+    return f"""
+    Extract the candidate's contact information from this resume text.
+    Return a JSON object with the keys name, email and phone. Use null for any
+    field that is not present. Also return a "confidence" object with a number
+    between 0 and 1 for each of name, email and phone.
+
+    Resume text:
+    {text}
+    """
+
+
+@timed("prompt_build")
+def build_multi_contact_prompt(texts) -> str:
+    """Build one extraction prompt covering several resumes"""
+    documents = "".join(
+        f"\n    ### Document {index}\n    {compact_resume(text, 'contact')}\n"
+        for index, text in enumerate(texts)
+    )
+    return f"""
+    Extract each candidate's contact information from the {len(texts)} resume
+    texts below. Return a JSON array with one object per document, in any
+    order, each with the keys document (the document number), name, email and
+    phone. Use null for any field that is not present. Also return a
+    "confidence" object with a number between 0 and 1 for each of name, email
+    and phone. Never mix details between documents.
+    {documents}
+    """
+
+
+def parse_multi_contact_info(result_text: str, count: int) -> list:
+    """Per-document contact info from a multi-document response
+
+    Returns a list of ``count`` entries; an entry is None when its document
+    is missing from the response or its object is invalid.
+    """
+    results = [None] * count
+    for item in extract_json(result_text, expect=list):
+        index = item.get("document") if isinstance(item, dict) else None
+        if not isinstance(index, int) or not 0 <= index < count:
+            continue
+        if results[index] is None:
+            try:
+                results[index] = validate_contact_info(item)
+            except ValueError:
+                pass
+    return results
+
+
+def validate_contact_info(payload) -> dict:
+    """Normalize a model response into {name, email, phone, confidence}"""
+    if not isinstance(payload, dict):
+        raise ValueError("Contact info must be a JSON object")
+
+    raw_confidence = payload.get("confidence")
+    if not isinstance(raw_confidence, dict):
+        raw_confidence = {}
+
+    contact_info = {}
+    confidence = {}
+    for field in CONTACT_FIELDS:
+        value = payload.get(field)
+        value = value.strip() if isinstance(value, str) else None
+
+        # Basic validation/cleanup
+        if field == "email" and value and "@" not in value:
+            value = None
+        if field == "phone" and value and not any(char.isdigit() for char in value):
+            value = None
+
+        try:
+            score = float(raw_confidence.get(field, 0.0))
+        except (TypeError, ValueError):
+            score = 0.0
+
+        contact_info[field] = value or None
+        confidence[field] = min(max(score, 0.0), 1.0) if value else 0.0
+
+    contact_info["confidence"] = confidence
+    return contact_info
+
+
+def extract_contact_info_structured(model, text: str) -> dict:
+    """Extract name, email and phone with one schema-constrained model call"""
+    response = model.generate_content(
+        build_contact_prompt(text), generation_config=CONTACT_GENERATION_CONFIG
+    )
+    return validate_contact_info(extract_json(response.text, expect=dict))
+
+
+def _find_email(text: str, header: str):
+    """Return (email, confidence) for the most likely email address"""
+    mailto = MAILTO_PATTERN.search(text)
+    if mailto:
+        return mailto.group(1), 0.99
+
+    emails = list(dict.fromkeys(EMAIL_PATTERN.findall(text)))
+    if not emails:
+        return None, 0.0
+
+    email = emails[0]
+    confidence = 0.95 if email in header else 0.75
+    if len(emails) > 1:
+        # Several addresses (references, employers) make the pick ambiguous
+        confidence -= 0.2
+    return email, confidence
+
+
+def _find_phone(text: str, header: str):
+    """Return (phone, confidence) for the most likely phone number"""
+    for index, pattern in enumerate(PHONE_PATTERNS):
+        for match in pattern.finditer(text):
+            phone = match.group().strip()
+            digits = sum(char.isdigit() for char in phone)
+            if not 7 <= digits <= 15:
+                continue
+
+            confidence = 0.95 if index == 0 else 0.9
+            if phone not in header:
+                confidence -= 0.3
+            return phone, confidence
+    return None, 0.0
+
+
+def _is_name_token(word: str) -> bool:
+    """Capitalized word, all-caps word or initial, allowing hyphens/apostrophes"""
+    if len(word) == 2 and word[0].isupper() and word[1] == ".":
+        return True
+    parts = [part for part in re.split(r"[-'\u2019]", word) if part]
+    if not parts or not all(part.isalpha() for part in parts):
+        return False
+    return word[0].isupper() and (word.isupper() or parts[-1][1:].islower())
+
+
+def _find_name(header_lines):
+    """Return (name, confidence) using header position and capitalization"""
+    labelled = NAME_LABEL_PATTERN.search("\n".join(header_lines))
+    if labelled:
+        return labelled.group(1).strip(), 0.9
+
+    for position, line in enumerate(header_lines):
+        # Headers often pack name and contact details on one line
+        candidate = re.split(r"\s*[|\u2022,]\s*", line)[0].strip()
+        words = candidate.split()
+        if not 2 <= len(words) <= 4:
+            continue
+        if "@" in candidate or any(char.isdigit() for char in candidate):
+            continue
+        if any(word.lower().strip(".") in NAME_STOP_WORDS for word in words):
+            continue
+        if not all(_is_name_token(word) for word in words):
+            continue
+
+        name = " ".join(
+            word.title() if word.isupper() and len(word) > 2 else word
+            for word in words
+        )
+        return name, 0.9 if position == 0 else 0.85 if position < 3 else 0.65
+    return None, 0.0
+
+
+def extract_contact_info_local(text: str) -> dict:
+    """Extract contact information without a model call, with confidences"""
+    header_lines = [line.strip() for line in text.split("\n") if line.strip()]
+    header_lines = header_lines[:HEADER_LINES]
+    header = "\n".join(header_lines)
+
+    name, name_confidence = _find_name(header_lines)
+    email, email_confidence = _find_email(text, header)
+    phone, phone_confidence = _find_phone(text, header)
+
+    return {
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "confidence": {
+            "name": name_confidence,
+            "email": email_confidence,
+            "phone": phone_confidence,
+        },
+    }
+
+
+def _weak_fields(contact_info: dict, threshold: float) -> list:
+    confidence = contact_info["confidence"]
+    return [field for field in CONTACT_FIELDS if confidence[field] < threshold]
+
+
+def _merge_ai_fields(contact_info: dict, weak_fields, ai_info: dict, threshold):
+    """Take only the weak fields from the model result"""
+    ai_confidence = ai_info.get("confidence") or {}
+    for field in weak_fields:
+        if ai_info.get(field):
+            contact_info[field] = ai_info[field]
+            contact_info["confidence"][field] = ai_confidence.get(field, threshold)
+    # The regex fallbacks mark their results, so those are not cached for long
+    contact_info["source"] = ai_info.get("source", "ai")
+    return contact_info
+
+
+def contact_fields_complete(text: str, threshold: float = None) -> bool:
+    """True when the local extractor is confident about every field"""
+    if threshold is None:
+        threshold = FAST_PATH_THRESHOLD
+    return not _weak_fields(extract_contact_info_local(text), threshold)
+
+
+def resolve_contact_info(text: str, ai_extract, threshold: float = None) -> dict:
+    """Run the local extractor first and ask the model only for weak fields
+
+    ``ai_extract`` is called with the resume text when at least one field is
+    below ``threshold``; its values replace only those weak fields.
+    """
+    if threshold is None:
+        threshold = FAST_PATH_THRESHOLD
+
+    contact_info = extract_contact_info_local(text)
+    weak_fields = _weak_fields(contact_info, threshold)
+    if not weak_fields:
+        contact_info["source"] = "local"
+        return contact_info
+
+    return _merge_ai_fields(contact_info, weak_fields, ai_extract(text), threshold)
+
+
+async def resolve_contact_info_async(
+    text: str, ai_extract, threshold: float = None
+) -> dict:
+    """Same as ``resolve_contact_info`` for a coroutine ``ai_extract``"""
+    if threshold is None:
+        threshold = FAST_PATH_THRESHOLD
+
+    contact_info = extract_contact_info_local(text)
+    weak_fields = _weak_fields(contact_info, threshold)
+    if not weak_fields:
+        contact_info["source"] = "local"
+        return contact_info
+
+    ai_info = await ai_extract(text)
+    return _merge_ai_fields(contact_info, weak_fields, ai_info, threshold)
@@ -0,0 +1,176 @@
+"""Shared service core for the Vercel handlers and the FastAPI app
+
+Every entry point used to import and configure ``google.generativeai`` at
+import time and build a new ``GenerativeModel`` per request. The SDK is now
+imported and configured on the first model call only, and model clients are
+created once per process and reused by every later request, so cold starts
+that never reach Gemini (health checks, cache hits, pooled questions) skip
+the SDK entirely. Calls go through the shared scheduler in ``_scheduler`` for
+quota, retries and the circuit breaker, and through ``model_router`` for
+hedging across model tiers. ``generate_stream`` yields a response's text as
+the model produces it. Each call's latency and tokens go to ``_metrics``.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+
+from _llm_json import extract_json
+from _metrics import errors, record_llm_call
+from _routing import ModelRouter
+from _scheduler import estimate_tokens, llm_scheduler
+
+# One model for every entry point; override per deployment with GEMINI_MODEL
+MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite-preview-09-2025")
+
+# Builds a model client from a model name. None means the Gemini SDK; the
+# benchmarks swap in local stubs here.
+model_factory = None
+
+# Milliseconds spent in each deferred import, for the health endpoints
+IMPORT_TIMINGS = {}
+
+# Hedges slow blocking calls on the LLM_HEDGE_MODELS tiers
+model_router = ModelRouter(MODEL_NAME)
+
+_genai = None
+_models = {}
+_lock = threading.RLock()
+
+
+def lazy_import(module_name: str):
+    """Import ``module_name`` on first use and record how long it took"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        IMPORT_TIMINGS[module_name] = round((time.perf_counter() - start) * 1000, 1)
+    return module
+
+
+def get_genai():
+    """Import and configure the Gemini SDK on first use"""
+    global _genai
+    with _lock:
+        if _genai is None:
+            genai = lazy_import("google.generativeai")
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            _genai = genai
+    return _genai
+
+
+def get_model(model_name: str = None):
+    """Return the process-wide client for ``model_name``, creating it once"""
+    model_name = model_name or MODEL_NAME
+    model = _models.get(model_name)
+    if model is None:
+        with _lock:
+            model = _models.get(model_name)
+            if model is None:
+                if model_factory is not None:
+                    model = model_factory(model_name)
+                else:
+                    model = get_genai().GenerativeModel(model_name)
+                _models[model_name] = model
+    return model
+
+
+class ScheduledModel:
+    """``GenerativeModel`` stand-in whose calls go through the scheduler
+
+    Without a ``model_name`` each call may be hedged on another model tier,
+    with ``operation`` naming the latency history used for the deadline.
+    Responses are expected to hold JSON.
+    """
+
+    def __init__(self, model_name: str = None, operation: str = "default"):
+        self.model_name = model_name
+        self.operation = operation
+
+    def generate_content(self, prompt, **kwargs):
+        def call(tier):
+            started = time.perf_counter()
+            try:
+                response = get_model(tier).generate_content(prompt, **kwargs)
+            except Exception as e:
+                errors.inc("llm", type(e).__name__)
+                raise
+            record_llm_call(
+                self.operation, time.perf_counter() - started, prompt, response
+            )
+            return response
+
+        def attempt(tier):
+            return llm_scheduler.run_sync(lambda: call(tier), estimate_tokens(prompt))
+
+        if self.model_name is not None:
+            return attempt(self.model_name)
+        return model_router.run_sync(
+            attempt, self.operation, lambda response: extract_json(response.text)
+        )
+
+
+def generate(
+    prompt: str,
+    model_name: str = None,
+    generation_config=None,
+    operation: str = "default",
+) -> str:
+    """Blocking model call for the Vercel handlers; returns the stripped text"""
+    kwargs = {"generation_config": generation_config} if generation_config else {}
+    response = ScheduledModel(model_name, operation).generate_content(prompt, **kwargs)
+    return response.text.strip()
+
+
+def utc_timestamp() -> str:
+    """Current UTC time in ISO 8601, for the responses' generatedAt fields"""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def chunk_text(chunk) -> str:
+    """Text of a streamed response chunk; "" for chunks without any"""
+    try:
+        return chunk.text
+    except ValueError:
+        # The SDK raises for chunks that only carry a finish reason
+        return ""
+
+
+def generate_stream(
+    prompt: str,
+    model_name: str = None,
+    generation_config=None,
+    operation: str = "stream",
+):
+    """Blocking streamed model call for the Vercel handlers; yields text chunks
+
+    Quota, retries and the circuit breaker apply until the first chunk
+    arrives. Streams are not hedged. The recorded latency runs from the
+    accepted attempt to the last chunk.
+    """
+    kwargs = {"generation_config": generation_config} if generation_config else {}
+    model = get_model(model_name)
+    started = None
+
+    def open_stream():
+        nonlocal started
+        started = time.perf_counter()
+        try:
+            chunks = iter(model.generate_content(prompt, stream=True, **kwargs))
+            return next(chunks, None), chunks
+        except Exception as e:
+            errors.inc("llm", type(e).__name__)
+            raise
+
+    chunk, chunks = llm_scheduler.run_sync(open_stream, estimate_tokens(prompt))
+    if chunk is None:
+        return
+    texts = [chunk_text(chunk)]
+    yield texts[0]
+    for chunk in chunks:
+        texts.append(chunk_text(chunk))
+        yield texts[-1]
+    seconds = time.perf_counter() - started
+    record_llm_call(operation, seconds, prompt, chunk, "".join(texts))
@@ -0,0 +1,369 @@
+"""Per-answer evaluation shared by the /evaluate-answers endpoints
+
+Instead of one prompt carrying every question/answer pair, each answer is
+scored by its own model call. Calls run concurrently with a bounded fan-out,
+results are handed back as soon as each one lands, and the overall score and
+summary are computed locally from the per-answer scores.
+
+Evaluations are cached per answer, keyed by the normalized question, answer,
+difficulty and category plus the rubric version and model, so re-running an
+evaluation only sends the answers not scored before. Blank and "I don't
+know" answers are scored locally without a model call.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from _cache import get_cache
+from _core import MODEL_NAME
+from _llm_json import extract_json
+from _metrics import timed
+
+EVALUATION_FANOUT = int(os.getenv("EVALUATION_FANOUT", "6"))
+
+# Bump whenever the evaluation prompts or scoring rules change meaningfully,
+# so cached evaluations produced by the old rubric are not reused
+EVALUATION_RUBRIC_VERSION = "2"
+
+# Answers that say nothing, after normalization and trailing punctuation.
+# Only unambiguous phrases: "none", "nothing", "pass" or "skip" can be the
+# right answer to a technical question.
+NON_ANSWERS = frozenset(
+    {
+        "",
+        "-",
+        "dont know",
+        "i dont know",
+        "i do not know",
+        "idk",
+        "no idea",
+        "i have no idea",
+        "not sure",
+        "im not sure",
+        "i am not sure",
+        "no answer",
+        "n/a",
+    }
+)
+
+
+@timed("prompt_build")
+def build_answer_prompt(
+    question: str,
+    difficulty: str,
+    category: str,
+    answer: str,
+    time_taken=None,
+    role: str = "Full Stack Developer",
+) -> str:
+    """Build the evaluation prompt for a single question/answer pair"""
+    timing = ""
+    if time_taken is not None:
+        timing = f"\n    Time Taken: {time_taken} seconds"
+    return f"""
+    You are an expert technical interviewer evaluating one answer for a
+    {role} position.
+
+    Question ({difficulty}, {category}): {question}
+    Candidate Answer: {answer}{timing}
+
+    Score the answer from 0-10 considering technical accuracy, depth of
+    knowledge, practical application, communication clarity and
+    problem-solving approach.
+
+    Return ONLY a JSON object with this exact structure:
+    {{
+      "score": 7,
+      "feedback": "detailed feedback on the answer",
+      "suggestions": "suggestions for improvement",
+      "strengths": ["strength1"],
+      "improvements": ["improvement1"]
+    }}
+    """
+
+
+@timed("prompt_build")
+def build_batch_evaluation_prompt(pairs, role: str = "Full Stack Developer") -> str:
+    """Build the single prompt that scores every answer at once
+
+    ``pairs`` holds (question, difficulty, category, answer, time_taken) tuples.
+    """
+    blocks = []
+    for index, (question, difficulty, category, answer, time_taken) in enumerate(
+        pairs
+    ):
+        timing = f"\n    Time Taken: {time_taken} seconds" if time_taken else ""
+        blocks.append(
+            f"""
+    Question {index + 1} (questionIndex {index}): {question}
+    Difficulty: {difficulty}
+    Category: {category}
+    Candidate Answer: {answer}{timing}
+"""
+        )
+
+    return f"""
+    You are an expert technical interviewer. Evaluate the following interview
+    answers for a {role} position:
+    {"".join(blocks)}
+    Provide a comprehensive evaluation with:
+    1. Individual scores for each answer (0-10 scale)
+    2. Detailed feedback for each answer
+    3. Overall assessment
+    4. Strengths and areas for improvement
+    5. Final recommendation (Hire/Consider/Reject)
+
+    Consider technical accuracy, depth of knowledge, practical application,
+    communication clarity and problem-solving approach.
+
+    Return ONLY a JSON object with this exact structure:
+    {{
+      "overallScore": 0-10,
+      "recommendation": "Hire|Consider|Reject",
+      "summary": "brief overall assessment",
+      "individualScores": [
+        {{
+          "questionIndex": 0,
+          "score": 0-10,
+          "feedback": "detailed feedback",
+          "suggestions": "suggestions for improvement",
+          "strengths": ["strength1", "strength2"],
+          "improvements": ["improvement1", "improvement2"]
+        }}
+      ],
+      "strengths": ["overall strength1", "overall strength2"],
+      "improvements": ["overall improvement1", "overall improvement2"]
+    }}
+    """
+
+
+def _text(value) -> str:
+    """Model-supplied text as a string; lists are joined one item per line"""
+    if isinstance(value, (list, tuple)):
+        return "\n".join(_text(item) for item in value if item is not None)
+    return str(value)
+
+
+def _text_list(value) -> list:
+    """Model-supplied list of strings; a lone string becomes one item"""
+    if not value:
+        return []
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return [_text(item) for item in value if item is not None]
+
+
+def normalize_answer_evaluation(evaluation) -> dict:
+    """Validate and clamp one evaluation object returned by the model
+
+    Every field is coerced to the ``AnswerEvaluation`` types, since results
+    are cached and served as they are returned here.
+    """
+    if not isinstance(evaluation, dict) or evaluation.get("score") is None:
+        raise ValueError("Evaluation is missing a score")
+    score = float(evaluation["score"])
+    if not math.isfinite(score):
+        raise ValueError(f"Evaluation score is not a number: {score}")
+    suggestions = evaluation.get("suggestions")
+
+    return {
+        "score": min(max(int(round(score)), 0), 10),
+        "feedback": _text(evaluation.get("feedback") or ""),
+        "suggestions": None if suggestions is None else _text(suggestions),
+        "strengths": _text_list(evaluation.get("strengths")),
+        "improvements": _text_list(evaluation.get("improvements")),
+    }
+
+
+def parse_answer_evaluation(result_text: str) -> dict:
+    """Parse and validate a single-answer evaluation from the model"""
+    return normalize_answer_evaluation(extract_json(result_text, expect=dict))
+
+
+def normalize_text(text) -> str:
+    """Case-folded with whitespace collapsed, so trivial edits share a key"""
+    return " ".join(str(text or "").casefold().split())
+
+
+def trivial_evaluation(answer: str):
+    """Local evaluation of a blank or "I don't know" answer, else None"""
+    text = re.sub(r"['’]", "", normalize_text(answer)).rstrip(".!?… ")
+    if text not in NON_ANSWERS:
+        return None
+    return {
+        "score": 0,
+        "feedback": (
+            "No answer was given."
+            if not text
+            else "The candidate said they did not know the answer."
+        ),
+        "suggestions": "Attempt an answer, even a partial one, and explain the "
+        "reasoning.",
+        "strengths": [],
+        "improvements": ["Attempt an answer and walk through the reasoning"],
+    }
+
+
+def evaluation_cache_key(
+    question: str, difficulty: str, category: str, answer: str
+) -> str:
+    """Key of one answer's evaluation under the current rubric and model"""
+    payload = json.dumps(
+        [normalize_text(value) for value in (question, difficulty, category, answer)]
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{MODEL_NAME}:{EVALUATION_RUBRIC_VERSION}:{digest}"
+
+
+def lookup_evaluation(question: str, difficulty: str, category: str, answer: str):
+    """The local or cached evaluation of an answer; None when it needs the model"""
+    trivial = trivial_evaluation(answer)
+    if trivial is not None:
+        return trivial
+    cached = get_cache("evaluation").get(
+        evaluation_cache_key(question, difficulty, category, answer)
+    )
+    return dict(cached) if cached is not None else None
+
+
+def store_evaluation(
+    question: str, difficulty: str, category: str, answer: str, evaluation: dict
+):
+    """Cache a model's evaluation of an answer; failed evaluations are not kept"""
+    if "error" not in evaluation:
+        get_cache("evaluation").set(
+            evaluation_cache_key(question, difficulty, category, answer),
+            dict(evaluation),
+        )
+
+
+def split_batch_evaluations(items, count: int) -> tuple:
+    """Per-answer evaluations from a batch response, plus the positions to re-ask
+
+    Items are checked one by one, so a malformed or missing entry costs a
+    single-answer call instead of regenerating the whole batch. Items are
+    placed by ``questionIndex`` when the model supplies it.
+    """
+    evaluations = [None] * count
+    if isinstance(items, list):
+        for position, item in enumerate(items):
+            index = item.get("questionIndex") if isinstance(item, dict) else None
+            if not isinstance(index, int) or not 0 <= index < count:
+                index = position
+            if index >= count or evaluations[index] is not None:
+                continue
+            try:
+                evaluations[index] = normalize_answer_evaluation(item)
+            except (TypeError, ValueError):
+                pass
+    failing = [index for index in range(count) if evaluations[index] is None]
+    return evaluations, failing
+
+
+def failed_evaluation(error: Exception) -> dict:
+    """Placeholder for an answer whose evaluation could not be produced"""
+    return {
+        "score": 0,
+        "feedback": "This answer could not be evaluated automatically.",
+        "suggestions": None,
+        "strengths": [],
+        "improvements": [],
+        "error": str(error),
+    }
+
+
+def summarize_evaluations(evaluations) -> dict:
+    """Overall score (0-100), recommendation and summary from per-answer scores"""
+    scored = [evaluation for evaluation in evaluations if "error" not in evaluation]
+    scores = [evaluation["score"] for evaluation in scored]
+    mean = sum(scores) / len(scores) if scores else 0.0
+
+    if mean >= 7:
+        recommendation = "Hire"
+    elif mean >= 5:
+        recommendation = "Consider"
+    else:
+        recommendation = "Reject"
+
+    def top(key):
+        seen = []
+        for evaluation in scored:
+            # Sessions stored before evaluations were kept whole lack the lists
+            for item in evaluation.get(key, []):
+                if item not in seen:
+                    seen.append(item)
+        return seen[:3]
+
+    summary = f"Average score {mean:.1f}/10 across {len(scores)} evaluated answers."
+    if scores:
+        best = max(range(len(scores)), key=scores.__getitem__)
+        worst = min(range(len(scores)), key=scores.__getitem__)
+        summary += (
+            f" Strongest answer scored {scores[best]}/10,"
+            f" weakest {scores[worst]}/10."
+        )
+    failed = len(evaluations) - len(scored)
+    if failed:
+        summary += f" {failed} answers could not be evaluated."
+
+    return {
+        "mean": round(mean, 1),
+        "overallScore": round(mean * 10),
+        "recommendation": recommendation,
+        "summary": summary,
+        "strengths": top("strengths"),
+        "improvements": top("improvements"),
+    }
+
+
+async def stream_evaluations(evaluate_one, count: int, fanout: int = EVALUATION_FANOUT):
+    """Yield (index, evaluation) in completion order
+
+    ``evaluate_one`` is a coroutine function taking the answer index. The
+    scheduler already retries transient model errors, so an answer that still
+    fails is reported as a failed evaluation rather than tried again; one bad
+    response never fails the whole interview.
+    """
+    semaphore = asyncio.Semaphore(fanout)
+
+    async def run(index):
+        async with semaphore:
+            try:
+                return index, await evaluate_one(index)
+            except Exception as e:
+                return index, failed_evaluation(e)
+
+    tasks = [asyncio.ensure_future(run(index)) for index in range(count)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The consumer went away (e.g. client disconnect); stop pending calls
+        for task in tasks:
+            task.cancel()
+
+
+def evaluate_in_threads(evaluate_one, count: int, fanout: int = EVALUATION_FANOUT):
+    """Blocking counterpart of ``stream_evaluations`` for the Vercel handlers"""
+
+    def run(index):
+        try:
+            return index, evaluate_one(index)
+        except Exception as e:
+            return index, failed_evaluation(e)
+
+    with ThreadPoolExecutor(max_workers=fanout) as executor:
+        # Each call runs in a copy of the caller's context, so its stages
+        # are traced under the request that asked for it
+        futures = [
+            executor.submit(contextvars.copy_context().run, run, index)
+            for index in range(count)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
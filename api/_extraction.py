@@ -0,0 +1,266 @@
+"""Resume text extraction and the process pool it runs in
+
+PyPDF2 and python-docx parsing is CPU-bound and holds the GIL, so the FastAPI
+app runs it in a small pool of long-lived worker processes. The pool bounds
+how many documents may wait for a worker, signals saturation so the route can
+answer 429, and kills a worker whose document exceeds the timeout instead of
+letting a pathological PDF hang it.
+"""
+
+import asyncio
+import io
+import math
+import multiprocessing
+import os
+import threading
+import time
+
+from _contact import contact_fields_complete
+from _resume_text import strip_page_furniture
+
+EXTRACTION_WORKERS = int(
+    os.getenv("EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+EXTRACTION_QUEUE_DEPTH = int(os.getenv("EXTRACTION_QUEUE_DEPTH", "16"))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "10"))
+# Header mode never parses more than this many PDF pages
+HEADER_PAGES = int(os.getenv("RESUME_HEADER_PAGES", "2"))
+
+
+def iter_pdf_pages(file_content: bytes):
+    """Yield the text of each PDF page, parsing pages only as they are pulled"""
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
+
+
+class LazyText:
+    """Document text assembled from a page iterator, consumed only as needed
+
+    ``header()`` stops early; ``full()`` resumes from the last page pulled,
+    so no page is ever parsed twice. Pages are joined once, not accumulated
+    with repeated string concatenation, and lines every page repeats in its
+    header or footer are kept only once.
+    """
+
+    def __init__(self, pages):
+        self._pages = iter(pages)
+        self._parsed = []
+        self.exhausted = False
+
+    def _pull(self) -> bool:
+        page = next(self._pages, None)
+        if page is None:
+            self.exhausted = True
+            return False
+        self._parsed.append(page)
+        return True
+
+    @property
+    def pages_parsed(self) -> int:
+        return len(self._parsed)
+
+    def header(self, max_pages: int = HEADER_PAGES, is_complete=None) -> str:
+        """Text of the first pages, stopping once ``is_complete(text)`` holds"""
+        while len(self._parsed) < max_pages and not self.exhausted:
+            if self._parsed and is_complete and is_complete(self._text()):
+                break
+            self._pull()
+        return self._text()
+
+    def full(self) -> str:
+        while self._pull():
+            pass
+        return self._text()
+
+    def _text(self) -> str:
+        if not self._parsed:
+            return ""
+        return "\n".join(strip_page_furniture(self._parsed)) + "\n"
+
+
+def extract_text_from_pdf(file_content: bytes) -> str:
+    """Extract text from PDF file"""
+    return LazyText(iter_pdf_pages(file_content)).full()
+
+
+def extract_text_from_docx(file_content: bytes) -> str:
+    """Extract text from DOCX file"""
+    from docx import Document
+
+    doc = Document(io.BytesIO(file_content))
+    return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+
+
+def extract_resume_text(file_content: bytes, is_pdf: bool) -> tuple:
+    """(header text, full text) of a PDF or DOCX resume
+
+    Contact details are read from the header, the leading pages that hold
+    them. Skills may be listed on any page, so the rest is parsed as well.
+    """
+    if not is_pdf:
+        text = extract_text_from_docx(file_content)
+        return text, text
+    document = LazyText(iter_pdf_pages(file_content))
+    header = document.header(HEADER_PAGES, contact_fields_complete)
+    return header, document.full()
+
+
+class PoolSaturatedError(Exception):
+    """Too many documents are already waiting for an extraction worker"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Extraction queue is full")
+        self.retry_after = retry_after
+
+
+class ExtractionTimeoutError(Exception):
+    """A document took longer than the per-document timeout to extract"""
+
+
+def _worker_loop(conn):
+    while True:
+        try:
+            func, args = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            conn.send((True, func(*args)))
+        except Exception as e:
+            conn.send((False, str(e)))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_loop, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, func, args, timeout):
+        """Blocking round-trip; returns (finished, ok, result)"""
+        self.conn.send((func, args))
+        if not self.conn.poll(timeout):
+            return False, False, None
+        ok, result = self.conn.recv()
+        return True, ok, result
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Bounded pool of extraction processes with backpressure and timeouts"""
+
+    def __init__(
+        self,
+        workers: int = EXTRACTION_WORKERS,
+        queue_depth: int = EXTRACTION_QUEUE_DEPTH,
+        timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+    ):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._total_seconds = 0.0
+        # spawn keeps children free of the parent's threads and event loop
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = None
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._idle = asyncio.Queue()
+        for _ in range(self.workers):
+            worker = _Worker(self._context)
+            self._all.append(worker)
+            self._idle.put_nowait(worker)
+
+    def _replace(self, worker):
+        worker.kill()
+        with self._lock:
+            self._all.remove(worker)
+            replacement = _Worker(self._context)
+            self._all.append(replacement)
+        return replacement
+
+    def retry_after(self) -> int:
+        """Seconds until a queued document would likely get a worker"""
+        average = self._total_seconds / self.completed if self.completed else 1.0
+        return max(1, math.ceil(average * self.pending / self.workers))
+
+    async def run(self, func, *args):
+        """Run ``func(*args)`` in a worker process and return its result
+
+        ``func`` must be a module-level function so it can be pickled.
+        Raises PoolSaturatedError when the queue is full, ExtractionTimeoutError
+        when the document exceeds the timeout and ValueError when ``func``
+        raised in the worker.
+        """
+        if self.pending >= self.workers + self.queue_depth:
+            self.rejected += 1
+            raise PoolSaturatedError(self.retry_after())
+        if self._idle is None:
+            self._start()
+
+        self.pending += 1
+        try:
+            worker = await self._idle.get()
+        except BaseException:
+            # Cancelled while queued, e.g. the client disconnected
+            self.pending -= 1
+            raise
+        start = time.perf_counter()
+        try:
+            try:
+                finished, ok, result = await asyncio.to_thread(
+                    worker.run, func, args, self.timeout
+                )
+            except asyncio.CancelledError:
+                # The worker is still busy with this document; don't reuse it
+                worker = self._replace(worker)
+                raise
+            if not finished:
+                # The worker may be stuck in C code; replace it outright
+                self.timed_out += 1
+                worker = self._replace(worker)
+                raise ExtractionTimeoutError(
+                    f"Document extraction exceeded {self.timeout:g}s"
+                )
+            if not ok:
+                raise ValueError(result)
+
+            self.completed += 1
+            self._total_seconds += time.perf_counter() - start
+            return result
+        finally:
+            self.pending -= 1
+            self._idle.put_nowait(worker)
+
+    def shutdown(self):
+        with self._lock:
+            for worker in self._all:
+                worker.kill()
+            self._all = []
+        self._idle = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timedOut": self.timed_out,
+        }
+
+
+extraction_pool = ExtractionPool()
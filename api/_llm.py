@@ -0,0 +1,257 @@
+"""Async Gemini client used by the FastAPI app
+
+The SDK's ``generate_content`` blocks, which stalls every other request on
+the event loop (including health checks). ``AsyncLLMClient`` runs calls
+through the SDK's async API when available, otherwise in a worker thread,
+with bounded concurrency, per-call timeouts and cancellation when the HTTP
+client disconnects. Quota, priorities and retries are handled by the shared
+``LLMScheduler``, and hedging across model tiers by a ``ModelRouter``.
+``stream`` yields a response's text as the model produces it. Each call's
+latency and tokens go to ``_metrics``.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _core import chunk_text
+from _llm_json import extract_json
+from _metrics import errors, record_llm_call
+from _routing import ModelRouter
+from _scheduler import LLMScheduler, estimate_tokens, llm_scheduler
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+# How often a pending call checks whether the HTTP client went away
+DISCONNECT_POLL_SECONDS = 0.25
+
+
+class LLMTimeoutError(Exception):
+    """The model did not answer within the per-call timeout"""
+
+    # The scheduler retries timed-out attempts with backoff
+    retryable = True
+
+
+class ClientDisconnectedError(Exception):
+    """The HTTP client disconnected, so the model call was cancelled"""
+
+
+async def _next_chunk(chunks):
+    """Next item of an async iterator, or None once it is exhausted"""
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+class AsyncLLMClient:
+    def __init__(
+        self,
+        model_factory,
+        default_model: str,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+        scheduler: LLMScheduler = None,
+        router: ModelRouter = None,
+    ):
+        self.model_factory = model_factory
+        self.scheduler = scheduler or llm_scheduler
+        self.router = router or ModelRouter(default_model)
+        self.default_model = default_model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.in_flight = 0
+        self._models = {}
+        self._semaphore = None
+        # Sized to the concurrency bound so blocking SDK calls never queue
+        # behind the event loop's default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm"
+        )
+
+    def model(self, model_name: str = None):
+        """Return a reused model client for ``model_name``"""
+        model_name = model_name or self.default_model
+        if model_name not in self._models:
+            self._models[model_name] = self.model_factory(model_name)
+        return self._models[model_name]
+
+    async def _call(self, model, prompt, generation_config):
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        if hasattr(model, "generate_content_async"):
+            return await model.generate_content_async(prompt, **kwargs)
+        call = functools.partial(model.generate_content, prompt, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def _stream_chunks(self, model, prompt, generation_config):
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        if hasattr(model, "generate_content_async"):
+            response = await model.generate_content_async(prompt, stream=True, **kwargs)
+            async for chunk in response:
+                yield chunk_text(chunk)
+            return
+        loop = asyncio.get_running_loop()
+        call = functools.partial(model.generate_content, prompt, stream=True, **kwargs)
+        chunks = iter(await loop.run_in_executor(self._executor, call))
+        while True:
+            chunk = await loop.run_in_executor(self._executor, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk_text(chunk)
+
+    async def generate(
+        self,
+        prompt: str,
+        model_name: str = None,
+        generation_config: dict = None,
+        timeout: float = None,
+        request=None,
+        priority: int = None,
+        operation: str = "default",
+        validate=extract_json,
+    ) -> str:
+        """Generate a response and return its text
+
+        ``request`` is the Starlette request that triggered the call; when
+        given, the call is cancelled as soon as its client disconnects. The
+        call waits for quota in the scheduler at ``priority`` (by default the
+        caller's ``current_priority``) and transient failures are retried.
+        Without an explicit ``model_name`` the router may hedge the call on
+        another tier; ``operation`` names the latency history it uses and
+        ``validate`` decides which answer is usable.
+        """
+
+        def attempt(tier):
+            return self.scheduler.run(
+                lambda: self._attempt(
+                    prompt, tier, generation_config, timeout, request, operation
+                ),
+                estimate_tokens(prompt),
+                priority,
+            )
+
+        if model_name is not None:
+            return await attempt(model_name)
+        return await self.router.run(attempt, operation, validate)
+
+    async def _attempt(
+        self, prompt, model_name, generation_config, timeout, request, operation
+    ):
+        """One bounded, cancellable model call"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            self.in_flight += 1
+            call = asyncio.ensure_future(
+                self._call(self.model(model_name), prompt, generation_config)
+            )
+            watcher = (
+                asyncio.ensure_future(_cancel_on_disconnect(request, call))
+                if request is not None
+                else None
+            )
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(call, timeout or self.timeout)
+            except asyncio.TimeoutError:
+                errors.inc("llm", LLMTimeoutError.__name__)
+                raise LLMTimeoutError("AI request timed out")
+            except asyncio.CancelledError:
+                if watcher is not None and watcher.done() and watcher.result():
+                    raise ClientDisconnectedError("Client disconnected")
+                raise
+            except Exception as e:
+                errors.inc("llm", type(e).__name__)
+                raise
+            finally:
+                self.in_flight -= 1
+                if watcher is not None:
+                    watcher.cancel()
+
+        record_llm_call(operation, time.perf_counter() - started, prompt, response)
+        return response.text.strip()
+
+    async def stream(
+        self,
+        prompt: str,
+        model_name: str = None,
+        generation_config: dict = None,
+        timeout: float = None,
+        priority: int = None,
+        operation: str = "stream",
+    ):
+        """Yield the response text chunk by chunk as the model produces it
+
+        Quota, retries and the circuit breaker apply until the first chunk
+        arrives; a later failure ends the stream with the error, since the
+        caller has already used part of the output. ``timeout`` bounds the
+        wait for each chunk. Streams are not hedged: a second tier would
+        double the tokens spent for a gain only in time to first chunk.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        timeout = timeout or self.timeout
+        model = self.model(model_name)
+        started = None
+
+        async def open_stream():
+            nonlocal started
+            # Held for the whole stream, but not while waiting for quota
+            await self._semaphore.acquire()
+            started = time.perf_counter()
+            chunks = self._stream_chunks(model, prompt, generation_config)
+            try:
+                first = await asyncio.wait_for(_next_chunk(chunks), timeout)
+            except BaseException as e:
+                await chunks.aclose()
+                self._semaphore.release()
+                if isinstance(e, asyncio.TimeoutError):
+                    errors.inc("llm", LLMTimeoutError.__name__)
+                    raise LLMTimeoutError("AI request timed out")
+                if isinstance(e, Exception):
+                    errors.inc("llm", type(e).__name__)
+                raise
+            return first, chunks
+
+        chunk, chunks = await self.scheduler.run(
+            open_stream, estimate_tokens(prompt), priority
+        )
+        self.in_flight += 1
+        texts = []
+        try:
+            while chunk is not None:
+                texts.append(chunk)
+                yield chunk
+                try:
+                    chunk = await asyncio.wait_for(_next_chunk(chunks), timeout)
+                except asyncio.TimeoutError:
+                    errors.inc("llm", LLMTimeoutError.__name__)
+                    raise LLMTimeoutError("AI request timed out")
+            seconds = time.perf_counter() - started
+            record_llm_call(operation, seconds, prompt, None, "".join(texts))
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            await chunks.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "inFlight": self.in_flight,
+            "maxConcurrency": self.max_concurrency,
+            "scheduler": self.scheduler.stats(),
+            "router": self.router.stats(),
+        }
+
+
+async def _cancel_on_disconnect(request, call) -> bool:
+    """Cancel ``call`` if the client of ``request`` disconnects first"""
+    while not call.done():
+        if await request.is_disconnected():
+            call.cancel()
+            return True
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+    return False
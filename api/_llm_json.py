@@ -0,0 +1,192 @@
+"""Tolerant JSON extraction from model output
+
+Models wrap JSON in markdown fences, add prose before or after it and leave
+trailing commas. Slicing ``result_text[7:-3]`` breaks on any of those, and a
+JSONDecodeError used to throw away a response that was mostly fine. This
+module finds the first balanced JSON value in the text instead, and
+validates list items one by one so callers can re-ask for only the items
+that failed.
+"""
+
+import json
+
+from _metrics import timed
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _balanced_end(text: str, start: int) -> int:
+    """Index just past the value opened at ``start``, or -1 if unbalanced"""
+    stack = []
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            if not stack or stack.pop() != char:
+                return -1
+            if not stack:
+                return index + 1
+    return -1
+
+
+def strip_trailing_commas(text: str) -> str:
+    """Remove commas directly before a closing bracket, outside strings"""
+    result = []
+    in_string = False
+    escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            rest = text[index + 1 :].lstrip()
+            if rest[:1] in ("}", "]"):
+                continue
+        result.append(char)
+    return "".join(result)
+
+
+@timed("json_parse")
+def extract_json(text: str, expect=None):
+    """Return the first balanced JSON value in ``text``
+
+    ``expect`` (``dict`` or ``list``) skips values of the other type, e.g. a
+    stray ``{...}`` in prose before the array that was asked for. Raises
+    ValueError when nothing parses.
+    """
+    openers = "{[" if expect is None else ("{" if expect is dict else "[")
+    start = 0
+    while True:
+        positions = [text.find(opener, start) for opener in openers]
+        positions = [position for position in positions if position != -1]
+        if not positions:
+            raise ValueError("No JSON value found in model output")
+
+        start = min(positions)
+        end = _balanced_end(text, start)
+        if end != -1:
+            candidate = text[start:end]
+            for attempt in (candidate, strip_trailing_commas(candidate)):
+                try:
+                    return json.loads(attempt)
+                except json.JSONDecodeError:
+                    pass
+        start += 1
+
+
+def validate_items(items, model_cls):
+    """Validate each item against a Pydantic model
+
+    Returns (validated, failing) where ``validated`` holds the dumped model
+    or None per position, and ``failing`` lists the positions that failed.
+    """
+    from pydantic import ValidationError
+
+    validated = []
+    failing = []
+    for index, item in enumerate(items):
+        try:
+            validated.append(model_cls.model_validate(item).model_dump())
+        except ValidationError:
+            validated.append(None)
+            failing.append(index)
+    return validated, failing
+
+
+class JSONArrayStream:
+    """Parse the items of a JSON array out of text that arrives in chunks
+
+    ``feed`` returns the items completed by each chunk, so a caller can use
+    the first objects of a streamed model response before the array closes.
+    Text before the array (fences, prose) is skipped, top-level scalars are
+    ignored and an item that does not parse is dropped. Every character is
+    scanned once however the text is split.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.items = 0
+        self.closed = False
+        self._position = 0
+        self._depth = 0
+        self._item_start = None
+        self._in_string = False
+        self._escaped = False
+
+    @timed("json_parse")
+    def feed(self, chunk: str) -> list:
+        self.text += chunk
+        items = []
+        text = self.text
+        for index in range(self._position, len(text)):
+            char = text[index]
+            if self.closed:
+                break
+            if self._depth == 0:
+                if char == "[":
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in _CLOSERS:
+                if self._depth == 1:
+                    self._item_start = index
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._item_start is not None:
+                    item = text[self._item_start : index + 1]
+                    self._item_start = None
+                    for attempt in (item, strip_trailing_commas(item)):
+                        try:
+                            items.append(json.loads(attempt))
+                            break
+                        except json.JSONDecodeError:
+                            pass
+                elif self._depth == 0:
+                    # "[sic]" in prose before the array: keep looking
+                    self.closed = bool(self.items or items)
+        self._position = len(text)
+        self.items += len(items)
+        return items
+
+    def finish(self) -> list:
+        """Items still to use once the stream ends
+
+        When streaming found no items at all, falls back to ``extract_json``
+        over the whole text, which copes with arrays that a stray ``[`` in
+        the prose hid from the incremental scan.
+        """
+        if self.items:
+            return []
+        try:
+            items = extract_json(self.text, expect=list)
+        except ValueError:
+            return []
+        self.items = len(items)
+        return items
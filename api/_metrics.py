@@ -0,0 +1,376 @@
+"""Request metrics and structured trace logs
+
+Nothing used to be timed: errors were printed and there was no way to tell
+where a slow request spent its time. Every entry point now records:
+
+- per-stage latency histograms: upload read, text extraction, prompt build,
+  LLM call and JSON parse
+- prompt and response tokens per operation, from the SDK's usage metadata
+  when a response carries it, otherwise estimated from the text length
+- errors by class, and hit ratios of the caches registered with
+  ``register_caches``
+- answers settled by local pre-scoring versus sent to the model, and the
+  share of evaluation calls that saved
+
+``render`` writes them in the Prometheus text format for ``GET /metrics``.
+Each request also gets a correlation ID, taken from its ``X-Request-ID``
+header or generated, which is echoed in the response and ends the request
+as one JSON trace line with its status, duration, stage times and error.
+
+Recording a stage costs a clock read, a bisect and a locked increment;
+``benchmarks/bench_metrics_overhead.py`` fails when a request's bookkeeping
+exceeds ``METRICS_OVERHEAD_BUDGET_US``. Metrics are in memory, per process.
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+# One JSON line per request; set TRACE_LOG=0 to keep only the metrics
+TRACE_LOG = os.getenv("TRACE_LOG", "1") == "1"
+REQUEST_ID_HEADER = "X-Request-ID"
+# Bookkeeping allowed per traced request with every stage timed once
+METRICS_OVERHEAD_BUDGET_US = 50
+
+STAGES = ("upload_read", "text_extraction", "prompt_build", "llm", "json_parse")
+# Upper bounds in seconds, from a cached prompt build to a slow model call
+LATENCY_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+# Client-supplied correlation IDs are logged, so only plain tokens are kept
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+# Writes one trace line. None means stdout; the benchmarks swap in their own
+trace_sink = None
+
+# The trace of the request being handled by the current task or thread
+current_trace = contextvars.ContextVar("request_trace", default=None)
+
+
+def _labels(names, values) -> str:
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # Per label values: [count per bucket, then +Inf], total
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            )
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                bucket_labels = _labels(self.labels + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total:.6f}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "interview_stage_duration_seconds",
+    "Time spent in each request stage",
+    ("stage",),
+)
+request_seconds = Histogram(
+    "interview_request_duration_seconds",
+    "Request duration by route and status",
+    ("route", "status"),
+)
+llm_tokens = Counter(
+    "interview_llm_tokens_total",
+    "Prompt and response tokens of successful model calls",
+    ("operation", "direction"),
+)
+errors = Counter(
+    "interview_errors_total",
+    "Errors by where they were raised and exception class",
+    ("source", "error"),
+)
+answer_triage = Counter(
+    "interview_answer_triage_total",
+    "Answers settled by local pre-scoring or sent to the model",
+    ("outcome",),
+)
+
+# Callables returning {cache name: stats dict with "hits" and "misses"}
+_cache_sources = []
+
+
+def register_caches(stats):
+    """Report the hit ratios of every cache in ``stats()`` in ``render``"""
+    _cache_sources.append(stats)
+
+
+class RequestTrace:
+    """What one request did, written out as a single trace line"""
+
+    __slots__ = ("request_id", "route", "started", "status", "stages", "error")
+
+    def __init__(self, route: str, request_id: str = None):
+        if not request_id or not REQUEST_ID_PATTERN.fullmatch(request_id):
+            request_id = os.urandom(8).hex()
+        self.request_id = request_id
+        self.route = route
+        self.started = time.perf_counter()
+        self.status = None
+        self.stages = {}
+        self.error = None
+
+
+def start_trace(route: str, request_id: str = None):
+    """Begin tracing a request in the current context; returns (trace, token)"""
+    trace = RequestTrace(route, request_id)
+    return trace, current_trace.set(trace)
+
+
+def finish_trace(trace: RequestTrace, token=None):
+    """Record the request's duration and write its trace line"""
+    seconds = time.perf_counter() - trace.started
+    request_seconds.observe(seconds, trace.route, str(trace.status or 0))
+    if token is not None:
+        current_trace.reset(token)
+    if TRACE_LOG:
+        write_trace(
+            {
+                "requestId": trace.request_id,
+                "route": trace.route,
+                "status": trace.status,
+                "ms": round(seconds * 1000, 2),
+                "stagesMs": {
+                    name: round(value * 1000, 2) for name, value in trace.stages.items()
+                },
+                "error": trace.error,
+            }
+        )
+
+
+def write_trace(record: dict):
+    line = json.dumps(record, default=str)
+    if trace_sink is None:
+        print(line, flush=True)
+    else:
+        trace_sink(line)
+
+
+def observe_stage(name: str, seconds: float):
+    stage_seconds.observe(seconds, name)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.stages[name] = trace.stages.get(name, 0.0) + seconds
+
+
+class _StageTimer:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe_stage(self.name, time.perf_counter() - self.started)
+
+
+def stage(name: str) -> _StageTimer:
+    """Context manager timing a block as stage ``name``"""
+    return _StageTimer(name)
+
+
+def timed(name: str):
+    """Decorator timing every call of a function as stage ``name``"""
+
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe_stage(name, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorate
+
+
+def record_llm_call(
+    operation: str, seconds: float, prompt: str, response, text: str = None
+):
+    """Count one successful model call's latency and tokens
+
+    Tokens come from the usage metadata of ``response`` (a streamed call's
+    last chunk) when it has any, otherwise they are estimated from the
+    prompt and ``text``, by default the response's text.
+    """
+    # Only model calls need the scheduler, so health checks never import it
+    from _scheduler import CHARS_PER_TOKEN
+
+    observe_stage("llm", seconds)
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    response_tokens = getattr(usage, "candidates_token_count", None)
+    if prompt_tokens is None:
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+    if response_tokens is None:
+        try:
+            text = response.text if text is None else text
+        except ValueError:
+            # The SDK raises for responses without any text
+            text = ""
+        response_tokens = len(text) // CHARS_PER_TOKEN
+    llm_tokens.inc(operation, "prompt", amount=prompt_tokens)
+    llm_tokens.inc(operation, "response", amount=response_tokens)
+
+
+def record_error(error: BaseException, source: str = "request"):
+    """Count ``error`` by class and attach it to the current request's trace
+
+    Errors outside a request (background refills and scoring) are written
+    as trace lines of their own.
+    """
+    error_class = type(error).__name__
+    errors.inc(source, error_class)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.error = trace.error or f"{error_class}: {error}"
+    elif TRACE_LOG:
+        write_trace({"source": source, "error": f"{error_class}: {error}"})
+
+
+def traced(route: str):
+    """Decorator tracing a ``BaseHTTPRequestHandler`` method as ``route``
+
+    The response status is taken from ``send_response``, which also adds
+    the correlation ID header.
+    """
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(handler, *args):
+            trace, token = start_trace(route, handler.headers.get(REQUEST_ID_HEADER))
+            send_response = type(handler).send_response
+
+            def send_traced_response(code, message=None):
+                trace.status = code
+                send_response(handler, code, message)
+                handler.send_header(REQUEST_ID_HEADER, trace.request_id)
+
+            handler.send_response = send_traced_response
+            try:
+                return method(handler, *args)
+            except BaseException as e:
+                record_error(e)
+                raise
+            finally:
+                finish_trace(trace, token)
+
+        return wrapper
+
+    return decorate
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in (stage_seconds, request_seconds, llm_tokens, errors, answer_triage):
+        lines += metric.render()
+    settled = answer_triage.value("settled")
+    triaged = settled + answer_triage.value("model")
+    lines += [
+        "# HELP interview_llm_calls_avoided_ratio"
+        " Share of answer evaluations settled without the model",
+        "# TYPE interview_llm_calls_avoided_ratio gauge",
+        f"interview_llm_calls_avoided_ratio {round(settled / (triaged or 1), 4)}",
+    ]
+
+    caches = []
+    for stats in _cache_sources:
+        for name, counts in sorted(stats().items()):
+            caches.append((name, counts.get("hits", 0), counts.get("misses", 0)))
+    for metric, kind, help, value in (
+        ("cache_hits_total", "counter", "Cache lookups that hit", lambda h, m: h),
+        ("cache_misses_total", "counter", "Cache lookups that missed", lambda h, m: m),
+        (
+            "cache_hit_ratio",
+            "gauge",
+            "Hits over all lookups so far",
+            lambda h, m: round(h / ((h + m) or 1), 4),
+        ),
+    ):
+        metric = "interview_" + metric
+        lines += [f"# HELP {metric} {help}", f"# TYPE {metric} {kind}"]
+        for name, hits, misses in caches:
+            lines.append(f'{metric}{{cache="{name}"}} {value(hits, misses)}')
+    return "\n".join(lines) + "\n"
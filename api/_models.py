@@ -0,0 +1,47 @@
+"""Pydantic models shared by the FastAPI app and the Vercel handlers"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class QuestionRequest(BaseModel):
+    role: str = "Full Stack Developer"
+    experience: str = "Mid-level"
+    # Without skills, they are taken from resumeText, else React/Node.js/JS
+    skills: Optional[List[str]] = None
+    resumeText: Optional[str] = None
+    # Questions similar to ones this candidate was already asked are not reused
+    candidateId: Optional[str] = None
+
+
+class Question(BaseModel):
+    question: str
+    difficulty: str
+    timeLimit: int
+    category: str
+
+
+class AnswerEvaluationRequest(BaseModel):
+    questions: List[Question]
+    answers: List[str]
+
+
+class AnswerEvaluation(BaseModel):
+    score: int
+    feedback: str
+    suggestions: Optional[str] = None
+
+
+class EvaluationResponse(BaseModel):
+    evaluations: List[AnswerEvaluation]
+    overallScore: int
+    summary: str
+
+
+class SessionCreateRequest(BaseModel):
+    questions: List[Question]
+
+
+class SessionAnswerRequest(BaseModel):
+    index: int
+    answer: str
@@ -0,0 +1,156 @@
+"""Incremental multipart/form-data parsing for the Vercel resume handler
+
+The request body is read from ``rfile`` in fixed-size chunks. Boundaries are
+located with a rolling search that only rescans the few bytes that could
+straddle two chunks, the upload size is capped before anything is buffered,
+and the file part is returned as a memoryview over a single buffer.
+"""
+
+import io
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+# Allowance for boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeds MAX_UPLOAD_BYTES"""
+
+
+class _ChunkReader:
+    """Buffer over ``rfile`` that never reads past ``content_length``"""
+
+    def __init__(self, rfile, content_length, chunk_size):
+        self.rfile = rfile
+        self.remaining = content_length
+        self.chunk_size = chunk_size
+        # A leading CRLF lets the first boundary match the same delimiter as
+        # every later one
+        self.buffer = bytearray(b"\r\n")
+
+    def fill(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        data = self.rfile.read(min(self.chunk_size, self.remaining))
+        if not data:
+            self.remaining = 0
+            return False
+        self.remaining -= len(data)
+        self.buffer += data
+        return True
+
+    def find(self, needle: bytes, start: int = 0, limit: int = None) -> int:
+        """Index of ``needle``, reading more chunks as needed; -1 at EOF"""
+        while True:
+            index = self.buffer.find(needle, start)
+            if index != -1:
+                return index
+            # Only the tail that could hold a partial match needs rescanning
+            start = max(start, len(self.buffer) - len(needle) + 1)
+            if limit is not None and len(self.buffer) > limit:
+                return -1
+            if not self.fill():
+                return -1
+
+    def consume(self, count: int):
+        del self.buffer[:count]
+
+
+def _parse_part_headers(raw: bytes) -> dict:
+    headers = {}
+    for line in raw.decode("utf-8", "replace").split("\r\n"):
+        name, _, value = line.partition(":")
+        if value:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def read_multipart_file(
+    rfile,
+    content_length: int,
+    boundary: str,
+    max_size: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = CHUNK_SIZE,
+) -> memoryview:
+    """Stream a multipart body from ``rfile`` and return the first file part"""
+    if content_length > max_size + MULTIPART_OVERHEAD_BYTES:
+        raise UploadTooLargeError("File size must be less than 5MB")
+
+    delimiter = b"\r\n--" + boundary.strip('"').encode()
+    reader = _ChunkReader(rfile, content_length, chunk_size)
+
+    index = reader.find(delimiter)
+    while index != -1:
+        reader.consume(index + len(delimiter))
+        while len(reader.buffer) < 2 and reader.fill():
+            pass
+        if reader.buffer[:2] == b"--":
+            break
+
+        header_end = reader.find(b"\r\n\r\n", limit=MAX_HEADER_BYTES)
+        if header_end == -1:
+            raise ValueError("Malformed multipart part headers")
+        headers = _parse_part_headers(bytes(reader.buffer[2:header_end]))
+        reader.consume(header_end + 4)
+
+        disposition = headers.get("content-disposition", "")
+        is_file = "form-data" in disposition and "filename=" in disposition
+        file_data = bytearray()
+
+        # Move everything that cannot be the start of a delimiter out of the
+        # read buffer, so memory stays at one chunk plus the file itself
+        while True:
+            index = reader.buffer.find(delimiter)
+            if index != -1:
+                break
+            safe = len(reader.buffer) - len(delimiter) + 1
+            if safe > 0:
+                if is_file:
+                    if len(file_data) + safe > max_size:
+                        raise UploadTooLargeError("File size must be less than 5MB")
+                    file_data += reader.buffer[:safe]
+                reader.consume(safe)
+            if not reader.fill():
+                raise ValueError("Unexpected end of multipart data")
+
+        if is_file:
+            if len(file_data) + index > max_size:
+                raise UploadTooLargeError("File size must be less than 5MB")
+            file_data += reader.buffer[:index]
+            return memoryview(file_data)
+
+    raise ValueError("No file found in form data")
+
+
+class MemoryViewStream(io.RawIOBase):
+    """Seekable read-only stream over a buffer, without copying it"""
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        end = min(self._position + len(buffer), len(self._view))
+        count = end - self._position
+        buffer[:count] = self._view[self._position : end]
+        self._position = end
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
@@ -0,0 +1,619 @@
+"""Pre-generated pools of interview question sets
+
+Question requests come from a small, repetitive set of (role, experience,
+skills) inputs, so validated sets are kept per normalized key and served
+immediately. Pools are refilled on a background thread once they drop below
+the low-water mark: on a thread for the synchronous Vercel handlers, or on
+an asyncio task for the FastAPI app. Keys built from one candidate's resume
+skills are rarely asked for again, so a key is only refilled once it has
+been requested ``QUESTION_POOL_REFILL_AFTER`` times, and only the most
+recently used ``QUESTION_POOL_MAX_KEYS`` keys are kept.
+
+Generated questions are checked against ``question_index``: a question that
+repeats another in its set, or one already issued for the role, is replaced
+on its own rather than regenerating the set. Questions served to a candidate
+are recorded under the candidate too, so they are not asked the same thing
+twice.
+
+``stream_question_set`` and ``QuestionBank.stream`` yield a fresh set's
+questions one by one as the model's streamed output completes them.
+"""
+
+import asyncio
+import os
+import random
+import threading
+from collections import OrderedDict
+
+from _llm_json import JSONArrayStream, extract_json, validate_items
+from _metrics import current_trace, record_error, timed
+from _question_index import question_index
+from _scheduler import PRIORITY_BACKGROUND, current_priority
+
+DIFFICULTY_TIME_LIMITS = {"Easy": 20, "Medium": 60, "Hard": 120}
+QUESTIONS_PER_DIFFICULTY = 2
+
+QUESTION_POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", "4"))
+QUESTION_POOL_LOW_WATER = int(os.getenv("QUESTION_POOL_LOW_WATER", "2"))
+# A pooled set is retired once it has supplied this many sets' worth of questions
+QUESTION_SET_MAX_USES = int(os.getenv("QUESTION_SET_MAX_USES", "3"))
+# Requests for a key before its pool is refilled; one-off keys cost one call
+QUESTION_POOL_REFILL_AFTER = int(os.getenv("QUESTION_POOL_REFILL_AFTER", "2"))
+QUESTION_POOL_MAX_KEYS = int(os.getenv("QUESTION_POOL_MAX_KEYS", "512"))
+
+
+def question_bank_key(role: str, experience: str, skills) -> tuple:
+    """Normalize request inputs so equivalent requests share a pool"""
+
+    def normalize(value):
+        return " ".join(str(value).lower().split())
+
+    normalized_skills = sorted({normalize(skill) for skill in skills if skill})
+    return (normalize(role), normalize(experience), tuple(normalized_skills))
+
+
+def role_scope(role: str) -> str:
+    """``question_index`` scope of the questions issued for ``role``"""
+    return "role:" + " ".join(str(role).lower().split())
+
+
+def candidate_scope(candidate: str) -> str:
+    """``question_index`` scope of the questions a candidate has been asked"""
+    return "candidate:" + " ".join(str(candidate).lower().split())
+
+
+def validate_question_set(questions) -> list:
+    """Check a generated set has 2 Easy, 2 Medium and 2 Hard questions"""
+    if not isinstance(questions, list) or len(questions) != 6:
+        raise ValueError("Invalid questions format")
+
+    counts = dict.fromkeys(DIFFICULTY_TIME_LIMITS, 0)
+    for question in questions:
+        if not isinstance(question, dict) or not question.get("question"):
+            raise ValueError("Invalid questions format")
+        difficulty = question.get("difficulty")
+        if difficulty not in DIFFICULTY_TIME_LIMITS:
+            raise ValueError(f"Invalid question difficulty: {difficulty}")
+        counts[difficulty] += 1
+        # The model occasionally mislabels limits; the difficulty is authoritative
+        question["timeLimit"] = DIFFICULTY_TIME_LIMITS[difficulty]
+        question.setdefault("category", "Technical")
+
+    if any(count != QUESTIONS_PER_DIFFICULTY for count in counts.values()):
+        raise ValueError("Expected 2 Easy, 2 Medium and 2 Hard questions")
+    # Replacement questions are appended; keep the Easy -> Hard order
+    order = list(DIFFICULTY_TIME_LIMITS)
+    questions.sort(key=lambda question: order.index(question["difficulty"]))
+    return questions
+
+
+@timed("prompt_build")
+def build_question_prompt(role: str, experience: str, skills) -> str:
+    """Build the prompt for a full set of 6 interview questions"""
+    return f"""
+    Generate exactly 6 interview questions for a {role} position with {experience} experience.
+    Skills to focus on: {', '.join(skills)}
+
+    Requirements:
+    - 2 Easy questions (20 seconds each)
+    - 2 Medium questions (60 seconds each)
+    - 2 Hard questions (120 seconds each)
+
+    Return ONLY a JSON array with this exact structure:
+    [
+      {{
+        "question": "question text",
+        "difficulty": "Easy|Medium|Hard",
+        "timeLimit": 20|60|120,
+        "category": "technical category"
+      }}
+    ]
+
+    Focus on practical, real-world scenarios and technical concepts.
+    """
+
+
+def _normalize_item(item):
+    """Canonical difficulty and its time limit for a generated question"""
+    if isinstance(item, dict):
+        item = dict(item)
+        difficulty = str(item.get("difficulty", "")).strip().capitalize()
+        item["difficulty"] = difficulty
+        item["timeLimit"] = DIFFICULTY_TIME_LIMITS.get(difficulty, 0)
+        item.setdefault("category", "Technical")
+    return item
+
+
+def parse_question_set(result_text: str, needed=None) -> tuple:
+    """Parse generated questions, keeping every usable one
+
+    ``needed`` lists the difficulties wanted, one entry per question; it
+    defaults to a full set. Returns (questions, missing) where ``missing``
+    lists the difficulties no valid question was returned for, so the caller
+    can re-ask for just those. Raises ValueError if no JSON array is found.
+    """
+    from _models import Question
+
+    if needed is None:
+        needed = [
+            difficulty
+            for difficulty in DIFFICULTY_TIME_LIMITS
+            for _ in range(QUESTIONS_PER_DIFFICULTY)
+        ]
+    remaining = {difficulty: needed.count(difficulty) for difficulty in needed}
+
+    candidates = [
+        _normalize_item(item) for item in extract_json(result_text, expect=list)
+    ]
+    questions = []
+    validated, _ = validate_items(candidates, Question)
+    for question in validated:
+        if question is None or not question["question"].strip():
+            continue
+        if remaining.get(question["difficulty"], 0) > 0:
+            remaining[question["difficulty"]] -= 1
+            questions.append(question)
+
+    missing = [
+        difficulty for difficulty, count in remaining.items() for _ in range(count)
+    ]
+    return questions, missing
+
+
+@timed("prompt_build")
+def build_replacement_prompt(
+    role: str, experience: str, skills, existing: list, missing: list
+) -> str:
+    """Ask for only the questions that were missing or invalid"""
+    wanted = ", ".join(
+        f"{missing.count(difficulty)} {difficulty}"
+        for difficulty in DIFFICULTY_TIME_LIMITS
+        if difficulty in missing
+    )
+    asked = "\n".join(f"- {question['question']}" for question in existing)
+    return f"""
+    Generate {wanted} interview question(s) for a {role} position with {experience} experience.
+    Skills to focus on: {', '.join(skills)}
+
+    Do not repeat any of these questions:
+    {asked or '- (none)'}
+
+    Return ONLY a JSON array with this exact structure:
+    [
+      {{
+        "question": "question text",
+        "difficulty": "Easy|Medium|Hard",
+        "timeLimit": 20|60|120,
+        "category": "technical category"
+      }}
+    ]
+    """
+
+
+def _drop_repeats(questions, missing, scopes, existing=()):
+    """Move near-duplicate questions from ``questions`` to ``missing``"""
+    kept, repeats = question_index.dedupe(questions, scopes, existing)
+    return kept, missing + [question["difficulty"] for question in repeats], repeats
+
+
+def generate_question_set(
+    generate, role: str, experience: str, skills, avoid=()
+) -> list:
+    """Generate a validated set with ``generate(prompt) -> text``
+
+    Only the difficulties that came back missing, invalid or repeating a
+    question in the set or in the ``avoid`` scopes of ``question_index`` are
+    re-asked, once, instead of regenerating the whole set. Replacements only
+    have to differ from the rest of the set.
+    """
+    questions, missing = parse_question_set(
+        generate(build_question_prompt(role, experience, skills))
+    )
+    questions, missing, repeats = _drop_repeats(questions, missing, avoid)
+    if missing:
+        replacement_prompt = build_replacement_prompt(
+            role, experience, skills, questions + repeats, missing
+        )
+        replacements, missing = parse_question_set(
+            generate(replacement_prompt), missing
+        )
+        replacements, missing, _ = _drop_repeats(replacements, missing, (), questions)
+        questions += replacements
+    if missing:
+        raise ValueError("Invalid questions format")
+    return validate_question_set(questions)
+
+
+async def agenerate_question_set(
+    generate, role: str, experience: str, skills, avoid=()
+) -> list:
+    """Same as ``generate_question_set`` for a coroutine ``generate``"""
+    questions, missing = parse_question_set(
+        await generate(build_question_prompt(role, experience, skills))
+    )
+    questions, missing, repeats = _drop_repeats(questions, missing, avoid)
+    if missing:
+        replacement_prompt = build_replacement_prompt(
+            role, experience, skills, questions + repeats, missing
+        )
+        replacements, missing = parse_question_set(
+            await generate(replacement_prompt), missing
+        )
+        replacements, missing, _ = _drop_repeats(replacements, missing, (), questions)
+        questions += replacements
+    if missing:
+        raise ValueError("Invalid questions format")
+    return validate_question_set(questions)
+
+
+class QuestionCollector:
+    """Builds a set from questions offered one at a time
+
+    Each item is normalized and validated as in ``parse_question_set`` and
+    kept while its difficulty still has room, unless it repeats a kept
+    question or an entry in the ``avoid`` scopes of ``question_index``.
+    """
+
+    def __init__(self, avoid=()):
+        self.avoid = avoid
+        self.remaining = dict.fromkeys(DIFFICULTY_TIME_LIMITS, QUESTIONS_PER_DIFFICULTY)
+        self.questions = []
+        self.repeats = []
+
+    def offer(self, item):
+        """Keep ``item`` if it fits the set; returns the question or None"""
+        from _models import Question
+
+        (question,), _ = validate_items([_normalize_item(item)], Question)
+        if question is None or not question["question"].strip():
+            return None
+        if not self.remaining.get(question["difficulty"]):
+            return None
+        _, repeats = question_index.dedupe([question], self.avoid, self.questions)
+        if repeats:
+            self.repeats += repeats
+            return None
+        self.remaining[question["difficulty"]] -= 1
+        self.questions.append(question)
+        return question
+
+    @property
+    def missing(self) -> list:
+        return [
+            difficulty
+            for difficulty, count in self.remaining.items()
+            for _ in range(count)
+        ]
+
+    def replacement_prompt(self, role, experience, skills):
+        """Prompt for the questions still missing, or None for a full set"""
+        if not self.missing:
+            return None
+        return build_replacement_prompt(
+            role, experience, skills, self.questions + self.repeats, self.missing
+        )
+
+    def replacements(self, result_text: str) -> list:
+        """Questions filling the set from a replacement response
+
+        Raises ValueError if the set is still incomplete.
+        """
+        replacements, missing = parse_question_set(result_text, self.missing)
+        replacements, missing, _ = _drop_repeats(
+            replacements, missing, (), self.questions
+        )
+        if missing:
+            raise ValueError("Invalid questions format")
+        self.questions += replacements
+        self.remaining = dict.fromkeys(DIFFICULTY_TIME_LIMITS, 0)
+        return replacements
+
+
+def stream_question_set(stream, generate, role, experience, skills, avoid=()):
+    """Yield the questions of a new set as ``stream(prompt)`` produces them
+
+    ``stream`` returns an iterable of text chunks. Each question is yielded
+    as soon as its object closes in the partial JSON array, in the order the
+    model writes them. Questions missing, invalid or repeated at the end are
+    re-asked once with the blocking ``generate(prompt) -> text``, as in
+    ``generate_question_set``.
+    """
+    collector = QuestionCollector(avoid)
+    parser = JSONArrayStream()
+    for chunk in stream(build_question_prompt(role, experience, skills)):
+        for item in parser.feed(chunk):
+            question = collector.offer(item)
+            if question is not None:
+                yield question
+    for item in parser.finish():
+        question = collector.offer(item)
+        if question is not None:
+            yield question
+
+    replacement_prompt = collector.replacement_prompt(role, experience, skills)
+    if replacement_prompt:
+        yield from collector.replacements(generate(replacement_prompt))
+
+
+async def astream_question_set(stream, generate, role, experience, skills, avoid=()):
+    """Same as ``stream_question_set`` for an async ``stream`` and ``generate``"""
+    collector = QuestionCollector(avoid)
+    parser = JSONArrayStream()
+    async for chunk in stream(build_question_prompt(role, experience, skills)):
+        for item in parser.feed(chunk):
+            question = collector.offer(item)
+            if question is not None:
+                yield question
+    for item in parser.finish():
+        question = collector.offer(item)
+        if question is not None:
+            yield question
+
+    replacement_prompt = collector.replacement_prompt(role, experience, skills)
+    if replacement_prompt:
+        for question in collector.replacements(await generate(replacement_prompt)):
+            yield question
+
+
+class QuestionBank:
+    """Per-key pools of validated question sets with background refill"""
+
+    def __init__(
+        self,
+        pool_size=QUESTION_POOL_SIZE,
+        low_water=QUESTION_POOL_LOW_WATER,
+        max_uses=QUESTION_SET_MAX_USES,
+        refill_after=QUESTION_POOL_REFILL_AFTER,
+        max_keys=QUESTION_POOL_MAX_KEYS,
+        rng=None,
+    ):
+        self.pool_size = pool_size
+        self.low_water = low_water
+        self.max_uses = max_uses
+        self.refill_after = refill_after
+        self.max_keys = max_keys
+        self.rng = rng or random.Random()
+        self.hits = 0
+        self.misses = 0
+        # key -> pooled sets, least recently requested first
+        self._pools = OrderedDict()
+        self._requests = {}
+        self._refilling = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    def _take(self, key, avoid=()):
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            self._pools.move_to_end(key)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            while len(self._pools) > self.max_keys:
+                evicted = next(iter(self._pools))
+                del self._pools[evicted]
+                self._requests.pop(evicted, None)
+            questions = self._sample(pool, avoid) if pool else None
+            if questions:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return questions
+
+    def _add(self, key, questions, uses=0):
+        with self._lock:
+            # The key may have been evicted while its set was generated
+            self._pools.setdefault(key, []).append(
+                {"questions": questions, "uses": uses}
+            )
+        # Later generations for the role must differ from pooled questions
+        question_index.add_many(questions, [role_scope(key[0])])
+
+    def _start_refill(self, key) -> bool:
+        """Claim the refill for ``key`` if its pool is below the low-water mark"""
+        with self._lock:
+            if (
+                self._requests.get(key, 0) < self.refill_after
+                or len(self._pools.get(key, ())) >= self.low_water
+                or key in self._refilling
+            ):
+                return False
+            self._refilling.add(key)
+            return True
+
+    def _is_full(self, key) -> bool:
+        with self._lock:
+            # An evicted key is no longer worth refilling
+            pool = self._pools.get(key)
+            return pool is None or len(pool) >= self.pool_size
+
+    def _finish_refill(self, key):
+        with self._lock:
+            self._refilling.discard(key)
+
+    def get(self, role, experience, skills, generate, candidate=None) -> list:
+        """Return a question set, generating synchronously only on a cold pool
+
+        ``generate`` is called with (role, experience, skills, avoid=scopes)
+        and must return a list of six question dicts. With a ``candidate``,
+        no question similar to one they were already served is returned;
+        when the pool cannot supply a full set, a fresh one is generated.
+        """
+        key = question_bank_key(role, experience, skills)
+        history = (candidate_scope(candidate),) if candidate else ()
+        questions = self._take(key, history)
+
+        if questions is None:
+            questions = validate_question_set(
+                generate(role, experience, skills, avoid=(role_scope(role),) + history)
+            )
+            # The fresh set goes to this caller; later callers share it
+            self._add(key, questions, uses=1)
+        question_index.add_many(questions, history)
+        self._refill_in_background(key, role, experience, skills, generate)
+        return [dict(question) for question in questions]
+
+    def stream(self, role, experience, skills, stream_fresh, generate, candidate=None):
+        """Yield a question set one question at a time, like ``get``
+
+        A pooled set is yielded at once. On a cold pool, ``stream_fresh``
+        (called like ``generate``) yields a fresh set's questions as they are
+        generated; the completed set then joins the pool.
+        """
+        key = question_bank_key(role, experience, skills)
+        history = (candidate_scope(candidate),) if candidate else ()
+        questions = self._take(key, history)
+
+        if questions is None:
+            questions = []
+            avoid = (role_scope(role),) + history
+            for question in stream_fresh(role, experience, skills, avoid=avoid):
+                questions.append(question)
+                yield dict(question)
+            self._add(key, validate_question_set(list(questions)), uses=1)
+        else:
+            for question in questions:
+                yield dict(question)
+        question_index.add_many(questions, history)
+        self._refill_in_background(key, role, experience, skills, generate)
+
+    def _refill_in_background(self, key, role, experience, skills, generate):
+        if self._start_refill(key):
+            thread = threading.Thread(
+                target=self._refill,
+                args=(key, role, experience, skills, generate),
+                daemon=True,
+            )
+            thread.start()
+
+    async def aget(self, role, experience, skills, generate, candidate=None) -> list:
+        """Async variant of ``get`` for a coroutine ``generate``"""
+        key = question_bank_key(role, experience, skills)
+        history = (candidate_scope(candidate),) if candidate else ()
+        questions = self._take(key, history)
+
+        if questions is None:
+            questions = validate_question_set(
+                await generate(
+                    role, experience, skills, avoid=(role_scope(role),) + history
+                )
+            )
+            self._add(key, questions, uses=1)
+        question_index.add_many(questions, history)
+        self._arefill_in_background(key, role, experience, skills, generate)
+        return [dict(question) for question in questions]
+
+    async def astream(
+        self, role, experience, skills, stream_fresh, generate, candidate=None
+    ):
+        """Async variant of ``stream`` for an async ``stream_fresh``"""
+        key = question_bank_key(role, experience, skills)
+        history = (candidate_scope(candidate),) if candidate else ()
+        questions = self._take(key, history)
+
+        if questions is None:
+            questions = []
+            avoid = (role_scope(role),) + history
+            async for question in stream_fresh(role, experience, skills, avoid=avoid):
+                questions.append(question)
+                yield dict(question)
+            self._add(key, validate_question_set(list(questions)), uses=1)
+        else:
+            for question in questions:
+                yield dict(question)
+        question_index.add_many(questions, history)
+        self._arefill_in_background(key, role, experience, skills, generate)
+
+    def _arefill_in_background(self, key, role, experience, skills, generate):
+        if self._start_refill(key):
+            task = asyncio.ensure_future(
+                self._arefill(key, role, experience, skills, generate)
+            )
+            # Keep a reference so the task is not garbage collected mid-refill
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _sample(self, pool, avoid=()) -> list:
+        """Mix questions per difficulty across pooled sets
+
+        Drawing each difficulty's questions from the whole pool means two
+        candidates rarely receive an identical set even when the pool holds
+        only a few generations. Questions similar to one in the ``avoid``
+        scopes are skipped; returns None if that leaves a difficulty short.
+        """
+        picked = []
+        for difficulty in DIFFICULTY_TIME_LIMITS:
+            candidates = {}
+            for index, entry in enumerate(pool):
+                for question in entry["questions"]:
+                    if question["difficulty"] == difficulty:
+                        text = question["question"]
+                        candidates.setdefault(text, (index, question))
+            if avoid:
+                candidates = {
+                    text: candidate
+                    for text, candidate in candidates.items()
+                    if not question_index.is_repeat(text, avoid)
+                }
+                if len(candidates) < QUESTIONS_PER_DIFFICULTY:
+                    return None
+
+            picked += self.rng.sample(
+                list(candidates.values()),
+                min(QUESTIONS_PER_DIFFICULTY, len(candidates)),
+            )
+
+        questions = []
+        used = {}
+        for index, question in picked:
+            used[index] = used.get(index, 0) + 1
+            questions.append(question)
+
+        for index, count in used.items():
+            pool[index]["uses"] += count / len(questions)
+        pool[:] = [entry for entry in pool if entry["uses"] < self.max_uses]
+        return questions
+
+    def _refill(self, key, role, experience, skills, generate):
+        try:
+            while not self._is_full(key):
+                try:
+                    questions = validate_question_set(
+                        generate(role, experience, skills, avoid=(role_scope(role),))
+                    )
+                except Exception as e:
+                    record_error(e, "question-refill")
+                    return
+                self._add(key, questions)
+        finally:
+            self._finish_refill(key)
+
+    async def _arefill(self, key, role, experience, skills, generate):
+        # Runs in its own task, so only the refill calls yield to live requests
+        current_priority.set(PRIORITY_BACKGROUND)
+        # Its calls are not part of the request that started the refill
+        current_trace.set(None)
+        try:
+            while not self._is_full(key):
+                try:
+                    questions = validate_question_set(
+                        await generate(
+                            role, experience, skills, avoid=(role_scope(role),)
+                        )
+                    )
+                except Exception as e:
+                    record_error(e, "question-refill")
+                    return
+                self._add(key, questions)
+        finally:
+            self._finish_refill(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pools": len(self._pools),
+                "pooledSets": sum(len(pool) for pool in self._pools.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+question_bank = QuestionBank()
@@ -0,0 +1,306 @@
+"""Near-duplicate detection for interview questions
+
+Generated sets sometimes repeat a question in other words, and across
+sessions for the same role the model keeps coming back to the same few
+questions. Every issued question is kept here as a MinHash signature over
+its word unigrams and bigrams (stop words dropped), so two questions'
+signatures agree in roughly the fraction of their shingles they share.
+
+Signatures live in one NumPy array. Lookups go through banded
+locality-sensitive hashing: each signature is cut into ``bands`` slices and
+each slice hashed to a key, so only questions sharing a whole slice are
+compared. Band keys are kept in a sorted array searched with
+``searchsorted`` plus a small unsorted buffer of recent additions that is
+merged in once full, which keeps a lookup's cost flat as the index grows
+and its memory at a few hundred bytes per question.
+
+Entries belong to a scope, e.g. a role or a candidate, and lookups name the
+scopes to check against. The index is in memory, per process, and bounded:
+a scope keeps its latest ``QUESTION_INDEX_SCOPE_ENTRIES`` questions, and
+past ``QUESTION_INDEX_MAX_ENTRIES`` in all the least recently used scopes
+are dropped. Dropped rows stop matching at once and are compacted away
+once they outnumber the live ones.
+"""
+
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+from _core import lazy_import
+
+# Estimated Jaccard similarity of shingles above which questions count as repeats
+QUESTION_SIMILARITY_THRESHOLD = float(
+    os.getenv("QUESTION_SIMILARITY_THRESHOLD", "0.6")
+)
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+# Recent additions searched linearly before they are merged into the sorted keys
+LSH_BUFFER_SIZE = 1024
+# Questions kept per scope; older ones are dropped
+QUESTION_INDEX_SCOPE_ENTRIES = int(os.getenv("QUESTION_INDEX_SCOPE_ENTRIES", "2000"))
+# Questions kept in all; the least recently used scopes are dropped past this
+QUESTION_INDEX_MAX_ENTRIES = int(os.getenv("QUESTION_INDEX_MAX_ENTRIES", "100000"))
+
+# splitmix64 finaliser constants, for the per-permutation shingle hashes
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be between can could describe do does explain for from
+    how i if in into is it its of on or please should that the their them this
+    to was we what when where which while who why will with would you your
+    """.split()
+)
+
+
+def shingles(text: str) -> set:
+    """Word unigrams and bigrams of ``text`` without stop words"""
+    words = [
+        word for word in WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS
+    ]
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+class QuestionIndex:
+    """MinHash signatures of issued questions with banded LSH lookup"""
+
+    def __init__(
+        self,
+        threshold=QUESTION_SIMILARITY_THRESHOLD,
+        permutations=MINHASH_PERMUTATIONS,
+        bands=LSH_BANDS,
+        buffer_size=LSH_BUFFER_SIZE,
+        seed=1,
+        scope_entries=QUESTION_INDEX_SCOPE_ENTRIES,
+        max_entries=QUESTION_INDEX_MAX_ENTRIES,
+    ):
+        if permutations % bands:
+            raise ValueError("permutations must be a multiple of bands")
+        self.threshold = threshold
+        self.permutations = permutations
+        self.bands = bands
+        self.buffer_size = buffer_size
+        self.seed = seed
+        self.scope_entries = scope_entries
+        self.max_entries = max_entries
+        self._np = None
+        # Rows in use, dropped ones included until the next compaction
+        self._count = 0
+        self._live = 0
+        # Scope name -> id, least recently used first
+        self._scope_ids = OrderedDict()
+        self._next_scope_id = 0
+        # Scope id -> {normalized text: row}, oldest first; skips exact repeats
+        self._scope_entries = {}
+        self._lock = threading.Lock()
+
+    def _setup(self):
+        """Import NumPy and allocate the arrays on first use"""
+        with self._lock:
+            if self._np is not None:
+                return self._np
+            np = lazy_import("numpy")
+            rng = np.random.default_rng(self.seed)
+            self._seeds = rng.integers(
+                0, 1 << 63, (self.permutations, 1), dtype=np.uint64
+            )
+            # Odd multipliers that mix each band's rows into one 64-bit key
+            rows = self.permutations // self.bands
+            self._mix = rng.integers(
+                1, 1 << 63, (self.bands, rows), dtype=np.uint64
+            ) | np.uint64(1)
+            self._signatures = np.empty((1024, self.permutations), dtype=np.uint32)
+            self._scopes = np.empty(1024, dtype=np.int32)
+            self._sorted_keys = np.empty(0, dtype=np.uint64)
+            self._sorted_ids = np.empty(0, dtype=np.int32)
+            self._buffer_keys = np.empty(self.buffer_size * self.bands, np.uint64)
+            self._buffer_ids = np.empty(self.buffer_size * self.bands, np.int32)
+            self._buffered = 0
+            self._np = np
+            return np
+
+    def signature(self, text: str):
+        """MinHash signature of ``text`` as a uint32 array"""
+        np = self._np or self._setup()
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles(text)]
+        if not hashes:
+            return np.full(self.permutations, 0xFFFFFFFF, dtype=np.uint32)
+        # One row per permutation; uint64 arithmetic wraps, as the mix expects
+        z = np.array(hashes, dtype=np.uint64) ^ self._seeds
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX_1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX_2)
+        z ^= z >> np.uint64(31)
+        return (z.min(axis=1) >> np.uint64(32)).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        rows = signature.reshape(self.bands, -1).astype(self._np.uint64)
+        return (rows * self._mix).sum(axis=1)
+
+    def _candidates(self, keys):
+        """Ids of entries sharing at least one band key"""
+        np = self._np
+        low = np.searchsorted(self._sorted_keys, keys, side="left")
+        high = np.searchsorted(self._sorted_keys, keys, side="right")
+        found = [self._sorted_ids[lo:hi] for lo, hi in zip(low, high) if hi > lo]
+        buffered = self._buffer_keys[: self._buffered]
+        found.append(self._buffer_ids[: self._buffered][np.isin(buffered, keys)])
+        return np.unique(np.concatenate(found))
+
+    def similarity(self, signature, scopes) -> float:
+        """Highest estimated similarity to an entry in ``scopes``, 0 if none"""
+        np = self._np or self._setup()
+        with self._lock:
+            scope_ids = []
+            for scope in scopes:
+                if scope in self._scope_ids:
+                    self._scope_ids.move_to_end(scope)
+                    scope_ids.append(self._scope_ids[scope])
+            if not scope_ids or not self._live:
+                return 0.0
+            ids = self._candidates(self._band_keys(signature))
+            ids = ids[np.isin(self._scopes[ids], scope_ids)]
+            if not len(ids):
+                return 0.0
+            agreement = self._signatures[ids] == signature
+        return float(agreement.mean(axis=1).max())
+
+    def add(self, text: str, scopes):
+        """Record ``text`` as issued in each of ``scopes``"""
+        np = self._np or self._setup()
+        normalized = " ".join(text.lower().split())
+        signature = self.signature(text)
+        keys = self._band_keys(signature)
+        with self._lock:
+            for scope in scopes:
+                scope_id = self._scope_ids.get(scope)
+                if scope_id is None:
+                    scope_id = self._scope_ids[scope] = self._next_scope_id
+                    self._next_scope_id += 1
+                    self._scope_entries[scope_id] = OrderedDict()
+                self._scope_ids.move_to_end(scope)
+                entries = self._scope_entries[scope_id]
+                if normalized in entries:
+                    continue
+
+                entry = self._count
+                if entry == len(self._scopes):
+                    self._signatures = np.concatenate(
+                        [self._signatures, np.empty_like(self._signatures)]
+                    )
+                    self._scopes = np.concatenate(
+                        [self._scopes, np.empty_like(self._scopes)]
+                    )
+                self._signatures[entry] = signature
+                self._scopes[entry] = scope_id
+                self._count += 1
+                self._live += 1
+                entries[normalized] = entry
+
+                start = self._buffered
+                self._buffer_keys[start : start + self.bands] = keys
+                self._buffer_ids[start : start + self.bands] = entry
+                self._buffered += self.bands
+                if self._buffered == len(self._buffer_keys):
+                    self._merge()
+
+                if len(entries) > self.scope_entries:
+                    self._drop(entries.popitem(last=False)[1])
+            self._evict()
+
+    def _drop(self, entry):
+        """Stop matching ``entry``; its row is reclaimed by ``_compact``"""
+        self._scopes[entry] = -1
+        self._live -= 1
+
+    def _evict(self):
+        """Drop least recently used scopes until within ``max_entries``"""
+        while self._live > self.max_entries:
+            scope, scope_id = next(iter(self._scope_ids.items()))
+            if len(self._scope_ids) == 1:
+                # A single scope larger than the whole index loses its oldest
+                self._drop(self._scope_entries[scope_id].popitem(last=False)[1])
+                continue
+            del self._scope_ids[scope]
+            for entry in self._scope_entries.pop(scope_id).values():
+                self._drop(entry)
+        if self._count - self._live > max(self._live, self.buffer_size):
+            self._compact()
+
+    def _compact(self):
+        """Move live rows to the front and forget the dropped rows' band keys"""
+        np = self._np
+        live = np.flatnonzero(self._scopes[: self._count] >= 0)
+        remap = np.full(self._count, -1, dtype=np.int32)
+        remap[live] = np.arange(len(live), dtype=np.int32)
+        self._signatures[: len(live)] = self._signatures[live]
+        self._scopes[: len(live)] = self._scopes[live]
+        self._count = len(live)
+
+        # Filtering keeps the sorted keys sorted
+        ids = remap[self._sorted_ids]
+        self._sorted_keys = self._sorted_keys[ids >= 0]
+        self._sorted_ids = ids[ids >= 0]
+        ids = remap[self._buffer_ids[: self._buffered]]
+        keys = self._buffer_keys[: self._buffered][ids >= 0]
+        self._buffered = len(keys)
+        self._buffer_keys[: self._buffered] = keys
+        self._buffer_ids[: self._buffered] = ids[ids >= 0]
+
+        for entries in self._scope_entries.values():
+            for text, entry in entries.items():
+                entries[text] = int(remap[entry])
+
+    def _merge(self):
+        """Fold the buffer into the sorted keys: one sort of the buffer, one copy"""
+        np = self._np
+        order = np.argsort(self._buffer_keys, kind="stable")
+        keys, ids = self._buffer_keys[order], self._buffer_ids[order]
+        positions = np.searchsorted(self._sorted_keys, keys)
+        self._sorted_keys = np.insert(self._sorted_keys, positions, keys)
+        self._sorted_ids = np.insert(self._sorted_ids, positions, ids)
+        self._buffered = 0
+
+    def add_many(self, questions, scopes):
+        for question in questions:
+            self.add(question["question"], scopes)
+
+    def dedupe(self, questions, scopes=(), existing=()) -> tuple:
+        """Split ``questions`` into (kept, repeats)
+
+        A question is a repeat when it is too similar to one in ``existing``,
+        to an earlier kept question, or to an entry in ``scopes``.
+        """
+        np = self._np or self._setup()
+        kept, repeats = [], []
+        seen = [self.signature(question["question"]) for question in existing]
+        for question in questions:
+            signature = self.signature(question["question"])
+            within = (
+                float((np.stack(seen) == signature).mean(axis=1).max()) if seen else 0.0
+            )
+            if max(within, self.similarity(signature, scopes)) >= self.threshold:
+                repeats.append(question)
+            else:
+                kept.append(question)
+                seen.append(signature)
+        return kept, repeats
+
+    def is_repeat(self, text: str, scopes) -> bool:
+        if not scopes:
+            return False
+        return self.similarity(self.signature(text), scopes) >= self.threshold
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "questions": self._live,
+                "scopes": len(self._scope_ids),
+                "threshold": self.threshold,
+            }
+
+
+question_index = QuestionIndex()
@@ -0,0 +1,227 @@
+"""Resume text clean-up and section-aware compaction for prompts
+
+Prompts used to carry the whole extracted resume, although contact details
+sit in the first lines and long CVs mostly add tokens and latency. Text now
+goes through three steps:
+
+- ``strip_page_furniture`` drops header and footer lines that PDF pages
+  repeat (names, "Page 2 of 3", confidentiality notes), keeping the first copy
+- ``detect_sections`` splits the text on headings such as "Experience" or
+  "Technical Skills"; text before the first heading is the ``header`` section
+- ``compact_resume`` keeps only the sections a prompt needs, in document
+  order and within a token budget (``RESUME_TOKEN_BUDGET``)
+"""
+
+import os
+import re
+
+from _scheduler import CHARS_PER_TOKEN
+
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "500"))
+
+# Lines at either end of a page that are checked for repetition
+FURNITURE_LINES = 3
+
+# Sections each prompt reads; "header" is the text before the first heading
+PROMPT_SECTIONS = {
+    "contact": ("header", "contact"),
+}
+
+SECTION_HEADINGS = {
+    "contact": (
+        "contact",
+        "contact details",
+        "contact information",
+        "personal details",
+        "personal information",
+    ),
+    "summary": (
+        "summary",
+        "professional summary",
+        "profile",
+        "professional profile",
+        "objective",
+        "career objective",
+        "about",
+        "about me",
+    ),
+    "experience": (
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+    ),
+    "skills": (
+        "skills",
+        "technical skills",
+        "key skills",
+        "core skills",
+        "core competencies",
+        "technologies",
+        "tech stack",
+        "tools",
+    ),
+    "projects": ("projects", "personal projects", "selected projects"),
+    "education": ("education", "academic background", "qualifications"),
+    "other": (
+        "certifications",
+        "certificates",
+        "awards",
+        "publications",
+        "languages",
+        "interests",
+        "hobbies",
+        "references",
+        "volunteering",
+    ),
+}
+HEADING_SECTIONS = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+# Decoration around a heading: "== SKILLS ==", "Experience:", "• Education"
+HEADING_DECORATION = re.compile(r"^[\W_]+|[\W_]+$")
+
+# Contact details found outside the contact sections (e.g. in a page footer)
+EMAIL_LIKE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_LIKE = re.compile(r"\+?\(?\d[\d ().-]{5,}\d")
+
+SPACE_RUNS = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+BLANK_RUNS = re.compile(r"\n{3,}")
+DIGITS = re.compile(r"\d+")
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count of ``text``"""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines, and trim every line"""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n")
+    lines = (SPACE_RUNS.sub(" ", line).strip() for line in text.split("\n"))
+    return BLANK_RUNS.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _furniture_key(line: str) -> str:
+    # Page numbers differ from page to page: "Page 2 of 3" ~ "Page 3 of 3"
+    return DIGITS.sub("#", SPACE_RUNS.sub(" ", line).strip().lower())
+
+
+def strip_page_furniture(pages) -> list:
+    """Drop lines repeated at the top or bottom of several pages
+
+    A line counts as furniture when it appears within the first or last
+    ``FURNITURE_LINES`` lines of at least half the pages (and at least two).
+    Only its first occurrence is kept, so a name or email that is repeated
+    in every page header still reaches the contact prompt once.
+    """
+    pages = list(pages)
+    if len(pages) < 2:
+        return pages
+
+    page_lines = [page.split("\n") for page in pages]
+    seen_on = {}
+    for number, lines in enumerate(page_lines):
+        content = [line for line in lines if line.strip()]
+        edges = content[:FURNITURE_LINES] + content[-FURNITURE_LINES:]
+        for key in {_furniture_key(line) for line in edges}:
+            seen_on.setdefault(key, set()).add(number)
+
+    threshold = max(2, (len(pages) + 1) // 2)
+    furniture = {key for key, numbers in seen_on.items() if len(numbers) >= threshold}
+    if not furniture:
+        return pages
+
+    kept = set()
+    cleaned = []
+    for lines in page_lines:
+        page = []
+        for line in lines:
+            key = _furniture_key(line)
+            if key in furniture and line.strip():
+                if key in kept:
+                    continue
+                kept.add(key)
+            page.append(line)
+        cleaned.append("\n".join(page))
+    return cleaned
+
+
+def _heading(line: str):
+    """Section name when ``line`` is a section heading, else None"""
+    if not line or len(line) > 40:
+        return None
+    words = HEADING_DECORATION.sub("", line).lower()
+    words = " ".join(words.replace("&", "and").split())
+    return HEADING_SECTIONS.get(words)
+
+
+def detect_sections(text: str) -> list:
+    """Split normalized text into [(section, text)] in document order
+
+    Text before the first heading is the ``header`` section. A section name
+    can appear more than once, e.g. two experience headings.
+    """
+    sections = []
+    name, lines = "header", []
+    for line in text.split("\n"):
+        heading = _heading(line)
+        if heading is None:
+            lines.append(line)
+            continue
+        if any(lines):
+            sections.append((name, "\n".join(lines).strip()))
+        name, lines = heading, [line]
+    if any(lines):
+        sections.append((name, "\n".join(lines).strip()))
+    return sections
+
+
+def _has_contact_details(line: str) -> bool:
+    if EMAIL_LIKE.search(line):
+        return True
+    return any(
+        sum(char.isdigit() for char in match.group()) >= 7
+        for match in PHONE_LIKE.finditer(line)
+    )
+
+
+def _truncate(text: str, budget: int) -> str:
+    """Cut ``text`` to ``budget`` tokens on a line boundary where possible"""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit + 1)
+    return text[: cut if cut > limit // 2 else limit].rstrip()
+
+
+def compact_resume(text: str, purpose: str, budget: int = None) -> str:
+    """Normalized text of the sections ``purpose`` needs, within ``budget``
+
+    ``purpose`` is a key of ``PROMPT_SECTIONS``. When none of its sections
+    are found, the start of the resume is used instead. The contact prompt
+    also gets any line elsewhere that looks like an email or phone number.
+    """
+    if budget is None:
+        budget = RESUME_TOKEN_BUDGET
+    wanted = PROMPT_SECTIONS[purpose]
+    sections = detect_sections(normalize_whitespace(text))
+    parts = [body for name, body in sections if name in wanted]
+    if not parts:
+        return _truncate("\n\n".join(body for _, body in sections), budget)
+    if purpose == "contact":
+        found = [
+            line
+            for name, body in sections
+            if name not in wanted
+            for line in body.split("\n")
+            if _has_contact_details(line)
+        ]
+        if found:
+            parts.append("\n".join(found))
+    return _truncate("\n\n".join(parts), budget)
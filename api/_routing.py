@@ -0,0 +1,220 @@
+"""Hedged model calls across model tiers
+
+A slow call used to hold its request for the model's full tail latency. When
+``LLM_HEDGE_MODELS`` lists alternate models, a ``ModelRouter`` starts the
+primary model and, if it has not answered by a deadline taken from that
+operation's recent primary latencies, a second call on the next tier. The
+first answer that passes validation (valid JSON by default) wins and the
+other call is cancelled. A tier that fails or answers with invalid output
+hands over to the next tier straight away.
+
+Configured with environment variables:
+
+- ``LLM_HEDGE_MODELS``: comma-separated fallback models, fastest-first
+  (default empty, which disables hedging)
+- ``LLM_HEDGE_PERCENTILE``: primary latency percentile used as the deadline
+- ``LLM_HEDGE_DELAY_SECONDS``: deadline used until an operation has
+  ``LLM_HEDGE_MIN_SAMPLES`` latency samples
+"""
+
+import asyncio
+import collections
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from _llm_json import extract_json
+
+LLM_HEDGE_MODELS = [
+    name.strip()
+    for name in os.getenv("LLM_HEDGE_MODELS", "").split(",")
+    if name.strip()
+]
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+LLM_HEDGE_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "5"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# Recent primary latencies kept per operation
+LATENCY_WINDOW = 200
+
+
+class ModelRouter:
+    """Run one logical call on ``tiers`` in order, hedging slow attempts
+
+    ``call`` passed to ``run``/``run_sync`` takes a model name and makes one
+    call on it; ``validate`` takes the result and raises ValueError when it
+    is unusable.
+    """
+
+    def __init__(
+        self,
+        primary: str,
+        hedges: list = None,
+        percentile: float = LLM_HEDGE_PERCENTILE,
+        default_delay: float = LLM_HEDGE_DELAY_SECONDS,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+    ):
+        self.tiers = [primary, *(LLM_HEDGE_MODELS if hedges is None else hedges)]
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.hedges = 0
+        self.fallbacks = 0
+        self.wins = collections.defaultdict(collections.Counter)
+        self._latencies = collections.defaultdict(
+            lambda: collections.deque(maxlen=LATENCY_WINDOW)
+        )
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def hedging(self) -> bool:
+        return len(self.tiers) > 1
+
+    def deadline(self, operation: str) -> float:
+        """Seconds to wait for the primary before hedging ``operation``"""
+        with self._lock:
+            return self._deadline(self._latencies[operation])
+
+    def _deadline(self, samples) -> float:
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        ordered = sorted(samples)
+        return ordered[int(self.percentile * (len(ordered) - 1))]
+
+    def _record(self, operation, tier, latency, won=False):
+        with self._lock:
+            if tier == self.tiers[0]:
+                # A cancelled primary is counted at the time it was given up
+                # on, so the percentile slightly underestimates the tail
+                self._latencies[operation].append(latency)
+            if won:
+                self.wins[operation][tier] += 1
+
+    async def run(self, call, operation: str = "default", validate=extract_json):
+        """Await the first valid result across the tiers"""
+        loop = asyncio.get_running_loop()
+        if not self.hedging:
+            start = loop.time()
+            result = await call(self.tiers[0])
+            self._record(operation, self.tiers[0], loop.time() - start, won=True)
+            return result
+
+        started = {}
+        attempts = {}
+        errors = []
+
+        def launch():
+            tier = self.tiers[len(started)]
+            started[tier] = loop.time()
+            attempts[asyncio.ensure_future(call(tier))] = tier
+
+        launch()
+        hedge_at = loop.time() + self.deadline(operation)
+        try:
+            while attempts:
+                timeout = None
+                if len(started) < len(self.tiers):
+                    timeout = max(hedge_at - loop.time(), 0)
+                done, _ = await asyncio.wait(
+                    attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self.hedges += 1
+                    launch()
+                    hedge_at = loop.time() + self.deadline(operation)
+                    continue
+                for attempt in done:
+                    tier = attempts.pop(attempt)
+                    latency = loop.time() - started[tier]
+                    try:
+                        result = attempt.result()
+                        validate(result)
+                    except Exception as e:
+                        errors.append(e)
+                        if not attempts and len(started) < len(self.tiers):
+                            self.fallbacks += 1
+                            launch()
+                            hedge_at = loop.time() + self.deadline(operation)
+                        continue
+                    self._record(operation, tier, latency, won=True)
+                    return result
+            raise errors[0]
+        finally:
+            for attempt, tier in attempts.items():
+                attempt.cancel()
+                self._record(operation, tier, loop.time() - started[tier])
+
+    def run_sync(self, call, operation: str = "default", validate=extract_json):
+        """Blocking counterpart of ``run`` for the Vercel handlers
+
+        A blocking call cannot be interrupted, so the losing call is left to
+        finish in its thread and its result is discarded.
+        """
+        if not self.hedging:
+            start = time.monotonic()
+            result = call(self.tiers[0])
+            self._record(operation, self.tiers[0], time.monotonic() - start, won=True)
+            return result
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="hedge")
+        executor = self._executor
+        started = {}
+        attempts = {}
+        errors = []
+
+        def launch():
+            tier = self.tiers[len(started)]
+            started[tier] = time.monotonic()
+            attempts[executor.submit(call, tier)] = tier
+
+        launch()
+        hedge_at = time.monotonic() + self.deadline(operation)
+        try:
+            while attempts:
+                timeout = None
+                if len(started) < len(self.tiers):
+                    timeout = max(hedge_at - time.monotonic(), 0)
+                done, _ = wait(attempts, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    self.hedges += 1
+                    launch()
+                    hedge_at = time.monotonic() + self.deadline(operation)
+                    continue
+                for attempt in done:
+                    tier = attempts.pop(attempt)
+                    latency = time.monotonic() - started[tier]
+                    try:
+                        result = attempt.result()
+                        validate(result)
+                    except Exception as e:
+                        errors.append(e)
+                        if not attempts and len(started) < len(self.tiers):
+                            self.fallbacks += 1
+                            launch()
+                            hedge_at = time.monotonic() + self.deadline(operation)
+                        continue
+                    self._record(operation, tier, latency, won=True)
+                    return result
+            raise errors[0]
+        finally:
+            for attempt, tier in attempts.items():
+                attempt.cancel()
+                self._record(operation, tier, time.monotonic() - started[tier])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tiers": list(self.tiers),
+                "hedges": self.hedges,
+                "fallbacks": self.fallbacks,
+                "deadlines": {
+                    operation: round(self._deadline(samples), 3)
+                    for operation, samples in self._latencies.items()
+                },
+                "wins": {
+                    operation: dict(counts) for operation, counts in self.wins.items()
+                },
+            }
@@ -0,0 +1,309 @@
+"""Central scheduling for every LLM call
+
+Each call used to be a single unguarded attempt: a 429 went straight to a
+500, and under load every request kept hitting an exhausted quota. All calls
+now go through one ``LLMScheduler`` per process, which provides:
+
+- token buckets sized to the requests- and tokens-per-minute quota
+  (``LLM_RPM``, ``LLM_TPM``)
+- priority classes: waiting calls are admitted interactive first, then
+  batch, then background (question pool refills)
+- retries with full-jitter exponential backoff on 429s, 5xx responses and
+  timeouts, honouring ``Retry-After`` when the error carries one
+- a circuit breaker: after ``LLM_BREAKER_THRESHOLD`` consecutive retryable
+  failures, calls fail fast with CircuitOpenError for
+  ``LLM_BREAKER_COOLDOWN_SECONDS``, then a single probe call decides whether
+  to close it again
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+
+LLM_RPM = float(os.getenv("LLM_RPM", "300"))
+LLM_TPM = float(os.getenv("LLM_TPM", "1000000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+# Response size counted against the tokens-per-minute quota up front
+OUTPUT_TOKEN_ESTIMATE = 256
+# Rough size of a token in English text
+CHARS_PER_TOKEN = 4
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Priority of the LLM calls made from the current task or thread
+current_priority = contextvars.ContextVar(
+    "llm_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+class CircuitOpenError(Exception):
+    """Recent calls kept failing, so this one was rejected without trying"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("AI service is temporarily unavailable")
+        self.retry_after = retry_after
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough token count of a call: the prompt plus a typical response"""
+    return len(prompt) // CHARS_PER_TOKEN + OUTPUT_TOKEN_ESTIMATE
+
+
+def _status(error):
+    code = getattr(error, "code", None)
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Quota, server and timeout errors are worth another attempt"""
+    if getattr(error, "retryable", False):
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return _status(error) in RETRYABLE_STATUS
+
+
+def _retry_after(error):
+    headers = getattr(error, "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Refills ``limit`` units evenly over ``window`` seconds"""
+
+    def __init__(self, limit: float, window: float = 60.0):
+        self.capacity = limit
+        self.rate = limit / window
+        self.available = limit
+        self.updated = time.monotonic()
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` units are available"""
+        self.available = min(
+            self.capacity, self.available + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        # A call larger than the whole bucket waits for a full bucket
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def take(self, amount: float):
+        self.available -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE_SECONDS,
+        backoff_max: float = LLM_BACKOFF_MAX_SECONDS,
+        breaker_threshold: int = LLM_BREAKER_THRESHOLD,
+        breaker_cooldown: float = LLM_BREAKER_COOLDOWN_SECONDS,
+        window: float = 60.0,
+    ):
+        # ``window`` is the quota period; only the benchmarks shorten it
+        self.request_bucket = TokenBucket(rpm, window)
+        self.token_bucket = TokenBucket(tpm, window)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = None
+
+    def _reserve(self, tokens: int) -> float:
+        """Take quota for one call, or return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(
+                self.request_bucket.delay(1, now),
+                self.token_bucket.delay(tokens, now),
+            )
+            if delay <= 0:
+                self.request_bucket.take(1)
+                self.token_bucket.take(tokens)
+            return delay
+
+    async def acquire(self, tokens: int, priority: int):
+        """Wait for quota; the highest-priority, oldest waiter goes first"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        entry = (priority, next(self._sequence))
+        async with self._condition:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0] == entry:
+                        timeout = self._reserve(tokens)
+                        if timeout <= 0:
+                            return
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def acquire_sync(self, tokens: int):
+        """Blocking quota wait for the synchronous Vercel handlers"""
+        while True:
+            delay = self._reserve(tokens)
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _check_circuit(self) -> bool:
+        """Raise while the circuit is open; returns whether this call is the probe"""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self._opened_at + self.breaker_cooldown - time.monotonic()
+            if remaining > 0 or self._probing:
+                self.rejected += 1
+                raise CircuitOpenError(max(remaining, 1.0))
+            # Half-open: this call is the probe
+            self._probing = True
+            return True
+
+    def _abandon_probe(self):
+        """Let another call probe after this one was cancelled mid-probe"""
+        with self._lock:
+            self._probing = False
+
+    def _record(self, error=None):
+        """Update the breaker after an attempt; returns whether to retry"""
+        with self._lock:
+            self._probing = False
+            if error is not None and is_retryable(error):
+                if _status(error) == 429:
+                    self.throttled += 1
+                self._failures += 1
+                if self._failures >= self.breaker_threshold:
+                    self._opened_at = time.monotonic()
+                return True
+            if error is None or _status(error) is not None:
+                # The service answered, even if the request itself was bad
+                self._failures = 0
+                self._opened_at = None
+            # Anything else was raised on this side, e.g. a client disconnect
+            # or a parse error, and says nothing about the service
+            return False
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential delay, or the server's Retry-After"""
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def run(self, call, tokens: int, priority: int = None):
+        """Await ``call()`` under the quota, retrying transient failures
+
+        ``call`` is a coroutine function making one attempt. ``priority``
+        defaults to the ``current_priority`` of the calling task.
+        """
+        if priority is None:
+            priority = current_priority.get()
+        attempt = 0
+        while True:
+            probe = self._check_circuit()
+            try:
+                await self.acquire(tokens, priority)
+                self.calls += 1
+                result = await call()
+            except Exception as e:
+                if not self._record(e) or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt, e)
+            except BaseException:
+                # Cancelled, e.g. a lost hedge or a client disconnect; an
+                # unfinished probe would otherwise keep the circuit shut
+                if probe:
+                    self._abandon_probe()
+                raise
+            else:
+                self._record()
+                return result
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def run_sync(self, call, tokens: int):
+        """Blocking counterpart of ``run`` for the Vercel handlers"""
+        attempt = 0
+        while True:
+            probe = self._check_circuit()
+            try:
+                self.acquire_sync(tokens)
+                self.calls += 1
+                result = call()
+            except Exception as e:
+                if not self._record(e) or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt, e)
+            except BaseException:
+                if probe:
+                    self._abandon_probe()
+                raise
+            else:
+                self._record()
+                return result
+            self.retries += 1
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._opened_at is None:
+                circuit = "closed"
+            elif self._probing:
+                circuit = "half-open"
+            else:
+                circuit = "open"
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "waiting": len(self._waiting),
+                "circuit": circuit,
+            }
+
+
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,199 @@
+"""Interview session storage for incremental answer evaluation
+
+Each session holds its questions plus the answers and evaluations submitted
+so far, keyed by question index. The backend is selected with the
+SESSION_STORE environment variable:
+
+- ``memory``: process-local dict (default)
+- ``sqlite``: on-disk store shared by every worker on the host
+
+Sessions expire ``SESSION_TTL_SECONDS`` after they are created; the memory
+store also keeps at most ``SESSION_MAX_ENTRIES``, dropping the oldest. An
+unanswered question's answer is "" in both stores.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_SQLITE_PATH = os.getenv(
+    "SESSION_SQLITE_PATH", "/tmp/interview-assistant-sessions.sqlite3"
+)
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600)))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+
+
+class MemorySessionStore:
+    def __init__(self, max_entries=SESSION_MAX_ENTRIES, ttl=SESSION_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # In creation order, so the oldest sessions are evicted first
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if (
+                len(self._sessions) <= self.max_entries
+                and session["createdAt"] + self.ttl >= now
+            ):
+                break
+            del self._sessions[session_id]
+
+    def create(self, questions: list) -> str:
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = {
+                "questions": questions,
+                "answers": {},
+                "evaluations": {},
+                "createdAt": now,
+            }
+            self._evict(now)
+        return session_id
+
+    def get(self, session_id: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session["createdAt"] + self.ttl < time.time():
+                return None
+            return {
+                "questions": list(session["questions"]),
+                "answers": dict(session["answers"]),
+                "evaluations": dict(session["evaluations"]),
+                "createdAt": session["createdAt"],
+            }
+
+    def set_answer(self, session_id: str, index: int, answer: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session["answers"][index] = answer
+            # A resubmitted answer invalidates its previous score
+            session["evaluations"].pop(index, None)
+
+    def set_evaluation(self, session_id: str, index: int, answer: str, evaluation):
+        """Store ``evaluation`` unless the answer changed while it was scored"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session["answers"].get(index, "") == answer:
+                session["evaluations"][index] = evaluation
+
+
+class SQLiteSessionStore:
+    """An unanswered question has no row, or one whose answer is NULL"""
+
+    def __init__(self, path=SESSION_SQLITE_PATH, ttl=SESSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, questions TEXT, created_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_answers ("
+                "session_id TEXT, idx INTEGER, answer TEXT, evaluation TEXT, "
+                "PRIMARY KEY (session_id, idx))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_created_at "
+                "ON sessions (created_at)"
+            )
+
+    def create(self, questions: list) -> str:
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            # Expired sessions are dropped as new ones start
+            self._conn.execute(
+                "DELETE FROM session_answers WHERE session_id IN "
+                "(SELECT id FROM sessions WHERE created_at < ?)",
+                (now - self.ttl,),
+            )
+            self._conn.execute(
+                "DELETE FROM sessions WHERE created_at < ?", (now - self.ttl,)
+            )
+            self._conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?)",
+                (session_id, json.dumps(questions), now),
+            )
+        return session_id
+
+    def get(self, session_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT questions, created_at FROM sessions WHERE id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None or row[1] + self.ttl < time.time():
+                return None
+            answers = self._conn.execute(
+                "SELECT idx, answer, evaluation FROM session_answers "
+                "WHERE session_id = ?",
+                (session_id,),
+            ).fetchall()
+        return {
+            "questions": json.loads(row[0]),
+            "answers": {
+                index: answer for index, answer, _ in answers if answer is not None
+            },
+            "evaluations": {
+                index: json.loads(evaluation)
+                for index, _, evaluation in answers
+                if evaluation is not None
+            },
+            "createdAt": row[1],
+        }
+
+    def set_answer(self, session_id: str, index: int, answer: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO session_answers VALUES (?, ?, ?, NULL)",
+                (session_id, index, answer),
+            )
+
+    def set_evaluation(self, session_id: str, index: int, answer: str, evaluation):
+        """Store ``evaluation`` unless the answer changed while it was scored"""
+        with self._lock, self._conn:
+            if answer:
+                self._conn.execute(
+                    "UPDATE session_answers SET evaluation = ? "
+                    "WHERE session_id = ? AND idx = ? AND answer = ?",
+                    (json.dumps(evaluation), session_id, index, answer),
+                )
+                return
+            # An unanswered question has no row yet
+            self._conn.execute(
+                "INSERT INTO session_answers VALUES (?, ?, NULL, ?) "
+                "ON CONFLICT (session_id, idx) DO UPDATE "
+                "SET evaluation = excluded.evaluation WHERE IFNULL(answer, '') = ''",
+                (session_id, index, json.dumps(evaluation)),
+            )
+
+
+SESSION_STORES = {"memory": MemorySessionStore, "sqlite": SQLiteSessionStore}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Return the process-wide session store, creating it on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = SESSION_STORES.get(SESSION_STORE)
+            if backend is None:
+                raise ValueError(f"Unknown SESSION_STORE: {SESSION_STORE}")
+            _store = backend()
+        return _store
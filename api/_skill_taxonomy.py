@@ -0,0 +1,248 @@
+"""Skills recognised in resume text, as canonical name -> aliases
+
+Aliases are matched case-insensitively on whole words; the canonical name is
+matched too and need not be repeated, except for the names in
+``ALIAS_ONLY`` that are everyday words or single letters. Other ambiguous
+words ("rest", "express", "spring") are only listed in longer forms.
+"""
+
+# Canonical names matched only through their aliases
+ALIAS_ONLY = {"Go", "R"}
+
+SKILL_TAXONOMY = {
+    # Languages
+    "Python": ("python3",),
+    "JavaScript": ("js", "ecmascript", "es6"),
+    "TypeScript": ("ts",),
+    "Java": (),
+    "Kotlin": (),
+    "Scala": (),
+    "Go": ("golang", "go lang"),
+    "Rust": (),
+    "C++": ("cpp",),
+    "C#": ("c sharp", "csharp"),
+    "Ruby": (),
+    "PHP": (),
+    "Swift": (),
+    "Objective-C": ("objective c", "objc"),
+    "Dart": (),
+    "Elixir": (),
+    "Erlang": (),
+    "Haskell": (),
+    "Clojure": (),
+    "F#": (),
+    "Perl": (),
+    "Lua": (),
+    "Julia": (),
+    "MATLAB": (),
+    "R": ("r programming", "rstats"),
+    "Bash": ("shell scripting", "shell script"),
+    "PowerShell": (),
+    "SQL": (),
+    "PL/SQL": ("plsql",),
+    "T-SQL": ("tsql",),
+    "GraphQL": (),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+    "Sass": ("scss",),
+    "Solidity": (),
+    "WebAssembly": ("wasm",),
+    # Frontend
+    "React": ("react.js", "reactjs"),
+    "React Native": (),
+    "Next.js": ("nextjs",),
+    "Redux": ("redux toolkit",),
+    "Vue.js": ("vue", "vuejs"),
+    "Nuxt.js": ("nuxt",),
+    "Angular": ("angularjs", "angular.js"),
+    "Svelte": ("sveltekit",),
+    "jQuery": (),
+    "Tailwind CSS": ("tailwind", "tailwindcss"),
+    "Bootstrap": (),
+    "Material UI": ("mui",),
+    "Webpack": (),
+    "Vite": (),
+    "Babel": (),
+    "Storybook": (),
+    "Three.js": ("threejs",),
+    "D3.js": ("d3",),
+    "Flutter": (),
+    "Electron": (),
+    # Backend
+    "Node.js": ("node", "nodejs"),
+    "Express.js": ("expressjs",),
+    "NestJS": ("nest.js",),
+    "Deno": (),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": (),
+    "Celery": (),
+    "Spring Framework": ("spring mvc",),
+    "Spring Boot": (),
+    "Hibernate": (),
+    "Ruby on Rails": ("rails",),
+    "Laravel": (),
+    "Symfony": (),
+    ".NET": ("dotnet", ".net core", "asp.net", "asp.net core"),
+    "gRPC": (),
+    "REST APIs": ("restful", "rest api", "restful apis", "restful services"),
+    "WebSockets": ("websocket",),
+    "Microservices": ("microservice", "micro services"),
+    "Event-driven architecture": ("event driven", "event-driven", "event sourcing"),
+    "Domain-driven design": ("ddd", "domain driven design"),
+    # Data stores
+    "PostgreSQL": ("postgres", "psql"),
+    "MySQL": (),
+    "MariaDB": (),
+    "SQLite": (),
+    "Oracle Database": ("oracle db",),
+    "SQL Server": ("mssql", "microsoft sql server"),
+    "MongoDB": ("mongo",),
+    "Redis": (),
+    "Memcached": (),
+    "Cassandra": (),
+    "DynamoDB": (),
+    "Elasticsearch": ("elastic search", "opensearch"),
+    "Neo4j": (),
+    "ClickHouse": (),
+    "Snowflake": (),
+    "BigQuery": (),
+    "Redshift": (),
+    "Firebase": ("firestore",),
+    "Supabase": (),
+    "Prisma": (),
+    "SQLAlchemy": (),
+    # Messaging and data processing
+    "Kafka": ("apache kafka",),
+    "RabbitMQ": (),
+    "Amazon SQS": ("sqs",),
+    "Pub/Sub": ("google pub/sub", "pubsub"),
+    "Apache Spark": ("spark", "pyspark"),
+    "Apache Flink": ("flink",),
+    "Apache Airflow": ("airflow",),
+    "dbt": (),
+    "Hadoop": ("hdfs",),
+    "ETL": ("elt", "data pipelines", "data pipeline"),
+    "Pandas": (),
+    "NumPy": (),
+    "SciPy": (),
+    "Jupyter": ("jupyter notebook",),
+    "Tableau": (),
+    "Power BI": ("powerbi",),
+    "Looker": (),
+    # Machine learning
+    "Machine Learning": ("ml",),
+    "Deep Learning": (),
+    "TensorFlow": (),
+    "PyTorch": ("torch",),
+    "Keras": (),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "XGBoost": (),
+    "LightGBM": (),
+    "NLP": ("natural language processing",),
+    "Computer Vision": ("opencv",),
+    "LLMs": ("llm", "large language models", "large language model"),
+    "Hugging Face": ("huggingface", "transformers"),
+    "LangChain": (),
+    "MLOps": (),
+    "MLflow": (),
+    "Kubeflow": (),
+    "Reinforcement Learning": (),
+    "Recommender Systems": ("recommendation systems",),
+    "Statistics": ("statistical modeling", "a/b testing"),
+    # Cloud and infrastructure
+    "AWS": ("amazon web services",),
+    "AWS Lambda": ("lambda functions",),
+    "Amazon S3": ("s3",),
+    "Amazon EC2": ("ec2",),
+    "Amazon ECS": ("ecs",),
+    "Amazon EKS": ("eks",),
+    "CloudFormation": (),
+    "GCP": ("google cloud", "google cloud platform"),
+    "Azure": ("microsoft azure",),
+    "Cloud Run": (),
+    "Cloudflare": ("cloudflare workers",),
+    "Vercel": (),
+    "Heroku": (),
+    "Docker": ("containers", "docker compose"),
+    "Kubernetes": ("k8s",),
+    "Helm": (),
+    "Terraform": (),
+    "Pulumi": (),
+    "Ansible": (),
+    "Chef": (),
+    "Puppet": (),
+    "Nginx": (),
+    "Apache HTTP Server": ("httpd",),
+    "Linux": ("unix",),
+    "Serverless": ("faas",),
+    "Istio": ("service mesh",),
+    "Envoy": (),
+    "Consul": (),
+    "Vault": ("hashicorp vault",),
+    # Delivery and operations
+    "CI/CD": ("continuous integration", "continuous delivery", "ci cd"),
+    "GitHub Actions": (),
+    "GitLab CI": (),
+    "Jenkins": (),
+    "CircleCI": (),
+    "ArgoCD": ("argo cd",),
+    "Git": ("github", "gitlab", "bitbucket"),
+    "Prometheus": (),
+    "Grafana": (),
+    "Datadog": (),
+    "New Relic": (),
+    "Sentry": (),
+    "OpenTelemetry": ("otel",),
+    "ELK Stack": ("elk", "logstash", "kibana"),
+    "SRE": ("site reliability engineering", "site reliability"),
+    "Observability": ("monitoring",),
+    "Incident Response": ("on-call", "on call", "incident management"),
+    "Performance Optimization": ("profiling", "performance tuning"),
+    "Load Testing": ("k6", "jmeter", "locust"),
+    # Testing
+    "Unit Testing": ("unit tests",),
+    "Test-driven development": ("tdd", "test driven development"),
+    "Jest": (),
+    "Mocha": (),
+    "Cypress": (),
+    "Playwright": (),
+    "Selenium": (),
+    "pytest": (),
+    "JUnit": (),
+    "Contract Testing": ("pact",),
+    # Security
+    "Application Security": ("appsec", "owasp"),
+    "OAuth": ("oauth2", "oauth 2.0", "openid connect", "oidc"),
+    "JWT": ("json web tokens",),
+    "Penetration Testing": ("pentesting", "pen testing"),
+    "Cryptography": (),
+    "IAM": ("identity and access management",),
+    # Mobile
+    "iOS": ("swiftui", "uikit"),
+    "Android": ("jetpack compose",),
+    "Xamarin": (),
+    "Ionic": (),
+    # Architecture and practice
+    "System Design": ("distributed systems", "scalability", "high availability"),
+    "Data Structures": ("algorithms",),
+    "Design Patterns": ("solid principles",),
+    "Object-oriented programming": ("oop", "object oriented programming"),
+    "Functional Programming": (),
+    "Concurrency": ("multithreading", "async programming", "asyncio"),
+    "Caching": ("cdn",),
+    "API Design": ("openapi", "swagger"),
+    "Blockchain": ("ethereum", "web3"),
+    "Embedded Systems": ("firmware", "rtos"),
+    "Game Development": ("unity", "unreal engine"),
+    # Ways of working
+    "Agile": ("scrum", "kanban"),
+    "Code Review": ("code reviews",),
+    "Technical Leadership": ("tech lead", "engineering lead"),
+    "Mentoring": ("mentored", "mentorship"),
+    "Product Management": ("roadmaps", "roadmap planning"),
+    "Stakeholder Management": (),
+    "Accessibility": ("a11y", "wcag"),
+    "SEO": ("search engine optimization",),
+    "UX Design": ("user experience", "figma"),
+}
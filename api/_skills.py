@@ -0,0 +1,132 @@
+"""Local skill extraction from resume text
+
+Resume text is matched against the taxonomy in ``_skill_taxonomy`` with an
+Aho-Corasick automaton over word tokens, so every alias of every skill is
+found in one pass over the text however large the taxonomy grows. Matching
+on tokens rather than characters keeps whole-word semantics for free ("Java"
+does not match "JavaScript", "C++" is not "C") and keeps the pass short.
+Overlapping matches resolve to the longest one ("React Native" over
+"React").
+
+The extracted skills fill in for a question request that carries resume
+text but no skills of its own.
+"""
+
+import os
+import re
+import threading
+
+from _skill_taxonomy import ALIAS_ONLY, SKILL_TAXONOMY
+
+RESUME_SKILL_LIMIT = int(os.getenv("RESUME_SKILL_LIMIT", "8"))
+DEFAULT_SKILLS = ["React", "Node.js", "JavaScript"]
+
+# Words, keeping the punctuation skill names use: c++, c#, node.js, .net
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9](?:[a-z0-9+#.]*[a-z0-9+#])?")
+
+_index = None
+_lock = threading.Lock()
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillIndex:
+    """Aho-Corasick automaton whose alphabet is word tokens"""
+
+    def __init__(self, taxonomy: dict, alias_only=()):
+        self._goto = [{}]
+        self._fail = [0]
+        # Per state: (token count, skill) for every term ending there
+        self._out = [()]
+        self.terms = 0
+        for skill, aliases in taxonomy.items():
+            terms = {tuple(tokenize(alias)) for alias in aliases}
+            if skill not in alias_only:
+                terms.add(tuple(tokenize(skill)))
+            for tokens in terms:
+                if tokens:
+                    self._add(tokens, skill)
+        self._link()
+
+    def _add(self, tokens, skill):
+        state = 0
+        for token in tokens:
+            following = self._goto[state].get(token)
+            if following is None:
+                following = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][token] = following
+            state = following
+        self._out[state] += ((len(tokens), skill),)
+        self.terms += 1
+
+    def _link(self):
+        """Breadth-first failure links, merging outputs along them"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, following in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(token, 0)
+                self._out[following] += self._out[self._fail[following]]
+                queue.append(following)
+
+    def matches(self, text: str) -> list:
+        """Non-overlapping (token position, skill) matches, longest first"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for position, token in enumerate(tokenize(text)):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, skill in out[state]:
+                found.append((position - length + 1, -length, skill))
+
+        found.sort()
+        matches = []
+        end = 0
+        for start, negative_length, skill in found:
+            if start >= end:
+                matches.append((start, skill))
+                end = start - negative_length
+        return matches
+
+    def extract(self, text: str, limit: int = None) -> list:
+        """Distinct skills, most mentioned first, ties in order of appearance"""
+        counts = {}
+        for _, skill in self.matches(text):
+            counts[skill] = counts.get(skill, 0) + 1
+        ranked = sorted(counts, key=lambda skill: -counts[skill])
+        return ranked[:limit] if limit else ranked
+
+
+def get_skill_index() -> SkillIndex:
+    """The taxonomy index, built on first use"""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = SkillIndex(SKILL_TAXONOMY, ALIAS_ONLY)
+    return _index
+
+
+def extract_skills(text: str, limit: int = RESUME_SKILL_LIMIT) -> list:
+    """Canonical skill names found in ``text``"""
+    return get_skill_index().extract(text, limit)
+
+
+def resolve_skills(skills, resume_text: str = None) -> list:
+    """Skills for a question request: given ones, else the resume's, else defaults"""
+    if skills:
+        return skills
+    if resume_text:
+        found = extract_skills(resume_text)
+        if found:
+            return found
+    return list(DEFAULT_SKILLS)
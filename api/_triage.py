@@ -0,0 +1,166 @@
+"""Local pre-scoring that settles obvious answers before LLM evaluation
+
+Every answer used to go to the model, including one-word answers and ones
+submitted two seconds into a 120-second question. Each answer now gets a
+0-10 pre-score from three signals:
+
+- length: words written against what the difficulty calls for
+  (``TRIAGE_EXPECTED_WORDS``)
+- pace: time taken as a fraction of the question's ``timeLimit``, when the
+  client sent ``timeTaken``; answers under ``TRIAGE_RUSHED_FRACTION`` of
+  the limit count as rushed
+- overlap: the share of the question's and category's keywords that the
+  answer mentions, on crudely stemmed words
+
+Only answers that are clearly inadequate are settled here: blank or "I
+don't know" answers, and rushed answers pre-scoring under
+``TRIAGE_SETTLE_BELOW`` when ``timeTaken`` is known. Everything else is
+ambiguous and goes to the model, short answers included, since "const" or
+"404" can be exactly right. Keyword overlap can not tell a good answer from
+a confident wrong one, so no answer is ever settled as strong.
+
+The signals are computed as NumPy arrays, so a whole candidate pool is
+rescored in one pass; only tokenization is per answer. ``answer_triage``
+in ``_metrics`` counts settled answers, i.e. evaluations kept from the model.
+"""
+
+import os
+
+from _core import lazy_import
+from _evaluation import trivial_evaluation
+from _metrics import answer_triage
+from _question_index import STOP_WORDS, WORD_PATTERN
+
+# Set ANSWER_TRIAGE=0 to send every non-empty answer to the model
+ANSWER_TRIAGE = os.getenv("ANSWER_TRIAGE", "1") == "1"
+# Rushed answers pre-scoring below this are settled
+TRIAGE_SETTLE_BELOW = float(os.getenv("TRIAGE_SETTLE_BELOW", "2"))
+TRIAGE_RUSHED_FRACTION = 0.1
+# Words a complete answer usually takes; unknown difficulties count as Medium
+TRIAGE_EXPECTED_WORDS = {"Easy": 15, "Medium": 30, "Hard": 50}
+# Settled answers never score above this
+TRIAGE_MAX_SCORE = 2
+# Words are compared on their first characters, so "index" matches "indexes"
+STEM_CHARS = 6
+
+
+def keywords(text: str) -> set:
+    """Stemmed words of ``text`` other than stop words"""
+    return {
+        word[:STEM_CHARS]
+        for word in WORD_PATTERN.findall(str(text or "").lower())
+        if word not in STOP_WORDS
+    }
+
+
+def prescore_answers(items) -> dict:
+    """Pre-score every answer in ``items`` at once
+
+    ``items`` holds (question, difficulty, category, answer, time_taken,
+    time_limit) tuples; a missing or zero time leaves pace out. Returns
+    arrays "score" (0-10), "settled", "words", "pace" and "overlap".
+    """
+    np = lazy_import("numpy")
+    items = list(items)
+    count = len(items)
+
+    # Keyword and answer word ids per row, for one vectorized intersection
+    vocabulary = {}
+    # A pool asks many candidates the same questions; tokenize each once
+    question_ids = {}
+    key_rows, key_ids, answer_rows, answer_ids = [], [], [], []
+    words, trivial, taken, limits, expected = [], [], [], [], []
+    for row, item in enumerate(items):
+        question, difficulty, category, answer, time_taken, time_limit = item
+        ids = question_ids.get((question, category))
+        if ids is None:
+            ids = question_ids[question, category] = [
+                vocabulary.setdefault(word, len(vocabulary))
+                for word in keywords(f"{question} {category}")
+            ]
+        key_rows += [row] * len(ids)
+        key_ids += ids
+        ids = [
+            vocabulary.setdefault(word, len(vocabulary)) for word in keywords(answer)
+        ]
+        answer_rows += [row] * len(ids)
+        answer_ids += ids
+        words.append(len(str(answer or "").split()))
+        trivial.append(trivial_evaluation(answer) is not None)
+        taken.append(time_taken or 0)
+        limits.append(time_limit or 0)
+        expected.append(
+            TRIAGE_EXPECTED_WORDS.get(difficulty, TRIAGE_EXPECTED_WORDS["Medium"])
+        )
+
+    width = max(len(vocabulary), 1)
+    key_rows = np.array(key_rows, dtype=np.int64)
+    key_pairs = key_rows * width + np.array(key_ids, dtype=np.int64)
+    answer_pairs = np.array(answer_rows, dtype=np.int64) * width + np.array(
+        answer_ids, dtype=np.int64
+    )
+    found = np.isin(key_pairs, answer_pairs)
+    hits = np.bincount(key_rows[found], minlength=count)
+    totals = np.bincount(key_rows, minlength=count)
+    # Questions without keywords neither help nor hurt
+    overlap = np.divide(hits, totals, out=np.full(count, 0.5), where=totals > 0)
+
+    words = np.array(words, dtype=np.float64)
+    length = np.clip(words / np.array(expected, dtype=np.float64), 0.0, 1.0)
+    taken = np.array(taken, dtype=np.float64)
+    limits = np.array(limits, dtype=np.float64)
+    timed = (taken > 0) & (limits > 0)
+    fraction = np.divide(taken, limits, out=np.ones(count), where=timed)
+    pace = np.clip(fraction / TRIAGE_RUSHED_FRACTION, 0.0, 1.0)
+
+    score = 10 * length * (0.4 + 0.6 * overlap) * (0.5 + 0.5 * pace)
+    # Pace is below 1 only for answers with a known time taken
+    settled = np.array(trivial, dtype=bool) | (
+        (pace < 1) & (score < TRIAGE_SETTLE_BELOW)
+    )
+    return {
+        "score": score,
+        "settled": settled,
+        "words": words,
+        "pace": pace,
+        "overlap": overlap,
+    }
+
+
+def local_evaluation(score: float, overlap: float) -> dict:
+    """Evaluation of a rushed answer, explaining what gave it away"""
+    feedback = "The answer was submitted too quickly to address the question."
+    if overlap == 0:
+        feedback += " It does not mention any of the question's key terms."
+    return {
+        "score": min(int(round(score)), TRIAGE_MAX_SCORE),
+        "feedback": feedback,
+        "suggestions": "Use the time available to explain the approach in full, "
+        "with an example.",
+        "strengths": [],
+        "improvements": ["Give a complete answer that addresses the question"],
+    }
+
+
+def triage_answers(items) -> list:
+    """Local evaluation of each settled answer, None for those the model scores"""
+    items = list(items)
+    if not items:
+        return []
+    if not ANSWER_TRIAGE:
+        evaluations = [trivial_evaluation(item[3]) for item in items]
+    else:
+        scores = prescore_answers(items)
+        evaluations = [
+            trivial_evaluation(item[3])
+            or local_evaluation(
+                float(scores["score"][row]), float(scores["overlap"][row])
+            )
+            if scores["settled"][row]
+            else None
+            for row, item in enumerate(items)
+        ]
+    settled = sum(evaluation is not None for evaluation in evaluations)
+    answer_triage.inc("settled", amount=settled)
+    answer_triage.inc("model", amount=len(items) - settled)
+    return evaluations
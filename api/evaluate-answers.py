@@ -1,10 +1,98 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import os
-import google.generativeai as genai
+import sys
+from urllib.parse import parse_qs, urlparse
 
-# Configure Gemini AI
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+# Shared helpers live next to the handlers in underscore modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _core import ScheduledModel, utc_timestamp
+from _evaluation import (
+    build_answer_prompt,
+    build_batch_evaluation_prompt,
+    evaluate_in_threads,
+    lookup_evaluation,
+    parse_answer_evaluation,
+    split_batch_evaluations,
+    store_evaluation,
+    summarize_evaluations,
+)
+from _llm_json import extract_json
+from _metrics import record_error, traced
+from _scheduler import CircuitOpenError
+from _triage import triage_answers
+
+
+class BadRequestError(ValueError):
+    """The request body can not be evaluated as sent"""
+
+
+def answer_key(question, answer):
+    """(question, difficulty, category, answer) identifying a cached evaluation"""
+    return (
+        question.get("question", ""),
+        question.get("difficulty", "Medium"),
+        question.get("category", "Technical"),
+        answer.get("answer", ""),
+    )
+
+
+def triage_item(question, answer):
+    """``answer_key`` plus the time taken and allowed, for local pre-scoring"""
+    return (
+        *answer_key(question, answer),
+        answer.get("timeTaken", 0),
+        question.get("timeLimit", 0),
+    )
+
+
+def evaluate_single_answer(model, question, answer):
+    """Score one answer with its own model call, unless it is cached"""
+    key = answer_key(question, answer)
+    cached = lookup_evaluation(*key)
+    if cached is not None:
+        return cached
+    prompt = build_answer_prompt(*key, answer.get("timeTaken", 0))
+    response = model.generate_content(prompt)
+    evaluation = parse_answer_evaluation(response.text)
+    store_evaluation(*key, evaluation)
+    return evaluation
+
+
+def iter_answer_evaluations(model, questions, answers):
+    """Yield (index, evaluation) as each concurrent per-answer call finishes
+
+    Answers settled by local pre-scoring never reach the model.
+    """
+    pairs = list(zip(questions, answers))
+    settled = triage_answers(triage_item(*pair) for pair in pairs)
+    return evaluate_in_threads(
+        lambda i: settled[i] or evaluate_single_answer(model, *pairs[i]), len(pairs)
+    )
+
+
+def build_evaluation(evaluations, answers):
+    """Assemble the response evaluation from per-answer results"""
+    summary = summarize_evaluations(evaluations)
+    return {
+        "overallScore": summary["mean"],
+        "recommendation": summary["recommendation"],
+        "summary": summary["summary"],
+        "individualScores": [
+            {
+                "questionIndex": index,
+                "score": evaluation["score"],
+                "feedback": evaluation["feedback"],
+                "strengths": evaluation["strengths"],
+                "improvements": evaluation["improvements"],
+            }
+            for index, evaluation in enumerate(evaluations)
+        ],
+        "totalTime": sum(answer.get("timeTaken", 0) for answer in answers),
+        "strengths": summary["strengths"],
+        "improvements": summary["improvements"],
+    }
 
 
 class handler(BaseHTTPRequestHandler):
@@ -15,6 +103,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
 
+    @traced("evaluate-answers")
     def do_POST(self):
         try:
             # Read request body
@@ -33,74 +122,34 @@ class handler(BaseHTTPRequestHandler):
             questions = body.get("questions", [])
 
             if not answers or not questions:
-                raise ValueError("Answers and questions are required")
-
-            model = genai.GenerativeModel("gemini-2.5-flash-lite-preview-09-2025")
-
-            # Create evaluation prompt
-            evaluation_prompt = f"""
-            You are an expert technical interviewer. Evaluate the following interview answers:
-            
-            Questions and Answers:
-            """
-
-            for i, (question, answer) in enumerate(zip(questions, answers), 1):
-                evaluation_prompt += f"""
-            Question {i}: {question.get('question', '')}
-            Difficulty: {question.get('difficulty', 'Medium')}
-            Category: {question.get('category', 'Technical')}
-            Candidate Answer: {answer.get('answer', '')}
-            Time Taken: {answer.get('timeTaken', 0)} seconds
-            
-            """
-
-            evaluation_prompt += """
-            Provide a comprehensive evaluation with:
-            1. Individual scores for each answer (0-10 scale)
-            2. Detailed feedback for each answer
-            3. Overall assessment
-            4. Strengths and areas for improvement
-            5. Final recommendation (Hire/Consider/Reject)
-            
-            Return ONLY a JSON object with this exact structure:
-            {
-              "overallScore": 0-10,
-              "recommendation": "Hire|Consider|Reject",
-              "summary": "brief overall assessment",
-              "individualScores": [
-                {
-                  "questionIndex": 0,
-                  "score": 0-10,
-                  "feedback": "detailed feedback",
-                  "strengths": ["strength1", "strength2"],
-                  "improvements": ["improvement1", "improvement2"]
-                }
-              ],
-              "totalTime": total_seconds,
-              "strengths": ["overall strength1", "overall strength2"],
-              "improvements": ["overall improvement1", "overall improvement2"]
-            }
-            """
+                raise BadRequestError("Answers and questions are required")
+            if len(answers) != len(questions):
+                raise BadRequestError(
+                    "Number of answers must match number of questions"
+                )
 
-            response = model.generate_content(evaluation_prompt)
-            result_text = response.text.strip()
+            # ?mode=parallel scores answers concurrently; ?mode=stream also
+            # sends each score as a server-sent event as soon as it lands
+            mode = parse_qs(urlparse(self.path).query).get("mode", ["batch"])[0]
+            model = ScheduledModel(
+                operation="batch-evaluation" if mode == "batch" else "answer-evaluation"
+            )
+            if mode == "stream":
+                self.stream_evaluation(model, questions, answers)
+                return
 
-            # Clean up the response
-            if result_text.startswith("```json"):
-                result_text = result_text[7:-3]
-            elif result_text.startswith("```"):
-                result_text = result_text[3:-3]
-
-            evaluation = json.loads(result_text)
-
-            # Calculate total time from answers
-            total_time = sum(answer.get("timeTaken", 0) for answer in answers)
-            evaluation["totalTime"] = total_time
+            if mode == "parallel":
+                evaluations = [None] * len(answers)
+                for index, result in iter_answer_evaluations(model, questions, answers):
+                    evaluations[index] = result
+                evaluation = build_evaluation(evaluations, answers)
+            else:
+                evaluation = self.evaluate_batch(model, questions, answers)
 
             response_data = {
                 "success": True,
                 "evaluation": evaluation,
-                "evaluatedAt": "2025-09-30T00:00:00Z",
+                "evaluatedAt": utc_timestamp(),
             }
 
             # Send response
@@ -113,8 +162,31 @@ class handler(BaseHTTPRequestHandler):
 
             self.wfile.write(json.dumps(response_data).encode("utf-8"))
 
+        except BadRequestError as e:
+            record_error(e)
+            self.send_response(400)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+
+            error_response = {"success": False, "error": str(e)}
+            self.wfile.write(json.dumps(error_response).encode("utf-8"))
+
+        except CircuitOpenError as e:
+            # The model keeps failing; tell the client when to come back
+            record_error(e)
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Retry-After", str(int(e.retry_after)))
+            self.end_headers()
+
+            error_response = {"success": False, "error": str(e)}
+            self.wfile.write(json.dumps(error_response).encode("utf-8"))
+
         except Exception as e:
             # Send error response
+            record_error(e)
             self.send_response(500)
             self.send_header("Content-Type", "application/json")
             self.send_header("Access-Control-Allow-Origin", "*")
@@ -125,3 +197,82 @@ class handler(BaseHTTPRequestHandler):
                 "error": f"Answer evaluation failed: {str(e)}",
             }
             self.wfile.write(json.dumps(error_response).encode("utf-8"))
+
+    def stream_evaluation(self, model, questions, answers):
+        """Send each answer's score as a server-sent event, then the summary"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        def send_event(event, data):
+            message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+            self.wfile.write(message.encode("utf-8"))
+            self.wfile.flush()
+
+        evaluations = [None] * len(answers)
+        for index, result in iter_answer_evaluations(model, questions, answers):
+            evaluations[index] = result
+            send_event("evaluation", {"index": index, **result})
+
+        send_event(
+            "summary",
+            {
+                "success": True,
+                "evaluation": build_evaluation(evaluations, answers),
+                "evaluatedAt": utc_timestamp(),
+            },
+        )
+
+    def evaluate_batch(self, model, questions, answers):
+        """Evaluate every answer not settled locally or cached with a single prompt"""
+        pairs = list(zip(questions, answers))
+        keys = [answer_key(*pair) for pair in pairs]
+        evaluations = [
+            settled or lookup_evaluation(*key)
+            for settled, key in zip(
+                triage_answers(triage_item(*pair) for pair in pairs), keys
+            )
+        ]
+        pending = [i for i, result in enumerate(evaluations) if result is None]
+        if not pending:
+            return build_evaluation(evaluations, answers)
+
+        evaluation_prompt = build_batch_evaluation_prompt(
+            [(*keys[i], answers[i].get("timeTaken", 0)) for i in pending]
+        )
+        response = model.generate_content(evaluation_prompt)
+        evaluation = extract_json(response.text, expect=dict)
+
+        fresh, failing = split_batch_evaluations(
+            evaluation.get("individualScores"), len(pending)
+        )
+        for position, index in enumerate(pending):
+            evaluations[index] = fresh[position]
+            if fresh[position] is not None:
+                store_evaluation(*keys[index], fresh[position])
+        failing = [pending[position] for position in failing]
+        if failing:
+            # Re-ask only for the answers whose evaluation was missing or
+            # invalid, then rebuild the totals from the per-answer scores
+            for position, result in evaluate_in_threads(
+                lambda k: evaluate_single_answer(
+                    model, questions[failing[k]], answers[failing[k]]
+                ),
+                len(failing),
+            ):
+                evaluations[failing[position]] = result
+        if failing or len(pending) < len(questions):
+            # Part of the session came from the cache, so the model's
+            # overall summary only covered the rest
+            return build_evaluation(evaluations, answers)
+
+        evaluation["individualScores"] = [
+            {"questionIndex": index, **result}
+            for index, result in enumerate(evaluations)
+        ]
+        # Calculate total time from answers
+        total_time = sum(answer.get("timeTaken", 0) for answer in answers)
+        evaluation["totalTime"] = total_time
+        return evaluation
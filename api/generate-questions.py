@@ -1,10 +1,41 @@
 from http.server import BaseHTTPRequestHandler
+import functools
 import json
 import os
-import google.generativeai as genai
-
-# Configure Gemini AI
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+import sys
+from urllib.parse import parse_qs, urlparse
+
+# Shared helpers live next to the handlers in underscore modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _core import generate, generate_stream, utc_timestamp
+from _metrics import record_error, traced
+from _question_bank import generate_question_set, question_bank, stream_question_set
+from _scheduler import CircuitOpenError
+from _skills import resolve_skills
+
+
+def generate_fresh_set(role, experience, skills, avoid=()):
+    """Generate a fresh set of 6 interview questions using AI"""
+    return generate_question_set(
+        functools.partial(generate, operation="questions"),
+        role,
+        experience,
+        skills,
+        avoid,
+    )
+
+
+def stream_fresh_set(role, experience, skills, avoid=()):
+    """Yield a fresh set's questions as the streamed model output completes them"""
+    return stream_question_set(
+        functools.partial(generate_stream, operation="questions"),
+        functools.partial(generate, operation="questions"),
+        role,
+        experience,
+        skills,
+        avoid,
+    )
 
 
 class handler(BaseHTTPRequestHandler):
@@ -15,6 +46,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
 
+    @traced("generate-questions")
     def do_POST(self):
         try:
             # Read request body
@@ -32,52 +64,32 @@ class handler(BaseHTTPRequestHandler):
             # Default values
             role = body.get("role", "Full Stack Developer")
             experience = body.get("experience", "Mid-level")
-            skills = body.get("skills", ["React", "Node.js", "JavaScript"])
-
-            model = genai.GenerativeModel("gemini-2.5-flash-lite-preview-09-2025")
-
-            prompt = f"""
-            Generate exactly 6 interview questions for a {role} position with {experience} experience.
-            Skills to focus on: {', '.join(skills)}
-            
-            Requirements:
-            - 2 Easy questions (20 seconds each)
-            - 2 Medium questions (60 seconds each) 
-            - 2 Hard questions (120 seconds each)
-            
-            Return ONLY a JSON array with this exact structure:
-            [
-              {{
-                "question": "question text",
-                "difficulty": "Easy|Medium|Hard",
-                "timeLimit": 20|60|120,
-                "category": "technical category"
-              }}
-            ]
-            
-            Focus on practical, real-world scenarios and technical concepts.
-            """
-
-            response = model.generate_content(prompt)
-            result_text = response.text.strip()
-
-            # Clean up the response
-            if result_text.startswith("```json"):
-                result_text = result_text[7:-3]
-            elif result_text.startswith("```"):
-                result_text = result_text[3:-3]
-
-            questions = json.loads(result_text)
-
-            # Validate the structure
-            if not isinstance(questions, list) or len(questions) != 6:
-                raise ValueError("Invalid questions format")
+            # Skills found in the resume when the client sends none
+            skills = resolve_skills(body.get("skills"), body.get("resumeText"))
+
+            # ?mode=stream sends each question as a server-sent event as soon
+            # as it is generated
+            mode = parse_qs(urlparse(self.path).query).get("mode", ["full"])[0]
+            if mode == "stream":
+                self.stream_questions(role, experience, skills, body.get("candidateId"))
+                return
+
+            # Served from the pre-generated pool; Gemini is only called on a cold
+            # pool. Refills run between invocations while the function is warm.
+            # Nothing this candidate was already asked is served again
+            questions = question_bank.get(
+                role,
+                experience,
+                skills,
+                generate_fresh_set,
+                candidate=body.get("candidateId"),
+            )
 
             response_data = {
                 "success": True,
                 "questions": questions,
                 "totalQuestions": len(questions),
-                "generatedAt": "2025-09-30T00:00:00Z",
+                "generatedAt": utc_timestamp(),
             }
 
             # Send response
@@ -90,9 +102,21 @@ class handler(BaseHTTPRequestHandler):
 
             self.wfile.write(json.dumps(response_data).encode("utf-8"))
 
+        except CircuitOpenError as e:
+            # The model keeps failing; tell the client when to come back
+            record_error(e)
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Retry-After", str(int(e.retry_after)))
+            self.end_headers()
+
+            error_response = {"success": False, "error": str(e)}
+            self.wfile.write(json.dumps(error_response).encode("utf-8"))
+
         except Exception as e:
             # Send error response
-            print(f"❌ Question generation failed: {str(e)}")
+            record_error(e)
             self.send_response(500)
             self.send_header("Content-Type", "application/json")
             self.send_header("Access-Control-Allow-Origin", "*")
@@ -104,3 +128,47 @@ class handler(BaseHTTPRequestHandler):
                 "details": "Check the server logs for more information.",
             }
             self.wfile.write(json.dumps(error_response).encode("utf-8"))
+
+    def stream_questions(self, role, experience, skills, candidate):
+        """Send each question as a server-sent event, then the whole set"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        def send_event(event, data):
+            message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+            self.wfile.write(message.encode("utf-8"))
+            self.wfile.flush()
+
+        questions = []
+        try:
+            for question in question_bank.stream(
+                role,
+                experience,
+                skills,
+                stream_fresh_set,
+                generate_fresh_set,
+                candidate=candidate,
+            ):
+                send_event("question", {"index": len(questions), **question})
+                questions.append(question)
+        except Exception as e:
+            # Headers are already sent; report the failure in the stream
+            record_error(e)
+            send_event(
+                "error",
+                {"success": False, "error": f"Question generation failed: {str(e)}"},
+            )
+            return
+
+        send_event(
+            "done",
+            {
+                "success": True,
+                "questions": questions,
+                "totalQuestions": len(questions),
+                "generatedAt": utc_timestamp(),
+            },
+        )
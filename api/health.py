@@ -1,9 +1,17 @@
 from http.server import BaseHTTPRequestHandler
 import os
 import json
+import sys
+
+# Shared helpers live next to the handlers in underscore modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _cache import get_cache
+from _metrics import traced
 
 
 class handler(BaseHTTPRequestHandler):
+    @traced("health")
     def do_GET(self):
         # Check if Gemini API key is configured
         api_key_configured = bool(os.getenv("GEMINI_API_KEY"))
@@ -14,6 +22,9 @@ class handler(BaseHTTPRequestHandler):
             "apiKeyConfigured": api_key_configured,
             "version": "1.0.0",
             "runtime": "python3.9",
+            # With CACHE_BACKEND=sqlite counters survive cold starts of this
+            # instance; /tmp is not shared with other instances
+            "cache": {"resume": get_cache("resume").stats()},
         }
 
         self.send_response(200)
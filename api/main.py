@@ -1,17 +1,84 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import time
+
+# Measured from the first import so /health can report the cold-start cost
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
-import google.generativeai as genai
+from fastapi.responses import PlainTextResponse, StreamingResponse
+import asyncio
+import functools
 import os
-import PyPDF2
-from docx import Document
 import json
 import re
-from pydantic import BaseModel
-from typing import List, Optional
-import io
+from typing import List
+import sys
+
+# Shared helpers live next to the handlers in underscore modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _batch import (
+    BATCH_POOL_RETRIES,
+    BatchTooLargeError,
+    expand_uploads,
+    run_batch,
+)
+from _cache import cache_stats, get_cache, resume_cache_key, resume_cache_ttl
+from _coalescer import CONTACT_COALESCE, Coalescer
+from _contact import (
+    CONTACT_GENERATION_CONFIG,
+    MULTI_CONTACT_GENERATION_CONFIG,
+    build_contact_prompt,
+    build_multi_contact_prompt,
+    parse_multi_contact_info,
+    resolve_contact_info_async,
+    validate_contact_info,
+)
+from _core import IMPORT_TIMINGS, MODEL_NAME, get_model, lazy_import, utc_timestamp
+from _evaluation import (
+    build_answer_prompt,
+    build_batch_evaluation_prompt,
+    lookup_evaluation,
+    parse_answer_evaluation,
+    split_batch_evaluations,
+    store_evaluation,
+    stream_evaluations,
+    summarize_evaluations,
+)
+from _llm_json import extract_json
+from _metrics import (
+    REQUEST_ID_HEADER,
+    current_trace,
+    finish_trace,
+    record_error,
+    register_caches,
+    render,
+    stage,
+    start_trace,
+)
+from _models import (
+    AnswerEvaluation,
+    AnswerEvaluationRequest,
+    EvaluationResponse,
+    Question,
+    QuestionRequest,
+    SessionAnswerRequest,
+    SessionCreateRequest,
+)
+from _llm import AsyncLLMClient, ClientDisconnectedError, LLMTimeoutError
+from _question_bank import (
+    agenerate_question_set,
+    astream_question_set,
+    question_bank,
+)
+from _scheduler import PRIORITY_BATCH, CircuitOpenError, current_priority
+from _sessions import get_session_store
+from _skills import extract_skills, resolve_skills
+from _triage import triage_answers
 
-# Configure Gemini AI
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+# Non-blocking client shared by all routes; the Gemini SDK loads on first call
+llm = AsyncLLMClient(get_model, MODEL_NAME)
 
 app = FastAPI(title="AI Interview Assistant", version="1.0.0")
 
@@ -22,102 +89,114 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[REQUEST_ID_HEADER],
 )
 
+register_caches(cache_stats)
+register_caches(lambda: {"questionBank": question_bank.stats()})
 
-# Pydantic models
-class QuestionRequest(BaseModel):
-    role: str = "Full Stack Developer"
-    experience: str = "Mid-level"
-    skills: List[str] = ["React", "Node.js", "JavaScript"]
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Tag each request with a correlation ID and trace it until its body is sent"""
+    trace, token = start_trace(
+        request.url.path, request.headers.get(REQUEST_ID_HEADER)
+    )
+    try:
+        response = await call_next(request)
+    except Exception as e:
+        record_error(e)
+        trace.status = 500
+        finish_trace(trace)
+        raise
+    finally:
+        current_trace.reset(token)
 
-class Question(BaseModel):
-    question: str
-    difficulty: str
-    timeLimit: int
-    category: str
+    # The route's path template, so session IDs do not become metric labels
+    trace.route = getattr(request.scope.get("route"), "path", "unmatched")
+    trace.status = response.status_code
+    response.headers[REQUEST_ID_HEADER] = trace.request_id
+    body = response.body_iterator
 
+    async def traced_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            finish_trace(trace)
 
-class AnswerEvaluationRequest(BaseModel):
-    questions: List[Question]
-    answers: List[str]
+    response.body_iterator = traced_body()
+    return response
 
 
-class AnswerEvaluation(BaseModel):
-    score: int
-    feedback: str
-    suggestions: Optional[str] = None
+@app.exception_handler(HTTPException)
+async def count_http_errors(request: Request, error: HTTPException):
+    """Count the failure behind an error response by its exception class"""
+    record_error(error.__cause__ or error.__context__ or error)
+    return await http_exception_handler(request, error)
 
 
-class EvaluationResponse(BaseModel):
-    evaluations: List[AnswerEvaluation]
-    overallScore: int
-    summary: str
+def get_extraction():
+    """The resume extraction module and its process pool
 
+    Imported on the first upload so health checks and the question and
+    evaluation routes never load multiprocessing or the document parsers.
+    """
+    return lazy_import("_extraction")
 
-# Utility functions
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
-    try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
 
+# Background scoring tasks for session answers, keyed by (session_id, index).
+# Process-local: with several workers on the SQLite store, completion only
+# waits for this worker's tasks; answers another worker is still scoring are
+# scored again.
+session_tasks = {}
 
-def extract_text_from_docx(file_content: bytes) -> str:
-    """Extract text from DOCX file"""
-    try:
-        docx_file = io.BytesIO(file_content)
-        doc = Document(docx_file)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading DOCX: {str(e)}")
+
+# Utility functions
+async def extract_contact_info_single(text: str, http_request: Request = None) -> dict:
+    """One structured call returning every field plus a per-field confidence"""
+    result_text = await llm.generate(
+        build_contact_prompt(text),
+        generation_config=CONTACT_GENERATION_CONFIG,
+        request=http_request,
+        operation="contact",
+        validate=lambda text: extract_json(text, expect=dict),
+    )
+    return validate_contact_info(extract_json(result_text, expect=dict))
+
+
+async def extract_contact_info_batch(texts: List[str]) -> list:
+    """One structured call for several resumes; None for unanswered ones"""
+    result_text = await llm.generate(
+        build_multi_contact_prompt(texts),
+        generation_config=MULTI_CONTACT_GENERATION_CONFIG,
+        operation="contact-batch",
+    )
+    return parse_multi_contact_info(result_text, len(texts))
+
+
+# Coalesces concurrent uploads into multi-document calls when enabled
+contact_coalescer = (
+    Coalescer(extract_contact_info_batch, extract_contact_info_single)
+    if CONTACT_COALESCE
+    else None
+)
 
 
-def extract_contact_info_with_ai(text: str) -> dict:
+async def extract_contact_info_with_ai(text: str, http_request: Request = None) -> dict:
     """Use Gemini AI to extract contact information from resume text"""
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash-exp")
-
-        prompt = f"""
-        Extract the following information from this resume text. Return ONLY a JSON object with these exact keys:
-        - name: person's full name
-        - email: email address
-        - phone: phone number
-        
-        If any field is not found, set it to null.
-        
-        Resume text:
-        {text}
-        
-        JSON:
-        """
-
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        # Clean up the response to extract JSON
-        if result_text.startswith("```json"):
-            result_text = result_text[7:-3]
-        elif result_text.startswith("```"):
-            result_text = result_text[3:-3]
-
-        # Parse JSON
-        contact_info = json.loads(result_text)
-        return contact_info
-
-    except json.JSONDecodeError:
+        if contact_coalescer is not None:
+            # The call is shared with other uploads, so one client going
+            # away does not cancel it
+            return await contact_coalescer.submit(text)
+        return await extract_contact_info_single(text, http_request)
+
+    except ValueError:
         # Fallback: try to extract using regex
         return extract_contact_info_regex(text)
+    except (LLMTimeoutError, ClientDisconnectedError, CircuitOpenError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI extraction failed: {str(e)}")
 
@@ -148,9 +227,208 @@ def extract_contact_info_regex(text: str) -> dict:
         "name": name,
         "email": email_match.group() if email_match else None,
         "phone": phone_match.group() if phone_match else None,
+        "source": "regex",
     }
 
 
+async def extract_resume(
+    filename: str, file_content: bytes, http_request=None, wait_for_pool=False
+):
+    """Return (text, contact_info, skills) for one resume, using the resume cache
+
+    Raises HTTPException for unreadable documents; pool, timeout and model
+    errors propagate for ``resume_http_error`` to map. With ``wait_for_pool``
+    a saturated extraction pool is waited out instead of raised.
+    """
+    # Identical uploads skip text extraction and the AI call entirely
+    resume_cache = get_cache("resume")
+    cache_key = resume_cache_key(file_content, MODEL_NAME)
+    cached = resume_cache.get(cache_key)
+    if cached:
+        return cached["text"], cached["contactInfo"], cached["skills"]
+
+    # Extract text based on file type, off the event loop. Contact details
+    # come from the leading pages, skills from the whole document.
+    extraction = get_extraction()
+    is_pdf = filename.lower().endswith(".pdf")
+    for attempt in range(BATCH_POOL_RETRIES + 1):
+        try:
+            with stage("text_extraction"):
+                text, full_text = await extraction.extraction_pool.run(
+                    extraction.extract_resume_text, file_content, is_pdf
+                )
+            break
+        except extraction.PoolSaturatedError as e:
+            # Batch workers wait for room; a single upload answers 429
+            if not wait_for_pool or attempt == BATCH_POOL_RETRIES:
+                raise
+            await asyncio.sleep(e.retry_after)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Error reading {'PDF' if is_pdf else 'DOCX'}: {str(e)}",
+            )
+
+    if not text.strip():
+        raise HTTPException(
+            status_code=400, detail="No text could be extracted from the file"
+        )
+
+    # Extract contact information locally, using AI only for weak fields
+    contact_info = await resolve_contact_info_async(
+        text, lambda text: extract_contact_info_with_ai(text, http_request)
+    )
+    skills = extract_skills(full_text)
+    resume_cache.set(
+        cache_key,
+        {"text": text, "contactInfo": contact_info, "skills": skills},
+        ttl=resume_cache_ttl(contact_info),
+    )
+    return text, contact_info, skills
+
+
+def unavailable_error(error: CircuitOpenError) -> HTTPException:
+    """503 telling the client when the model is worth trying again"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(int(error.retry_after))},
+    )
+
+
+def resume_http_error(error: Exception) -> HTTPException:
+    """Map a resume processing failure to the HTTP error the client sees"""
+    if isinstance(error, HTTPException):
+        return error
+    extraction = get_extraction()
+    if isinstance(error, extraction.PoolSaturatedError):
+        return HTTPException(
+            status_code=429,
+            detail="Too many resumes are being processed, please retry shortly",
+            headers={"Retry-After": str(error.retry_after)},
+        )
+    if isinstance(error, extraction.ExtractionTimeoutError):
+        return HTTPException(status_code=422, detail=str(error))
+    if isinstance(error, LLMTimeoutError):
+        return HTTPException(status_code=504, detail="AI request timed out")
+    if isinstance(error, CircuitOpenError):
+        return unavailable_error(error)
+    if isinstance(error, ClientDisconnectedError):
+        return HTTPException(status_code=499, detail="Client disconnected")
+    return HTTPException(
+        status_code=500, detail=f"Resume processing failed: {str(error)}"
+    )
+
+
+async def generate_question_set(
+    role: str, experience: str, skills: List[str], avoid=()
+) -> list:
+    """Generate a fresh set of 6 interview questions using AI"""
+    return await agenerate_question_set(
+        functools.partial(llm.generate, operation="questions"),
+        role,
+        experience,
+        skills,
+        avoid,
+    )
+
+
+def stream_question_set(role: str, experience: str, skills: List[str], avoid=()):
+    """Yield a fresh set's questions as the streamed model output completes them"""
+    return astream_question_set(
+        functools.partial(llm.stream, operation="questions"),
+        functools.partial(llm.generate, operation="questions"),
+        role,
+        experience,
+        skills,
+        avoid,
+    )
+
+
+def triage_item(question: Question, answer: str) -> tuple:
+    """Local pre-scoring input; the app's clients send no time taken"""
+    return (
+        question.question,
+        question.difficulty,
+        question.category,
+        answer,
+        None,
+        question.timeLimit,
+    )
+
+
+async def evaluate_single_answer(question: Question, answer: str) -> dict:
+    """Score one answer with its own model call, unless it is cached"""
+    key = (question.question, question.difficulty, question.category, answer)
+    cached = lookup_evaluation(*key)
+    if cached is not None:
+        return cached
+    evaluation = parse_answer_evaluation(
+        await llm.generate(
+            build_answer_prompt(*key),
+            operation="answer-evaluation",
+            validate=parse_answer_evaluation,
+        )
+    )
+    store_evaluation(*key, evaluation)
+    return evaluation
+
+
+def server_sent_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def evaluate_answers_per_question(request: AnswerEvaluationRequest):
+    """Yield ("evaluation", {...}) per answer as it lands, then ("summary", {...})"""
+    settled = triage_answers(
+        triage_item(question, answer)
+        for question, answer in zip(request.questions, request.answers)
+    )
+
+    async def evaluate(index):
+        # Answers settled by local pre-scoring never reach the model
+        if settled[index] is not None:
+            return settled[index]
+        return await evaluate_single_answer(
+            request.questions[index], request.answers[index]
+        )
+
+    evaluations = [None] * len(request.questions)
+    async for index, evaluation in stream_evaluations(
+        evaluate, len(request.questions)
+    ):
+        evaluations[index] = evaluation
+        yield "evaluation", {"index": index, **evaluation}
+
+    summary = summarize_evaluations(evaluations)
+    yield "summary", {
+        "evaluations": evaluations,
+        "overallScore": summary["overallScore"],
+        "summary": summary["summary"],
+    }
+
+
+async def score_session_answer(session_id: str, index: int, answer: str):
+    """Score one submitted answer in the background and store the result"""
+    # Traced on its own: the request that submitted the answer has returned
+    current_trace.set(None)
+    store = get_session_store()
+    session = store.get(session_id)
+    if session is None:
+        # Expired while the task was queued
+        return
+    question = Question(**session["questions"][index])
+    try:
+        evaluation = triage_answers([triage_item(question, answer)])[0]
+        evaluation = evaluation or await evaluate_single_answer(question, answer)
+    except Exception as e:
+        # Left unscored; completing the session evaluates it again
+        record_error(e, "session-evaluation")
+        return
+    # Kept whole: the session summary needs the strengths and improvements
+    store.set_evaluation(session_id, index, answer, evaluation)
+
+
 # API Routes
 @app.get("/")
 async def health_check():
@@ -159,11 +437,27 @@ async def health_check():
         "status": "healthy",
         "message": "AI Interview Assistant API is running",
         "version": "1.0.0",
+        "cache": cache_stats(),
+        "questionBank": question_bank.stats(),
+        "llm": llm.stats(),
+        "extraction": (
+            sys.modules["_extraction"].extraction_pool.stats()
+            if "_extraction" in sys.modules
+            else None
+        ),
+        "coalescer": contact_coalescer.stats() if contact_coalescer else None,
+        "startup": {**startup_timing, "lazyImportsMs": dict(IMPORT_TIMINGS)},
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Stage latencies, token counts, errors and cache hit ratios for Prometheus"""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/parse-resume")
-async def parse_resume(resume: UploadFile = File(...)):
+async def parse_resume(http_request: Request, resume: UploadFile = File(...)):
     """Parse uploaded resume and extract contact information"""
 
     # Validate file type
@@ -173,97 +467,146 @@ async def parse_resume(resume: UploadFile = File(...)):
         )
 
     # Check file size (5MB limit)
-    file_content = await resume.read()
+    with stage("upload_read"):
+        file_content = await resume.read()
     if len(file_content) > 5 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="File size must be less than 5MB")
 
     try:
-        # Extract text based on file type
-        if resume.filename.lower().endswith(".pdf"):
-            text = extract_text_from_pdf(file_content)
-        else:
-            text = extract_text_from_docx(file_content)
-
-        if not text.strip():
-            raise HTTPException(
-                status_code=400, detail="No text could be extracted from the file"
-            )
-
-        # Extract contact information using AI
-        contact_info = extract_contact_info_with_ai(text)
-
+        text, contact_info, skills = await extract_resume(
+            resume.filename, file_content, http_request
+        )
         return {
             "success": True,
             "filename": resume.filename,
             "name": contact_info.get("name"),
             "email": contact_info.get("email"),
             "phone": contact_info.get("phone"),
+            "confidence": contact_info.get("confidence"),
+            "skills": skills,
             "extractedText": (
                 text[:500] + "..." if len(text) > 500 else text
             ),  # First 500 chars for debugging
         }
-
-    except HTTPException:
-        raise
     except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Resume processing failed: {str(e)}"
-        )
+        raise resume_http_error(e)
 
 
-@app.post("/generate-questions")
-async def generate_questions(request: QuestionRequest):
-    """Generate interview questions using AI"""
+@app.post("/parse-resumes")
+async def parse_resumes(http_request: Request, resumes: List[UploadFile] = File(...)):
+    """Parse many resumes, or zip archives of them, streaming NDJSON results
 
+    Each line is one file's result as soon as it is ready, in completion
+    order and tagged with the file's position in the batch. The last line
+    summarizes the batch.
+    """
+    with stage("upload_read"):
+        uploads = [(upload.filename, await upload.read()) for upload in resumes]
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash-exp")
-
-        prompt = f"""
-        Generate exactly 6 interview questions for a {request.role} position with {request.experience} experience.
-        Skills to focus on: {', '.join(request.skills)}
-        
-        Requirements:
-        - 2 Easy questions (20 seconds each)
-        - 2 Medium questions (60 seconds each) 
-        - 2 Hard questions (120 seconds each)
-        
-        Return ONLY a JSON array with this exact structure:
-        [
-          {{
-            "question": "question text",
-            "difficulty": "Easy|Medium|Hard",
-            "timeLimit": 20|60|120,
-            "category": "technical category"
-          }}
-        ]
-        
-        Focus on practical, real-world scenarios and technical concepts.
-        """
+        documents = expand_uploads(uploads)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    async def process(filename, file_content):
+        # Interactive uploads get the model quota before batch files
+        current_priority.set(PRIORITY_BATCH)
+        try:
+            _, contact_info, skills = await extract_resume(
+                filename, file_content, wait_for_pool=True
+            )
+        except Exception as e:
+            raise ValueError(resume_http_error(e).detail)
+        return {
+            "name": contact_info.get("name"),
+            "email": contact_info.get("email"),
+            "phone": contact_info.get("phone"),
+            "confidence": contact_info.get("confidence"),
+            "skills": skills,
+        }
 
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+    async def lines():
+        start = time.perf_counter()
+        counts = {"files": 0, "failed": 0, "duplicates": 0}
+        async for result in run_batch(documents, process):
+            counts["files"] += 1
+            counts["failed"] += not result["success"]
+            counts["duplicates"] += "duplicateOf" in result
+            yield json.dumps(result) + "\n"
+        seconds = time.perf_counter() - start
+        yield json.dumps({"done": True, **counts, "seconds": round(seconds, 3)}) + "\n"
 
-        # Clean up the response
-        if result_text.startswith("```json"):
-            result_text = result_text[7:-3]
-        elif result_text.startswith("```"):
-            result_text = result_text[3:-3]
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/generate-questions")
+async def generate_questions(request: QuestionRequest, mode: str = "full"):
+    """Generate interview questions using AI
+
+    ``mode=stream`` sends each question as a server-sent event as soon as it
+    is generated, then a ``done`` event with the whole set.
+    """
+
+    skills = resolve_skills(request.skills, request.resumeText)
+    if mode == "stream":
+
+        async def events():
+            questions = []
+            try:
+                async for question in question_bank.astream(
+                    request.role,
+                    request.experience,
+                    skills,
+                    stream_question_set,
+                    generate_question_set,
+                    candidate=request.candidateId,
+                ):
+                    yield server_sent_event(
+                        "question", {"index": len(questions), **question}
+                    )
+                    questions.append(question)
+            except Exception as e:
+                record_error(e)
+                yield server_sent_event(
+                    "error",
+                    {"success": False, "error": f"Question generation failed: {e}"},
+                )
+                return
+            yield server_sent_event(
+                "done",
+                {
+                    "success": True,
+                    "questions": questions,
+                    "totalQuestions": len(questions),
+                    "generatedAt": utc_timestamp(),
+                },
+            )
 
-        questions = json.loads(result_text)
+        return StreamingResponse(events(), media_type="text/event-stream")
 
-        # Validate the structure
-        if not isinstance(questions, list) or len(questions) != 6:
-            raise ValueError("Invalid questions format")
+    try:
+        # Served from the pre-generated pool; Gemini is only called on a cold pool.
+        # Not tied to the client connection since the set also warms the pool.
+        questions = await question_bank.aget(
+            request.role,
+            request.experience,
+            skills,
+            generate_question_set,
+            candidate=request.candidateId,
+        )
 
         return {
             "success": True,
             "questions": questions,
             "totalQuestions": len(questions),
-            "generatedAt": "2025-09-30T00:00:00Z",
+            "generatedAt": utc_timestamp(),
         }
 
     except json.JSONDecodeError as e:
         raise HTTPException(status_code=500, detail="Failed to parse AI response")
+    except LLMTimeoutError:
+        raise HTTPException(status_code=504, detail="AI request timed out")
+    except CircuitOpenError as e:
+        raise unavailable_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Question generation failed: {str(e)}"
@@ -271,85 +614,248 @@ async def generate_questions(request: QuestionRequest):
 
 
 @app.post("/evaluate-answers")
-async def evaluate_answers(request: AnswerEvaluationRequest):
-    """Evaluate candidate answers using AI"""
+async def evaluate_answers(
+    request: AnswerEvaluationRequest, http_request: Request, mode: str = "batch"
+):
+    """Evaluate candidate answers using AI
+
+    ``mode=batch`` sends every answer in one prompt. ``mode=parallel`` scores
+    each answer with its own concurrent model call, and ``mode=stream`` does
+    the same while streaming each score as a server-sent event.
+    """
 
     if len(request.answers) != len(request.questions):
         raise HTTPException(
             status_code=400, detail="Number of answers must match number of questions"
         )
 
+    if mode == "stream":
+
+        async def events():
+            async for event, data in evaluate_answers_per_question(request):
+                yield server_sent_event(event, data)
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    if mode == "parallel":
+        async for event, data in evaluate_answers_per_question(request):
+            if event == "summary":
+                return {
+                    "success": True,
+                    **data,
+                    "evaluatedAt": utc_timestamp(),
+                }
+
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash-exp")
-
-        # Prepare questions and answers for evaluation
-        qa_pairs = []
-        for i, (question, answer) in enumerate(zip(request.questions, request.answers)):
-            qa_pairs.append(
-                f"""
-Question {i+1} ({question.difficulty}): {question.question}
-Answer: {answer}
-"""
+        keys = [
+            (question.question, question.difficulty, question.category, answer)
+            for question, answer in zip(request.questions, request.answers)
+        ]
+        # Only answers not settled by pre-scoring or cached go to the model
+        settled = triage_answers(
+            triage_item(question, answer)
+            for question, answer in zip(request.questions, request.answers)
+        )
+        evaluations = [
+            evaluation or lookup_evaluation(*key)
+            for evaluation, key in zip(settled, keys)
+        ]
+        pending = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        evaluation_result = {}
+        failing = []
+        fresh_indexes = []
+        if pending:
+            prompt = build_batch_evaluation_prompt(
+                [(*keys[i], None) for i in pending]
             )
+            result_text = await llm.generate(
+                prompt,
+                request=http_request,
+                operation="batch-evaluation",
+                validate=lambda text: extract_json(text, expect=dict),
+            )
+            evaluation_result = extract_json(result_text, expect=dict)
 
-        prompt = f"""
-        Evaluate these interview answers for a Full Stack Developer position.
-        
-        {chr(10).join(qa_pairs)}
-        
-        For each answer, provide a score from 0-10 and detailed feedback.
-        Also calculate an overall score (0-100) and provide a summary.
-        
-        Return ONLY a JSON object with this exact structure:
-        {{
-          "evaluations": [
-            {{
-              "score": 8,
-              "feedback": "detailed feedback on the answer",
-              "suggestions": "suggestions for improvement"
-            }}
-          ],
-          "overallScore": 75,
-          "summary": "overall performance summary"
-        }}
-        
-        Consider:
-        - Technical accuracy
-        - Depth of knowledge
-        - Practical application
-        - Communication clarity
-        - Problem-solving approach
-        """
-
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        # Clean up the response
-        if result_text.startswith("```json"):
-            result_text = result_text[7:-3]
-        elif result_text.startswith("```"):
-            result_text = result_text[3:-3]
-
-        evaluation_result = json.loads(result_text)
-
+            fresh, failing = split_batch_evaluations(
+                evaluation_result.get("individualScores"), len(pending)
+            )
+            for position, index in enumerate(pending):
+                evaluations[index] = fresh[position]
+                if fresh[position] is not None:
+                    fresh_indexes.append(index)
+            failing = [pending[position] for position in failing]
+
+        # Re-ask only for the answers whose evaluation was missing or invalid
+        async for position, evaluation in stream_evaluations(
+            lambda k: evaluate_single_answer(
+                request.questions[failing[k]], request.answers[failing[k]]
+            ),
+            len(failing),
+        ):
+            evaluations[failing[position]] = evaluation
+
+        # The 0-100 overall score is derived from the per-answer scores, as in
+        # the parallel modes; the model's own summary is kept when it covered
+        # every answer
+        local = summarize_evaluations(evaluations)
+        overall_score = local["overallScore"]
+        summary = evaluation_result.get("summary")
+        covered = not failing and len(pending) == len(keys)
+        if not covered or not summary or not isinstance(summary, str):
+            summary = local["summary"]
+
+        response = EvaluationResponse.model_validate(
+            {
+                "evaluations": evaluations,
+                "overallScore": overall_score,
+                "summary": summary,
+            }
+        )
+        # Cached only once the response validated, so a bad reply is not replayed
+        for index in fresh_indexes:
+            store_evaluation(*keys[index], evaluations[index])
         return {
             "success": True,
-            "evaluations": evaluation_result["evaluations"],
-            "overallScore": evaluation_result["overallScore"],
-            "summary": evaluation_result["summary"],
-            "evaluatedAt": "2025-09-30T00:00:00Z",
+            **response.model_dump(),
+            "evaluatedAt": utc_timestamp(),
         }
 
-    except json.JSONDecodeError:
+    except ValueError:
         raise HTTPException(status_code=500, detail="Failed to parse AI response")
+    except LLMTimeoutError:
+        raise HTTPException(status_code=504, detail="AI request timed out")
+    except ClientDisconnectedError:
+        raise HTTPException(status_code=499, detail="Client disconnected")
+    except CircuitOpenError as e:
+        raise unavailable_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Answer evaluation failed: {str(e)}"
         )
 
 
+@app.on_event("shutdown")
+async def shutdown_extraction_pool():
+    if "_extraction" in sys.modules:
+        sys.modules["_extraction"].extraction_pool.shutdown()
+
+
+@app.post("/sessions")
+async def create_session(request: SessionCreateRequest):
+    """Start an interview session so answers can be scored as they arrive"""
+    questions = [question.model_dump() for question in request.questions]
+    session_id = get_session_store().create(questions)
+    return {"success": True, "sessionId": session_id, "totalQuestions": len(questions)}
+
+
+@app.post("/sessions/{session_id}/answers", status_code=202)
+async def submit_session_answer(session_id: str, request: SessionAnswerRequest):
+    """Accept one answer and score it while the next question is in progress"""
+    store = get_session_store()
+    session = store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not 0 <= request.index < len(session["questions"]):
+        raise HTTPException(status_code=400, detail="Invalid question index")
+
+    store.set_answer(session_id, request.index, request.answer)
+
+    key = (session_id, request.index)
+    previous = session_tasks.get(key)
+    if previous is not None:
+        previous.cancel()
+    task = asyncio.ensure_future(
+        score_session_answer(session_id, request.index, request.answer)
+    )
+    session_tasks[key] = task
+
+    def forget(done):
+        if session_tasks.get(key) is done:
+            del session_tasks[key]
+
+    task.add_done_callback(forget)
+    return {"success": True, "accepted": True, "index": request.index}
+
+
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    """Report which answers have been submitted and scored so far"""
+    session = get_session_store().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {
+        "success": True,
+        "totalQuestions": len(session["questions"]),
+        "answered": sorted(session["answers"]),
+        "evaluated": sorted(session["evaluations"]),
+    }
+
+
+@app.post("/sessions/{session_id}/complete")
+async def complete_session(session_id: str):
+    """Finish the interview, scoring only answers not already evaluated"""
+    store = get_session_store()
+    session = store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    # Let scoring that is already under way finish rather than starting over
+    pending = [task for key, task in session_tasks.items() if key[0] == session_id]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        session = store.get(session_id)
+
+    questions = [Question(**question) for question in session["questions"]]
+    evaluations = [session["evaluations"].get(i) for i in range(len(questions))]
+    precomputed = sum(evaluation is not None for evaluation in evaluations)
+
+    # Unanswered questions are scored as empty answers
+    missing = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+    answers = [session["answers"].get(index, "") for index in missing]
+    settled = triage_answers(
+        triage_item(questions[index], answer)
+        for index, answer in zip(missing, answers)
+    )
+
+    async def evaluate(position):
+        if settled[position] is not None:
+            return settled[position]
+        return await evaluate_single_answer(
+            questions[missing[position]], answers[position]
+        )
+
+    async for position, evaluation in stream_evaluations(evaluate, len(missing)):
+        index = missing[position]
+        evaluations[index] = evaluation
+        if "error" not in evaluation:
+            store.set_evaluation(session_id, index, answers[position], evaluation)
+
+    summary = summarize_evaluations(evaluations)
+    result = EvaluationResponse(
+        evaluations=[AnswerEvaluation(**evaluation) for evaluation in evaluations],
+        overallScore=summary["overallScore"],
+        summary=summary["summary"],
+    )
+    return {
+        "success": True,
+        **result.model_dump(),
+        "precomputed": precomputed,
+        "evaluatedAt": utc_timestamp(),
+    }
+
+
+@app.on_event("startup")
+async def record_startup_time():
+    startup_timing["readyMs"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
+
+
+# Everything above runs at import time
+startup_timing = {"importMs": round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)}
+
+
 # For Vercel deployment
 if __name__ == "__main__":
     import uvicorn
 
     uvicorn.run(app, host="0.0.0.0", port=8000)
+
@@ -0,0 +1,109 @@
+"""Local stand-ins for Gemini used by the benchmarks"""
+
+import json
+import os
+import sys
+import time
+
+# Make the api/ helper modules importable from the benchmark scripts
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+sys.path.insert(0, os.path.abspath(API_DIR))
+# Per-request trace lines would bury the benchmarks' own output
+os.environ.setdefault("TRACE_LOG", "0")
+
+
+def unthrottled_scheduler():
+    """LLM scheduler with no effective quota, so runs do not share limits"""
+    from _scheduler import LLMScheduler
+
+    return LLMScheduler(rpm=1e9, tpm=1e12)
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+def split_chunks(text, chunk_chars):
+    return [text[i : i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+
+
+class StubModel:
+    """Mimics GenerativeModel.generate_content with a simulated latency
+
+    ``latency`` is either seconds or a callable taking the prompt. Output is
+    produced in ``chunk_chars`` pieces taking ``chunk_latency`` each: with
+    ``stream=True`` they are yielded as they are ready, otherwise the whole
+    text is returned once the last one is.
+    """
+
+    def __init__(
+        self,
+        respond,
+        latency=0.4,
+        per_token_latency=0.0,
+        chunk_chars=32,
+        chunk_latency=0.0,
+    ):
+        self.respond = respond
+        self.latency = latency
+        self.per_token_latency = per_token_latency
+        self.chunk_chars = chunk_chars
+        self.chunk_latency = chunk_latency
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        # Rough token estimate: ~4 characters per token
+        tokens = len(prompt) // 4
+        self.calls += 1
+        self.prompt_tokens += tokens
+        latency = self.latency(prompt) if callable(self.latency) else self.latency
+        time.sleep(latency + tokens * self.per_token_latency)
+        chunks = split_chunks(self.respond(prompt, generation_config), self.chunk_chars)
+        if stream:
+            return self._stream(chunks)
+        time.sleep(len(chunks) * self.chunk_latency)
+        return StubResponse("".join(chunks))
+
+    def _stream(self, chunks):
+        for chunk in chunks:
+            time.sleep(self.chunk_latency)
+            yield StubResponse(chunk)
+
+
+class HTTPStubModel:
+    """Blocking client for FakeGeminiServer, shaped like GenerativeModel"""
+
+    def __init__(self, base_url, model_name="fake-gemini", timeout=60):
+        self.url = f"{base_url}/v1beta/models/{model_name}"
+        self.timeout = timeout
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        import urllib.request
+
+        body = {"contents": [{"parts": [{"text": prompt}]}]}
+        if generation_config:
+            body["generationConfig"] = generation_config
+        method = ":streamGenerateContent?alt=sse" if stream else ":generateContent"
+        request = urllib.request.Request(
+            self.url + method,
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        response = urllib.request.urlopen(request, timeout=self.timeout)
+        if stream:
+            return self._events(response)
+        with response:
+            return StubResponse(_text(json.loads(response.read())))
+
+    def _events(self, response):
+        """One response per ``data:`` line of the server-sent event stream"""
+        with response:
+            for line in response:
+                if line.startswith(b"data: "):
+                    yield StubResponse(_text(json.loads(line[len(b"data: ") :])))
+
+
+def _text(payload):
+    return payload["candidates"][0]["content"]["parts"][0]["text"]
@@ -0,0 +1,166 @@
+"""Local answer pre-scoring: LLM calls avoided and cost of rescoring a pool
+
+Sessions: ``SESSIONS`` six-answer sessions are evaluated by the Vercel
+``evaluate-answers`` handler in parallel mode over a stub model, with
+pre-scoring on and off. Answers follow a rough mix seen in practice: most
+are genuine attempts, the rest are blank or "I don't know", a considered
+one-word answer, or a short line submitted seconds into the question.
+Reports the share of model calls avoided and how many genuine or one-word
+attempts were settled locally, which should be none: a one-word answer can
+be exactly right. With pre-scoring off, blank and "I don't know" answers
+are still scored without the model.
+
+Pool: ``prescore_answers`` over candidate pools of up to 100k answers in
+one pass, against calling it once per answer.
+
+Run with: python benchmarks/bench_answer_triage.py
+"""
+
+import importlib.util
+import json
+import os
+import random
+import time
+
+from _stubs import API_DIR, StubModel
+
+import _triage
+from _triage import prescore_answers
+
+SESSIONS = 100
+ANSWERS = 6
+POOL_SIZES = (1000, 10000, 100000)
+TIME_LIMITS = {"Easy": 20, "Medium": 60, "Hard": 120}
+TOPICS = [
+    ("React", "How do you prevent unnecessary re-renders in React components?"),
+    ("Databases", "When would you add a partial index in PostgreSQL?"),
+    ("Node.js", "How does the Node.js event loop handle asynchronous I/O?"),
+    ("System Design", "How would you design a rate limiter for a public API?"),
+    ("JavaScript", "What is the difference between let and const?"),
+    ("Testing", "How would you test a service that depends on a payment API?"),
+]
+FILLER = (
+    "because then we avoid extra work and the behaviour stays predictable when "
+    "load grows so I would measure first and then change the design"
+).split()
+
+
+def make_answer(rng, question, difficulty, kind):
+    """(answer, seconds taken) of the given kind for ``question``"""
+    limit = TIME_LIMITS[difficulty]
+    if kind == "empty":
+        return rng.choice(["", "I don't know", "idk", "no idea"]), rng.randint(1, 9)
+    if kind == "terse":
+        words = ["memo", "useMemo", "indexes", "redis", "mocks"]
+        return rng.choice(words), rng.uniform(limit * 0.2, limit * 0.5)
+    if kind == "rushed":
+        words = rng.sample(question.lower().rstrip("?").split(), 3)
+        return " ".join(words), rng.uniform(0.5, limit * 0.05)
+    topic = [word for word in question.lower().rstrip("?").split() if len(word) > 3]
+    words = rng.sample(topic, min(3, len(topic)))
+    words += rng.choices(FILLER, k=rng.randint(12, 60))
+    rng.shuffle(words)
+    return " ".join(words), rng.uniform(limit * 0.3, limit)
+
+
+def make_sessions(rng):
+    sessions = []
+    for _ in range(SESSIONS):
+        questions, answers, kinds = [], [], []
+        for difficulty in ("Easy", "Easy", "Medium", "Medium", "Hard", "Hard"):
+            category, text = rng.choice(TOPICS)
+            kind = rng.choices(
+                ["genuine", "empty", "terse", "rushed"], weights=[70, 12, 8, 10]
+            )[0]
+            answer, taken = make_answer(rng, text, difficulty, kind)
+            questions.append(
+                {
+                    "question": text,
+                    "difficulty": difficulty,
+                    "category": category,
+                    "timeLimit": TIME_LIMITS[difficulty],
+                }
+            )
+            answers.append({"answer": answer, "timeTaken": round(taken)})
+            kinds.append(kind)
+        sessions.append((questions, answers, kinds))
+    return sessions
+
+
+def respond(prompt, generation_config):
+    return json.dumps({"score": 6, "feedback": "Reasonable.", "suggestions": None})
+
+
+def load_handler_module():
+    path = os.path.join(API_DIR, "evaluate-answers.py")
+    spec = importlib.util.spec_from_file_location("evaluate_answers", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Every run scores afresh, so cached evaluations do not hide the triage
+    module.lookup_evaluation = lambda *key: None
+    module.store_evaluation = lambda *key: None
+    return module
+
+
+def session_benchmark():
+    module = load_handler_module()
+    sessions = make_sessions(random.Random(11))
+    print(f"{SESSIONS} sessions x {ANSWERS} answers, parallel mode")
+    print(f"{'pre-scoring':<12} {'calls':>6} {'avoided':>8} {'attempts settled':>17}")
+    for enabled in (False, True):
+        _triage.ANSWER_TRIAGE = enabled
+        model = StubModel(respond, latency=0)
+        attempts_settled = 0
+        for questions, answers, kinds in sessions:
+            for index, result in module.iter_answer_evaluations(
+                model, questions, answers
+            ):
+                attempt = kinds[index] in ("genuine", "terse")
+                if attempt and result["feedback"] != "Reasonable.":
+                    attempts_settled += 1
+        avoided = 1 - model.calls / (SESSIONS * ANSWERS)
+        label = "on" if enabled else "off"
+        print(f"{label:<12} {model.calls:>6} {avoided:>8.1%} {attempts_settled:>17}")
+    _triage.ANSWER_TRIAGE = True
+
+
+def pool_benchmark():
+    rng = random.Random(12)
+    items = []
+    for questions, answers, _ in make_sessions(rng) * -(-max(POOL_SIZES) // 600):
+        for question, answer in zip(questions, answers):
+            items.append(
+                (
+                    question["question"],
+                    question["difficulty"],
+                    question["category"],
+                    answer["answer"],
+                    answer["timeTaken"],
+                    question["timeLimit"],
+                )
+            )
+    prescore_answers(items[:10])  # imports NumPy
+
+    print(f"\n{'pool':>7} {'one pass ms':>12} {'µs/answer':>10} {'settled':>8}")
+    for size in POOL_SIZES:
+        start = time.perf_counter()
+        scores = prescore_answers(items[:size])
+        seconds = time.perf_counter() - start
+        print(
+            f"{size:>7} {seconds * 1000:>12.1f} {seconds / size * 1e6:>10.2f}"
+            f" {scores['settled'].mean():>8.1%}"
+        )
+
+    count = 2000
+    start = time.perf_counter()
+    for item in items[:count]:
+        prescore_answers([item])
+    print(
+        f"one answer per call: {(time.perf_counter() - start) / count * 1e6:.1f}"
+        " µs/answer"
+    )
+
+
+if __name__ == "__main__":
+    session_benchmark()
+    pool_benchmark()
@@ -0,0 +1,71 @@
+"""Load test: blocking generate_content versus AsyncLLMClient
+
+Simulates N concurrent route handlers on one event loop, each making one LLM
+call to a local fake Gemini server, while a health-check probe measures how
+long the loop takes to answer a trivial request.
+
+Run with: python benchmarks/bench_async_llm.py
+"""
+
+import asyncio
+import time
+
+from _stubs import HTTPStubModel, unthrottled_scheduler
+from fake_gemini import FakeGeminiServer
+
+from _llm import AsyncLLMClient
+
+LATENCY = 0.2
+CONCURRENCY_LEVELS = (1, 4, 8, 16)
+
+
+async def health_probe(samples, stop):
+    """Worst-case scheduling delay seen by a trivial coroutine"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        samples.append(time.perf_counter() - start - 0.01)
+
+
+async def run(label, call, concurrency):
+    probe_samples = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(health_probe(probe_samples, stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(f"prompt {n}") for n in range(concurrency * 4)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    print(
+        f"{label:<8} concurrency {concurrency:>3}: "
+        f"{concurrency * 4 / elapsed:6.1f} req/s, "
+        f"worst health-check stall {max(probe_samples, default=0) * 1000:7.1f} ms"
+    )
+
+
+async def main(base_url):
+    model = HTTPStubModel(base_url)
+
+    async def blocking(prompt):
+        # What the routes did before: a synchronous call inside ``async def``
+        return model.generate_content(prompt).text
+
+    for concurrency in CONCURRENCY_LEVELS:
+        await run("blocking", blocking, concurrency)
+
+    for concurrency in CONCURRENCY_LEVELS:
+        client = AsyncLLMClient(
+            lambda name: HTTPStubModel(base_url, name),
+            "fake-gemini",
+            max_concurrency=concurrency,
+            scheduler=unthrottled_scheduler(),
+        )
+        await run("async", client.generate, concurrency)
+
+
+if __name__ == "__main__":
+    with FakeGeminiServer(lambda prompt, config: "{}", latency=LATENCY) as server:
+        asyncio.run(main(server.url))
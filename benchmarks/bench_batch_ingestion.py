@@ -0,0 +1,100 @@
+"""Throughput of batch resume ingestion against a local stub LLM
+
+Pushes a job-fair sized batch (a fifth of it re-uploaded duplicates) through
+``run_batch``: text extraction in the process pool, then contact resolution
+through AsyncLLMClient backed by a stub model. Reports files per second for
+one-at-a-time processing versus increasing worker counts, and how many
+documents deduplication kept away from the pool and the model.
+
+Run with: python benchmarks/bench_batch_ingestion.py
+"""
+
+import asyncio
+import random
+import time
+import zlib
+
+from _stubs import StubModel, unthrottled_scheduler
+
+from _batch import run_batch
+from _contact import resolve_contact_info_async, validate_contact_info
+from _extraction import ExtractionPool
+from _llm import AsyncLLMClient
+from _llm_json import extract_json
+
+FILES = 80
+DUPLICATE_SHARE = 0.2
+LLM_LATENCY = 0.25
+WORKER_COUNTS = (1, 4, 8, 16)
+
+
+def synthetic_extract(file_content: bytes) -> str:
+    """Decompression standing in for PyPDF2 parsing of the header pages"""
+    return zlib.decompress(file_content).decode()
+
+
+def make_batch() -> list:
+    rng = random.Random(3)
+    unique = []
+    for n in range(int(FILES * (1 - DUPLICATE_SHARE))):
+        # No name line and an unlabelled phone, so the model is consulted
+        text = (
+            f"Software Engineer #{n}\n"
+            f"Contact: candidate{n}@example.com / 555{n:07d}\n"
+            + "Built services in Python and React. " * 200
+        )
+        unique.append((f"resume-{n}.pdf", zlib.compress(text.encode())))
+    documents = unique + rng.sample(unique, FILES - len(unique))
+    rng.shuffle(documents)
+    return [(filename, content, None) for filename, content in documents]
+
+
+async def run(workers, documents, pool):
+    model = StubModel(
+        lambda prompt, config: '{"name": "Sam Lee", "email": null, "phone": null,'
+        ' "confidence": {"name": 0.9, "email": 0, "phone": 0}}',
+        latency=LLM_LATENCY,
+    )
+    llm = AsyncLLMClient(
+        lambda name: model,
+        "stub",
+        max_concurrency=16,
+        scheduler=unthrottled_scheduler(),
+    )
+
+    async def process(filename, content):
+        text = await pool.run(synthetic_extract, content)
+        info = await resolve_contact_info_async(text, lambda text: _ask(llm, text))
+        return {"name": info["name"], "email": info["email"]}
+
+    start = time.perf_counter()
+    results = [result async for result in run_batch(documents, process, workers)]
+    elapsed = time.perf_counter() - start
+
+    failed = sum(not result["success"] for result in results)
+    duplicates = sum("duplicateOf" in result for result in results)
+    print(
+        f"workers={workers:<3} {len(results) / elapsed:7.1f} files/s"
+        f"  {elapsed:6.2f}s  model calls {model.calls:3d}"
+        f"  duplicates skipped {duplicates}  failed {failed}"
+    )
+
+
+async def _ask(llm, text):
+    return validate_contact_info(extract_json(await llm.generate(text), expect=dict))
+
+
+async def main():
+    documents = make_batch()
+    pool = ExtractionPool(queue_depth=FILES, timeout=5)
+    # Warm the workers so process start-up is not part of the measurement
+    await asyncio.gather(*(pool.run(len, b"") for _ in range(pool.workers)))
+
+    print(f"{FILES} files, {int(FILES * DUPLICATE_SHARE)} duplicates")
+    for workers in WORKER_COUNTS:
+        await run(workers, documents, pool)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
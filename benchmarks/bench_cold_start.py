@@ -0,0 +1,201 @@
+"""Cold-start cost of each Vercel handler
+
+Every sample runs in a fresh interpreter, like a new function instance. It
+reports how long the handler module takes to import, how long the first
+request takes to answer against a stub model, and which heavy libraries were
+loaded along the way. When the Gemini SDK is installed, its import time is
+measured separately: that is the cost the shared core defers to the first
+request that actually reaches the model.
+
+Run with: python benchmarks/bench_cold_start.py
+"""
+
+import importlib.util
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SAMPLES = 5
+HEAVY_MODULES = ("google.generativeai", "PyPDF2", "docx", "pydantic", "numpy")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "api"))
+
+RESUME = b"""Jane Doe
+Senior Software Engineer
+jane.doe@example.com | +1 (555) 010-2000
+
+Experience
+Acme Corp - Built React and Node.js services.
+"""
+QUESTIONS = [
+    {"question": "Q", "difficulty": "Medium", "timeLimit": 60, "category": "JS"}
+]
+REQUESTS = {
+    "health": ("GET", "/api/health", None, None),
+    "parse-resume": ("POST", "/api/parse-resume", RESUME, "text/plain"),
+    "generate-questions": (
+        "POST",
+        "/api/generate-questions",
+        json.dumps({"role": "Backend Engineer", "skills": ["Python"]}).encode(),
+        "application/json",
+    ),
+    "evaluate-answers": (
+        "POST",
+        "/api/evaluate-answers",
+        json.dumps(
+            {"questions": QUESTIONS, "answers": [{"answer": "A", "timeTaken": 30}]}
+        ).encode(),
+        "application/json",
+    ),
+}
+
+
+def stub_respond(prompt, generation_config=None):
+    if "interview questions" in prompt:
+        return json.dumps(
+            [
+                {
+                    "question": f"{difficulty} question {n}",
+                    "difficulty": difficulty,
+                    "timeLimit": 60,
+                    "category": "Python",
+                }
+                for difficulty in ("Easy", "Medium", "Hard")
+                for n in range(2)
+            ]
+        )
+    if "individualScores" in prompt:
+        return json.dumps(
+            {
+                "overallScore": 7,
+                "recommendation": "Hire",
+                "summary": "Good.",
+                "individualScores": [
+                    {"questionIndex": 0, "score": 7, "feedback": "Good."}
+                ],
+            }
+        )
+    return json.dumps(
+        {
+            "name": "Jane Doe",
+            "email": "jane.doe@example.com",
+            "phone": "+1 (555) 010-2000",
+            "confidence": {"name": 0.9, "email": 0.9, "phone": 0.9},
+        }
+    )
+
+
+def measure(name):
+    """Runs in the child interpreter; prints one JSON result line"""
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(
+        name.replace("-", "_"), os.path.join(API_DIR, f"{name}.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    imported = time.perf_counter()
+
+    import _core
+    from _stubs import StubModel
+
+    _core.model_factory = lambda model_name: StubModel(stub_respond, latency=0)
+
+    method, path, body, content_type = REQUESTS[name]
+    request = module.handler.__new__(module.handler)
+    request.rfile = io.BytesIO(body or b"")
+    request.wfile = io.BytesIO()
+    request.headers = {"Content-Length": str(len(body or b""))}
+    if content_type:
+        request.headers["Content-Type"] = content_type
+    request.path = path
+    request.command = method
+    request.request_version = "HTTP/1.1"
+    request.requestline = f"{method} {path} HTTP/1.1"
+    request.client_address = ("127.0.0.1", 0)
+    request.log_message = lambda *args: None
+    getattr(request, f"do_{method}")()
+    responded = time.perf_counter()
+    status = request.wfile.getvalue().split(b" ", 2)[1].decode()
+
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    sdk_import_ms = None
+    if "google.generativeai" not in sys.modules:
+        try:
+            sdk_start = time.perf_counter()
+            import google.generativeai  # noqa: F401
+
+            sdk_import_ms = (time.perf_counter() - sdk_start) * 1000
+        except ImportError:
+            pass
+
+    print(
+        json.dumps(
+            {
+                "importMs": (imported - start) * 1000,
+                "firstResponseMs": (responded - imported) * 1000,
+                "status": status,
+                "heavyModulesLoaded": loaded,
+                "deferredSdkImportMs": sdk_import_ms,
+            }
+        )
+    )
+
+
+def main():
+    print(
+        f"{'handler':<20} {'process ms':>10} {'import ms':>10} {'first resp ms':>14}"
+        f" {'status':>7}  heavy modules loaded"
+    )
+    for name in REQUESTS:
+        results = []
+        wall = []
+        for _ in range(SAMPLES):
+            start = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", name],
+                capture_output=True,
+                text=True,
+                cwd=BENCH_DIR,
+                env={**os.environ, "CACHE_BACKEND": "memory"},
+            )
+            wall.append((time.perf_counter() - start) * 1000)
+            if output.returncode != 0:
+                raise SystemExit(f"{name} failed:\n{output.stderr}")
+            # Trace lines and background refills log around the result line
+            lines = output.stdout.strip().splitlines()
+            results.append(
+                json.loads(next(line for line in lines if '"importMs"' in line))
+            )
+
+        def median(key):
+            return statistics.median(result[key] for result in results)
+
+        print(
+            f"{name:<20} {statistics.median(wall):>10.1f} {median('importMs'):>10.1f}"
+            f" {median('firstResponseMs'):>14.1f} {results[0]['status']:>7}"
+            f"  {', '.join(results[0]['heavyModulesLoaded']) or '-'}"
+        )
+        deferred = [
+            result["deferredSdkImportMs"]
+            for result in results
+            if result["deferredSdkImportMs"]
+        ]
+        if deferred:
+            print(
+                f"{'':<20} Gemini SDK import deferred off this path:"
+                f" {statistics.median(deferred):.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        sys.path.insert(0, BENCH_DIR)
+        import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+        measure(sys.argv[2])
+    else:
+        main()
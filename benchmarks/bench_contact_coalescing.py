@@ -0,0 +1,133 @@
+"""Latency and throughput of coalesced contact extraction under load
+
+Uploads arrive as a Poisson process and each needs one contact-extraction
+call. The stub model has a fixed round-trip latency plus a small per-token
+cost, and the client is capped at a few concurrent calls the way a quota
+would cap it. One call in twenty of the multi-document responses drops a
+document, which exercises the single-call fallback.
+
+Compares one call per upload against several coalescing windows and batch
+sizes, reporting p50/p95 latency, completed uploads per second, model calls
+and fallbacks.
+
+Run with: python benchmarks/bench_contact_coalescing.py
+"""
+
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+
+from _stubs import StubModel, unthrottled_scheduler
+
+from _coalescer import Coalescer
+from _contact import (
+    build_contact_prompt,
+    build_multi_contact_prompt,
+    parse_multi_contact_info,
+    validate_contact_info,
+)
+from _llm import AsyncLLMClient
+from _llm_json import extract_json
+
+RATES = (10, 40)
+DURATION = 3.0
+MAX_CONCURRENCY = 4
+LATENCY = 0.3
+PER_TOKEN_LATENCY = 0.00005
+CONFIGS = [
+    ("single call", None, None),
+    ("5ms / 4", 0.005, 4),
+    ("20ms / 8", 0.02, 8),
+    ("50ms / 16", 0.05, 16),
+]
+DOCUMENT_PATTERN = re.compile(r"### Document (\d+)\n\s*(\S+@\S+)")
+EMAIL_PATTERN = re.compile(r"\S+@example\.com")
+
+
+def make_respond(rng):
+    def contact(email):
+        return {
+            "name": "Sam Lee",
+            "email": email,
+            "phone": None,
+            "confidence": {"name": 0.9, "email": 0.95, "phone": 0.0},
+        }
+
+    def respond(prompt, generation_config):
+        documents = DOCUMENT_PATTERN.findall(prompt)
+        if not documents:
+            return json.dumps(contact(EMAIL_PATTERN.search(prompt).group()))
+        items = [
+            {"document": int(index), **contact(email)} for index, email in documents
+        ]
+        if rng.random() < 0.05:
+            items.pop(rng.randrange(len(items)))
+        return json.dumps(items)
+
+    return respond
+
+
+async def run(label, rate, window, max_batch):
+    rng = random.Random(11)
+    model = StubModel(make_respond(rng), LATENCY, PER_TOKEN_LATENCY)
+    llm = AsyncLLMClient(
+        lambda name: model,
+        "stub",
+        max_concurrency=MAX_CONCURRENCY,
+        scheduler=unthrottled_scheduler(),
+    )
+
+    async def single(text):
+        result_text = await llm.generate(build_contact_prompt(text))
+        return validate_contact_info(extract_json(result_text, expect=dict))
+
+    async def batch(texts):
+        result_text = await llm.generate(build_multi_contact_prompt(texts))
+        return parse_multi_contact_info(result_text, len(texts))
+
+    coalescer = None
+    if window is not None:
+        coalescer = Coalescer(batch, single, window=window, max_batch=max_batch)
+    extract = coalescer.submit if coalescer else single
+
+    latencies = []
+
+    async def upload(n):
+        text = f"candidate{n}@example.com\nSoftware Engineer\n" + "Python. " * 150
+        start = time.perf_counter()
+        info = await extract(text)
+        assert info["email"] == f"candidate{n}@example.com", info
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    tasks = []
+    n = 0
+    while time.perf_counter() - start < DURATION:
+        tasks.append(asyncio.ensure_future(upload(n)))
+        n += 1
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    fallbacks = coalescer.fallbacks if coalescer else 0
+    print(
+        f"{rate:>4}/s  {label:<12} p50 {statistics.median(ordered) * 1000:7.0f} ms"
+        f"  p95 {ordered[int(0.95 * (len(ordered) - 1))] * 1000:7.0f} ms"
+        f"  {len(ordered) / elapsed:6.1f} uploads/s"
+        f"  model calls {model.calls:4d}  fallbacks {fallbacks}"
+    )
+
+
+async def main():
+    for rate in RATES:
+        for label, window, max_batch in CONFIGS:
+            await run(label, rate, window, max_batch)
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
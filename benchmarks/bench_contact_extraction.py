@@ -0,0 +1,69 @@
+"""Compare the legacy three-call contact extraction with the structured single call
+
+Run with: python benchmarks/bench_contact_extraction.py
+"""
+
+import json
+import time
+
+from _stubs import StubModel
+
+from _contact import extract_contact_info_structured
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 (415) 555-0134 | San Francisco, CA
+
+Experience
+Senior Software Engineer, Acme Corp (2019 - present)
+""" + ("Built and operated distributed services in Python and Go.\n" * 120)
+
+
+def respond(prompt, generation_config):
+    if generation_config and generation_config.get("response_schema"):
+        return json.dumps(
+            {
+                "name": "Jane Doe",
+                "email": "jane.doe@example.com",
+                "phone": "+1 (415) 555-0134",
+                "confidence": {"name": 0.95, "email": 0.99, "phone": 0.97},
+            }
+        )
+    if "full name" in prompt:
+        return "Jane Doe"
+    if "email" in prompt:
+        return "jane.doe@example.com"
+    return "+1 (415) 555-0134"
+
+
+def legacy_three_calls(model, text):
+    """The previous implementation: one blocking call per field"""
+    name = model.generate_content(
+        f"Extract the full name from this text: {text}. Only return the name."
+    ).text.strip()
+    email = model.generate_content(
+        f"Extract the email from this text: {text}. Only return the email."
+    ).text.strip()
+    phone = model.generate_content(
+        f"Extract the phone number from this text: {text}. Only return the phone number."
+    ).text.strip()
+    return {"name": name, "email": email, "phone": phone}
+
+
+def run(label, extract, runs=5, latency=0.4):
+    model = StubModel(respond, latency=latency)
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = extract(model, RESUME)
+    elapsed = (time.perf_counter() - start) / runs
+    print(
+        f"{label:<12} {elapsed * 1000:9.1f} ms/upload "
+        f"{model.calls / runs:5.1f} calls "
+        f"{model.prompt_tokens // runs:7d} prompt tokens"
+    )
+    return result
+
+
+if __name__ == "__main__":
+    print(f"{'path':<12} {'latency':>15} {'calls':>11} {'input':>20}")
+    run("three-call", legacy_three_calls)
+    print(json.dumps(run("structured", extract_contact_info_structured), indent=2))
@@ -0,0 +1,70 @@
+"""Measure the local contact extractor against a labelled fixture corpus
+
+For each confidence threshold this reports per-field precision and recall of
+the values the fast path would accept without a model call, and the share of
+uploads that skip Gemini entirely.
+
+Run with: python benchmarks/bench_contact_fast_path.py
+"""
+
+import json
+import os
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _contact import CONTACT_FIELDS, extract_contact_info_local
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "contact_corpus.json"
+)
+THRESHOLDS = (0.6, 0.7, 0.8, 0.9, 0.95)
+
+
+def normalize(field, value):
+    if value is None:
+        return None
+    if field == "phone":
+        return "".join(char for char in value if char.isdigit())
+    return value.strip().lower()
+
+
+def evaluate(corpus, threshold):
+    accepted = {field: 0 for field in CONTACT_FIELDS}
+    correct = {field: 0 for field in CONTACT_FIELDS}
+    present = {field: 0 for field in CONTACT_FIELDS}
+    skipped = 0
+
+    for sample in corpus:
+        result = extract_contact_info_local(sample["text"])
+        all_confident = True
+        for field in CONTACT_FIELDS:
+            expected = normalize(field, sample["expected"][field])
+            if expected is not None:
+                present[field] += 1
+            if result["confidence"][field] < threshold:
+                # A missing field is only settled locally when nothing is expected
+                all_confident = False
+                continue
+            accepted[field] += 1
+            if normalize(field, result[field]) == expected:
+                correct[field] += 1
+        skipped += all_confident
+
+    return accepted, correct, present, skipped / len(corpus)
+
+
+if __name__ == "__main__":
+    with open(CORPUS_PATH) as f:
+        corpus = json.load(f)
+
+    print(f"{len(corpus)} labelled resumes")
+    header = "".join(f"{field + ' P/R':>16}" for field in CONTACT_FIELDS)
+    print(f"{'threshold':>10}{header}{'LLM skipped':>14}")
+    for threshold in THRESHOLDS:
+        accepted, correct, present, skip_rate = evaluate(corpus, threshold)
+        row = ""
+        for field in CONTACT_FIELDS:
+            precision = correct[field] / accepted[field] if accepted[field] else 1.0
+            recall = correct[field] / present[field] if present[field] else 1.0
+            row += f"{precision:>9.2f}/{recall:.2f}"
+        print(f"{threshold:>10.2f}{row}{skip_rate:>14.0%}")
@@ -0,0 +1,160 @@
+"""Re-evaluating interview sessions with and without the per-answer cache
+
+Recruiters re-run ``/evaluate-answers`` on the same session when they
+refresh, export or re-open it. ``SESSIONS`` sessions of six answers, about
+a fifth of them blank or "I don't know", are each evaluated ``RUNS`` times
+by the Vercel ``evaluate-answers`` handler over a stub model, in batch and
+parallel mode. Without the cache every run prompts the model for every
+answer that is not settled locally; with it only the first run does.
+
+Also reports the cost of a lookup: a cache hit, a miss and a trivial answer.
+
+Run with: python benchmarks/bench_evaluation_cache.py
+"""
+
+import importlib.util
+import json
+import os
+import random
+import re
+import time
+
+from _stubs import API_DIR, StubModel
+
+import _evaluation
+
+SESSIONS = 30
+RUNS = 3
+ANSWERS = 6
+BASE_LATENCY = 0.02
+PER_ANSWER_LATENCY = 0.01
+NON_ANSWERS = ["", "I don't know.", "idk", "Not sure", "   "]
+TOPICS = ["closures", "indexes", "event loops", "caching", "sharding", "retries"]
+
+
+def latency(prompt):
+    answers = max(1, prompt.count("Candidate Answer"))
+    return BASE_LATENCY + PER_ANSWER_LATENCY * answers
+
+
+def respond(prompt, generation_config):
+    evaluation = {
+        "score": 6,
+        "feedback": "Covers the basics.",
+        "suggestions": "Add an example.",
+        "strengths": ["Clear"],
+        "improvements": ["Depth"],
+    }
+    indexes = [int(i) for i in re.findall(r"\(questionIndex (\d+)\)", prompt)]
+    if not indexes:
+        return json.dumps(evaluation)
+    return json.dumps(
+        {
+            "overallScore": 6,
+            "recommendation": "Consider",
+            "summary": "Adequate.",
+            "individualScores": [{"questionIndex": i, **evaluation} for i in indexes],
+        }
+    )
+
+
+def make_sessions(tag):
+    """Sessions whose questions mention ``tag``, so each run starts uncached"""
+    rng = random.Random(5)
+    sessions = []
+    for session in range(SESSIONS):
+        questions, answers = [], []
+        for index in range(ANSWERS):
+            topic = rng.choice(TOPICS)
+            questions.append(
+                {
+                    "question": f"{tag} session {session}: how would you use {topic}?",
+                    "difficulty": rng.choice(["Easy", "Medium", "Hard"]),
+                    "category": "Technical",
+                }
+            )
+            if rng.random() < 0.2:
+                text = rng.choice(NON_ANSWERS)
+            else:
+                text = f"I would apply {topic} carefully, case {session}.{index}."
+            answers.append({"answer": text, "timeTaken": rng.randint(20, 180)})
+        sessions.append((questions, answers))
+    return sessions
+
+
+def load_handler_module():
+    path = os.path.join(API_DIR, "evaluate-answers.py")
+    spec = importlib.util.spec_from_file_location("evaluate_answers", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(module, mode, cached):
+    """(model calls, prompt tokens, seconds) of evaluating every session RUNS times"""
+    sessions = make_sessions(f"{mode} {cached}")
+    if cached:
+        module.lookup_evaluation = _evaluation.lookup_evaluation
+        module.store_evaluation = _evaluation.store_evaluation
+    else:
+        module.lookup_evaluation = lambda *key: None
+        module.store_evaluation = lambda *key: None
+
+    model = StubModel(respond, latency)
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        for questions, answers in sessions:
+            if mode == "batch":
+                evaluation = module.handler.evaluate_batch(
+                    None, model, questions, answers
+                )
+            else:
+                evaluations = [None] * len(answers)
+                for index, result in module.iter_answer_evaluations(
+                    model, questions, answers
+                ):
+                    evaluations[index] = result
+                evaluation = module.build_evaluation(evaluations, answers)
+            assert len(evaluation["individualScores"]) == ANSWERS
+    return model.calls, model.prompt_tokens, time.perf_counter() - start
+
+
+def lookup_benchmark():
+    key = ("What is a closure?", "Easy", "JavaScript", "A function with its scope.")
+    _evaluation.store_evaluation(*key, json.loads(respond("", None)))
+    count = 20000
+    print("\nper lookup µs")
+    for label, args in (
+        ("hit", key),
+        ("miss", key[:3] + ("Something else entirely.",)),
+        ("trivial", key[:3] + ("I don't know",)),
+    ):
+        start = time.perf_counter()
+        for _ in range(count):
+            _evaluation.lookup_evaluation(*args)
+        print(f"  {label:<8} {(time.perf_counter() - start) / count * 1e6:6.2f}")
+
+
+def main():
+    module = load_handler_module()
+    sessions = make_sessions("count")
+    trivial = sum(
+        _evaluation.trivial_evaluation(answer["answer"]) is not None
+        for _, answers in sessions
+        for answer in answers
+    )
+    print(
+        f"{SESSIONS} sessions x {ANSWERS} answers ({trivial} trivial),"
+        f" each evaluated {RUNS} times"
+    )
+    print(f"{'mode':<9} {'cache':<6} {'calls':>6} {'tokens':>8} {'seconds':>8}")
+    for mode in ("batch", "parallel"):
+        for cached in (False, True):
+            calls, tokens, seconds = run(module, mode, cached)
+            label = "on" if cached else "off"
+            print(f"{mode:<9} {label:<6} {calls:>6} {tokens:>8} {seconds:>8.2f}")
+    lookup_benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Concurrent uploads: inline text extraction versus the process pool
+
+A synthetic CPU-bound parser stands in for PyPDF2 so the benchmark runs
+without fixture PDFs. Throughput gains scale with the number of CPU cores;
+the event-loop stall shows the difference even on one core.
+
+Run with: python benchmarks/bench_extraction_pool.py
+"""
+
+import asyncio
+import time
+import zlib
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _extraction import (
+    ExtractionPool,
+    ExtractionTimeoutError,
+    PoolSaturatedError,
+)
+
+UPLOADS = 32
+
+
+def synthetic_extract(file_content: bytes) -> str:
+    """Decompress-and-scan loop standing in for PyPDF2 page parsing"""
+    text = ""
+    for _ in range(40):
+        text = zlib.decompress(file_content).decode("latin-1")
+        sum(text.count(word) for word in ("Python", "React", "SQL"))
+    return text
+
+
+def pathological_extract(file_content: bytes) -> str:
+    while True:
+        pass
+
+
+def make_document() -> bytes:
+    return zlib.compress(("Experience with Python, React and SQL. " * 20000).encode())
+
+
+async def probe(samples, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        samples.append(time.perf_counter() - start - 0.005)
+
+
+async def run(label, extract):
+    document = make_document()
+    samples = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(samples, stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(extract(document) for _ in range(UPLOADS)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await prober
+    print(
+        f"{label:<8} {UPLOADS / elapsed:6.1f} uploads/s  "
+        f"worst event-loop stall {max(samples, default=0) * 1000:7.1f} ms"
+    )
+
+
+async def main():
+    async def inline(document):
+        # What parse_resume did before: parse directly inside the handler
+        return synthetic_extract(document)
+
+    await run("inline", inline)
+
+    pool = ExtractionPool(queue_depth=UPLOADS, timeout=5)
+    # Warm the workers so process start-up is not part of the measurement
+    await asyncio.gather(*(pool.run(len, b"") for _ in range(pool.workers)))
+    await run("pooled", lambda document: pool.run(synthetic_extract, document))
+
+    small = ExtractionPool(workers=1, queue_depth=1, timeout=0.5)
+    results = await asyncio.gather(
+        *(small.run(pathological_extract, b"") for _ in range(4)),
+        return_exceptions=True,
+    )
+    rejected = sum(isinstance(r, PoolSaturatedError) for r in results)
+    timed_out = sum(isinstance(r, ExtractionTimeoutError) for r in results)
+    print(f"saturation: {rejected} rejected with 429, {timed_out} killed on timeout")
+    print(pool.stats(), small.stats())
+    pool.shutdown()
+    small.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
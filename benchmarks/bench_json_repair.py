@@ -0,0 +1,132 @@
+"""Replay malformed model outputs through the old and new response parsers
+
+Each fixture is a realistic output the Gemini call sites have to cope with:
+fences with trailing whitespace, prose around the JSON, trailing commas,
+truncation and individual items that are missing fields. For every output
+this compares:
+
+- legacy: fence slicing plus ``json.loads``; any failure means the whole
+  prompt is regenerated
+- tolerant: ``extract_json`` plus per-item validation; only failing items
+  are re-asked, and only an unparseable output is regenerated
+
+and reports how many full regenerations and re-asked items each needs.
+
+Run with: python benchmarks/bench_json_repair.py
+"""
+
+import json
+import os
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _contact import validate_contact_info
+from _evaluation import split_batch_evaluations
+from _llm_json import extract_json
+from _question_bank import parse_question_set, validate_question_set
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "malformed_outputs.json"
+)
+QUESTION_SET_SIZE = 6
+
+
+def legacy_parse(result_text: str):
+    result_text = result_text.strip()
+    if result_text.startswith("```json"):
+        result_text = result_text[7:-3]
+    elif result_text.startswith("```"):
+        result_text = result_text[3:-3]
+    return json.loads(result_text)
+
+
+def legacy_outcome(sample) -> str:
+    """"ok", "invalid" (accepted but wrong) or "regenerate" """
+    try:
+        payload = legacy_parse(sample["output"])
+        if sample["kind"] == "questions":
+            if not isinstance(payload, list) or len(payload) != QUESTION_SET_SIZE:
+                return "regenerate"
+            # The question pool rejects the set, which triggers a regeneration
+            validate_question_set([dict(item) for item in payload])
+        elif sample["kind"] == "evaluation":
+            payload["overallScore"], payload["summary"]
+            _, failing = split_batch_evaluations(
+                payload["evaluations"], sample["answers"]
+            )
+            if failing:
+                return "invalid"
+        else:
+            validate_contact_info(payload)
+    except (ValueError, KeyError, TypeError):
+        return "regenerate"
+    return "ok"
+
+
+def tolerant_outcome(sample) -> tuple:
+    """(needs full regeneration, number of items re-asked)"""
+    try:
+        if sample["kind"] == "questions":
+            _, missing = parse_question_set(sample["output"])
+            return False, len(missing)
+        if sample["kind"] == "evaluation":
+            payload = extract_json(sample["output"], expect=dict)
+            _, failing = split_batch_evaluations(
+                payload.get("evaluations"), sample["answers"]
+            )
+            return False, len(failing)
+        validate_contact_info(extract_json(sample["output"], expect=dict))
+        return False, 0
+    except ValueError:
+        return True, 0
+
+
+def main():
+    with open(CORPUS_PATH) as f:
+        corpus = json.load(f)
+
+    totals = {
+        "legacy_regenerations": 0,
+        "legacy_invalid_accepted": 0,
+        "tolerant_regenerations": 0,
+        "tolerant_reask_calls": 0,
+        "tolerant_items_reasked": 0,
+    }
+    print(f"{'sample':<38} {'legacy':>10} {'tolerant':>14}")
+    for sample in corpus:
+        legacy = legacy_outcome(sample)
+        regenerate, reasked = tolerant_outcome(sample)
+
+        totals["legacy_regenerations"] += legacy == "regenerate"
+        totals["legacy_invalid_accepted"] += legacy == "invalid"
+        totals["tolerant_regenerations"] += regenerate
+        if reasked:
+            # Question sets re-ask missing items in one call; evaluations
+            # re-ask each failing answer on its own
+            calls = 1 if sample["kind"] == "questions" else reasked
+            totals["tolerant_reask_calls"] += calls
+            totals["tolerant_items_reasked"] += reasked
+
+        if regenerate:
+            tolerant = "regenerate"
+        elif reasked:
+            tolerant = f"re-ask {reasked}"
+        else:
+            tolerant = "ok"
+        print(f"{sample['name']:<38} {legacy:>10} {tolerant:>14}")
+
+    saved = totals["legacy_regenerations"] - totals["tolerant_regenerations"]
+    print()
+    print(f"samples:                        {len(corpus)}")
+    print(f"legacy full regenerations:      {totals['legacy_regenerations']}")
+    print(f"legacy invalid items accepted:  {totals['legacy_invalid_accepted']}")
+    print(f"tolerant full regenerations:    {totals['tolerant_regenerations']}")
+    print(
+        f"tolerant targeted re-asks:      {totals['tolerant_reask_calls']} calls,"
+        f" {totals['tolerant_items_reasked']} items"
+    )
+    print(f"full regenerations saved:       {saved}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""LLM scheduling under quota pressure, priority contention and an outage
+
+Drives AsyncLLMClient against the local fake Gemini server with three
+scenarios, using a one-second quota window in place of the real per-minute
+one so each run takes seconds:
+
+- quota: a burst larger than the server's quota. Unguarded calls fail on
+  429s; retries alone recover but keep hammering the quota; the scheduler's
+  token bucket paces calls so almost none are throttled.
+- priority: background refills queued ahead of a few interactive calls.
+  Reports interactive latency with and without priority classes.
+- outage: every call fails with a 503. Reports how many requests reach the
+  server and how long callers wait with and without the circuit breaker.
+
+Run with: python benchmarks/bench_llm_scheduler.py
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+
+from _stubs import HTTPStubModel
+from fake_gemini import FakeGeminiServer
+
+from _llm import AsyncLLMClient
+from _scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMScheduler,
+    TokenBucket,
+)
+
+LATENCY = 0.05
+QUOTA = 20  # requests per window on the fake server
+WINDOW = 1.0
+BURST = 80
+BACKOFF = {"backoff_base": 0.1, "backoff_max": 2.0}
+NO_BREAKER = 10**9
+
+
+def server_quota(limit):
+    """``fail`` callback answering 429 once the server's quota is spent"""
+    bucket = TokenBucket(limit, WINDOW)
+    lock = threading.Lock()
+
+    def fail(number):
+        with lock:
+            if bucket.delay(1, time.monotonic()) > 0:
+                return 429
+            bucket.take(1)
+        return None
+
+    return fail
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[int(share * (len(ordered) - 1))] if ordered else 0.0
+
+
+def client(base_url, scheduler):
+    return AsyncLLMClient(
+        lambda name: HTTPStubModel(base_url, name),
+        "fake-gemini",
+        max_concurrency=16,
+        scheduler=scheduler,
+    )
+
+
+async def timed(llm, prompt, priority=PRIORITY_INTERACTIVE):
+    start = time.perf_counter()
+    try:
+        await llm.generate(prompt, priority=priority)
+        error = None
+    except Exception as e:
+        error = e
+    return time.perf_counter() - start, error
+
+
+async def quota_scenario():
+    print(f"quota: {BURST} concurrent calls, server allows {QUOTA} per second")
+    configs = [
+        ("no retries", {"rpm": 1e9, "max_retries": 0}),
+        ("retries only", {"rpm": 1e9, "max_retries": 6}),
+        ("scheduler", {"rpm": QUOTA, "max_retries": 6}),
+    ]
+    for label, options in configs:
+        scheduler = LLMScheduler(
+            tpm=1e12, window=WINDOW, breaker_threshold=NO_BREAKER, **BACKOFF, **options
+        )
+        with FakeGeminiServer(
+            lambda prompt, config: "{}", LATENCY, fail=server_quota(QUOTA)
+        ) as server:
+            llm = client(server.url, scheduler)
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(timed(llm, f"prompt {n}") for n in range(BURST))
+            )
+            elapsed = time.perf_counter() - start
+        latencies = [latency for latency, error in results if error is None]
+        print(
+            f"  {label:<13} ok {len(latencies):3d}/{BURST}"
+            f"  server 429s {server.errors:4d}"
+            f"  p95 {percentile(latencies, 0.95) * 1000:6.0f} ms"
+            f"  wall {elapsed:5.2f}s"
+        )
+
+
+async def priority_scenario():
+    background, interactive = 60, 8
+    print(
+        f"priority: {background} background calls queued before"
+        f" {interactive} interactive ones, quota {QUOTA} per second"
+    )
+    for label, interactive_priority in (
+        ("fifo", PRIORITY_BACKGROUND),
+        ("priority", PRIORITY_INTERACTIVE),
+    ):
+        scheduler = LLMScheduler(rpm=QUOTA, tpm=1e12, window=WINDOW, **BACKOFF)
+        with FakeGeminiServer(lambda prompt, config: "{}", LATENCY) as server:
+            llm = client(server.url, scheduler)
+            refills = [
+                asyncio.ensure_future(timed(llm, f"refill {n}", PRIORITY_BACKGROUND))
+                for n in range(background)
+            ]
+            await asyncio.sleep(0.05)
+            live = await asyncio.gather(
+                *(
+                    timed(llm, f"question {n}", interactive_priority)
+                    for n in range(interactive)
+                )
+            )
+            refilled = await asyncio.gather(*refills)
+        live_latencies = [latency for latency, _ in live]
+        print(
+            f"  {label:<9} interactive p50"
+            f" {statistics.median(live_latencies) * 1000:6.0f} ms"
+            f"  p95 {percentile(live_latencies, 0.95) * 1000:6.0f} ms"
+            f"  background p50"
+            f" {statistics.median(latency for latency, _ in refilled) * 1000:6.0f} ms"
+        )
+
+
+async def outage_scenario():
+    calls = 40
+    print(f"outage: {calls} calls while every request fails with 503")
+    for label, threshold in (("no breaker", NO_BREAKER), ("breaker", 5)):
+        scheduler = LLMScheduler(
+            rpm=1e9,
+            tpm=1e12,
+            max_retries=3,
+            breaker_threshold=threshold,
+            breaker_cooldown=5.0,
+            **BACKOFF,
+        )
+        with FakeGeminiServer(
+            lambda prompt, config: "{}", LATENCY, fail=lambda number: 503
+        ) as server:
+            llm = client(server.url, scheduler)
+            results = []
+            for batch in range(0, calls, 8):
+                results += await asyncio.gather(
+                    *(timed(llm, f"prompt {n}") for n in range(batch, batch + 8))
+                )
+        latencies = [latency for latency, _ in results]
+        print(
+            f"  {label:<11} server requests {server.requests:4d}"
+            f"  rejected fast {scheduler.rejected:3d}"
+            f"  mean wait {statistics.mean(latencies) * 1000:6.0f} ms"
+        )
+
+
+async def main():
+    await quota_scenario()
+    print()
+    await priority_scenario()
+    print()
+    await outage_scenario()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""Cost of request metrics and trace logs against their microsecond budget
+
+Replays the bookkeeping of one traced request: opening the trace, timing
+each of the five stages once, recording a model call's tokens and writing
+the JSON trace line (to a discarding sink, so the encoding is counted but
+no terminal I/O). The same loop without the metrics calls is subtracted.
+Runs on one thread and on eight at once, since every metric takes a lock.
+Also reports the cost of each call on its own and of rendering /metrics.
+
+Exits non-zero when a request's bookkeeping exceeds
+``METRICS_OVERHEAD_BUDGET_US``.
+
+Run with: python benchmarks/bench_metrics_overhead.py
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+import _metrics
+from _metrics import (
+    METRICS_OVERHEAD_BUDGET_US,
+    STAGES,
+    finish_trace,
+    record_error,
+    record_llm_call,
+    render,
+    stage,
+    start_trace,
+    timed,
+)
+from _stubs import StubResponse
+
+REQUESTS = 20000
+THREADS = 8
+PROMPT = "Generate exactly 6 interview questions. " * 40
+RESPONSE = StubResponse('[{"question": "What is a closure?"}]' * 20)
+
+
+def bare_request():
+    for name in STAGES:
+        pass
+
+
+def traced_request():
+    trace, token = start_trace("bench", None)
+    for name in STAGES:
+        with stage(name):
+            pass
+    record_llm_call("bench", 0.4, PROMPT, RESPONSE)
+    trace.status = 200
+    finish_trace(trace, token)
+
+
+def per_request_us(request, threads=1):
+    """Wall-clock microseconds per call of ``request`` across ``threads``"""
+
+    def run():
+        for _ in range(REQUESTS // threads):
+            request()
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def per_call_us(call, count=REQUESTS):
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def empty_stage():
+    with stage("bench"):
+        pass
+
+
+@timed("bench")
+def decorated():
+    pass
+
+
+def main():
+    # _stubs turns trace lines off for the other benchmarks
+    _metrics.TRACE_LOG = True
+    lines = deque(maxlen=1)
+    _metrics.trace_sink = lines.append
+    per_request_us(traced_request)  # warm up
+
+    print(f"{'threads':>7} {'bare µs':>8} {'traced µs':>10} {'overhead µs':>12}")
+    overheads = []
+    for threads in (1, THREADS):
+        bare = per_request_us(bare_request, threads)
+        traced = per_request_us(traced_request, threads)
+        overheads.append(traced - bare)
+        print(f"{threads:>7} {bare:>8.2f} {traced:>10.2f} {traced - bare:>12.2f}")
+    sample = lines[-1]
+
+    error = ValueError("bench")
+    print("\nper call µs")
+    print(f"  stage()            {per_call_us(empty_stage):6.2f}")
+    print(f"  @timed function    {per_call_us(decorated):6.2f}")
+    print(
+        "  record_llm_call    "
+        f"{per_call_us(lambda: record_llm_call('bench', 0.4, PROMPT, RESPONSE)):6.2f}"
+    )
+    print(f"  record_error       {per_call_us(lambda: record_error(error)):6.2f}")
+    render_us = per_call_us(render, 200)
+    print(f"  render /metrics    {render_us:6.0f} ({len(render())} bytes)")
+    print(f"\nsample trace line: {sample}")
+
+    worst = max(overheads)
+    verdict = "within" if worst <= METRICS_OVERHEAD_BUDGET_US else "OVER"
+    print(
+        f"\nworst overhead {worst:.1f} µs per request,"
+        f" {verdict} the {METRICS_OVERHEAD_BUDGET_US} µs budget"
+    )
+    if worst > METRICS_OVERHEAD_BUDGET_US:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
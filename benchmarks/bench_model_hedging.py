@@ -0,0 +1,132 @@
+"""Tail latency of hedged model calls against a long-tailed primary model
+
+The fake Gemini server gives each model its own latency distribution: the
+primary is usually fast but now and then takes seconds, the alternate tier
+is a little slower on average with no long tail. A few responses are cut off
+mid-JSON, which the router treats as a failed attempt and hands to the other
+tier.
+
+Compares a single model against hedging at a few deadline percentiles,
+reporting p50/p95/p99 latency, the share of calls that fired a hedge (the
+extra model cost), calls left without valid JSON and wins per tier
+(primary/alternate).
+
+Run with: python benchmarks/bench_model_hedging.py
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+from _stubs import HTTPStubModel, unthrottled_scheduler
+from fake_gemini import FakeGeminiServer
+
+from _llm import AsyncLLMClient
+from _llm_json import extract_json
+from _routing import ModelRouter
+
+PRIMARY = "primary"
+ALTERNATE = "alternate"
+CALLS = 400
+CONCURRENCY = 16
+TRUNCATED_SHARE = 0.02
+CONFIGS = [
+    ("primary only", None),
+    ("hedge at p99", 0.99),
+    ("hedge at p95", 0.95),
+    ("hedge at p90", 0.90),
+]
+
+
+def make_latency(seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def latency(model_name):
+        with lock:
+            roll = rng.random()
+            if model_name == ALTERNATE:
+                return rng.uniform(0.12, 0.25)
+            if roll < 0.02:
+                return rng.uniform(2.0, 4.0)
+            if roll < 0.08:
+                return rng.uniform(0.6, 1.2)
+            return rng.lognormvariate(-2.3, 0.3)
+
+    return latency
+
+
+def make_respond(seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def respond(prompt, generation_config):
+        with lock:
+            truncated = rng.random() < TRUNCATED_SHARE
+        return '{"score": 7, "feedback": "Solid' if truncated else '{"score": 7}'
+
+    return respond
+
+
+def percentile(ordered, share):
+    return ordered[int(share * (len(ordered) - 1))]
+
+
+async def run(label, hedge_percentile):
+    hedges = [] if hedge_percentile is None else [ALTERNATE]
+    router = ModelRouter(
+        PRIMARY,
+        hedges,
+        percentile=hedge_percentile or 0.95,
+        default_delay=1.0,
+        min_samples=20,
+    )
+    with FakeGeminiServer(make_respond(5), make_latency(7)) as server:
+        llm = AsyncLLMClient(
+            lambda name: HTTPStubModel(server.url, name),
+            PRIMARY,
+            max_concurrency=CONCURRENCY * 2,
+            scheduler=unthrottled_scheduler(),
+            router=router,
+        )
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        latencies = []
+        failed = 0
+
+        async def one(n):
+            nonlocal failed
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    extract_json(
+                        await llm.generate(f"prompt {n}", operation="evaluation")
+                    )
+                except ValueError:
+                    failed += 1
+                    return
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(n) for n in range(CALLS)))
+        requests = server.requests
+
+    ordered = sorted(latencies)
+    wins = router.stats()["wins"].get("evaluation", {})
+    print(
+        f"{label:<13} p50 {percentile(ordered, 0.5) * 1000:5.0f} ms"
+        f"  p95 {percentile(ordered, 0.95) * 1000:5.0f} ms"
+        f"  p99 {percentile(ordered, 0.99) * 1000:5.0f} ms"
+        f"  extra calls {(requests - CALLS) / CALLS:5.1%}"
+        f"  invalid {failed:2d}"
+        f"  wins {wins.get(PRIMARY, 0)}/{wins.get(ALTERNATE, 0)}"
+    )
+
+
+async def main():
+    print(f"{CALLS} calls, {CONCURRENCY} at a time")
+    for label, hedge_percentile in CONFIGS:
+        await run(label, hedge_percentile)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Time-to-first-score and total latency: one big prompt versus per-answer calls
+
+The stub model's latency grows with the number of answers it must write
+feedback for, which is what makes the monolithic prompt wait on the longest
+generation.
+
+Run with: python benchmarks/bench_parallel_evaluation.py
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from _stubs import StubModel, unthrottled_scheduler
+
+from _evaluation import (
+    build_answer_prompt,
+    parse_answer_evaluation,
+    stream_evaluations,
+    summarize_evaluations,
+)
+from _llm import AsyncLLMClient
+
+ANSWERS = 6
+BASE_LATENCY = 0.3
+PER_ANSWER_LATENCY = 0.25
+rng = random.Random(3)
+
+
+def latency(prompt):
+    answers = max(1, prompt.count("Candidate Answer"))
+    jitter = rng.uniform(0.8, 1.3)
+    return BASE_LATENCY + PER_ANSWER_LATENCY * answers * jitter
+
+
+def respond(prompt, generation_config):
+    evaluation = {"score": 7, "feedback": "Solid answer.", "suggestions": "More depth."}
+    if prompt.count("Candidate Answer") > 1:
+        return json.dumps(
+            {
+                "evaluations": [evaluation] * prompt.count("Candidate Answer"),
+                "overallScore": 70,
+                "summary": "Good overall.",
+            }
+        )
+    return json.dumps(evaluation)
+
+
+def monolithic_prompt():
+    pairs = "\n".join(
+        f"Question {i}: q{i}\nCandidate Answer: a{i}" for i in range(ANSWERS)
+    )
+    return f"Evaluate these interview answers:\n{pairs}"
+
+
+async def main():
+    client = AsyncLLMClient(
+        lambda name: StubModel(respond, latency),
+        "stub",
+        scheduler=unthrottled_scheduler(),
+    )
+
+    start = time.perf_counter()
+    await client.generate(monolithic_prompt())
+    monolithic = time.perf_counter() - start
+    print(
+        f"monolithic  first score {monolithic * 1000:7.0f} ms   "
+        f"total {monolithic * 1000:7.0f} ms"
+    )
+
+    async def evaluate_one(index):
+        prompt = build_answer_prompt(f"q{index}", "Medium", "Technical", f"a{index}")
+        return parse_answer_evaluation(await client.generate(prompt))
+
+    start = time.perf_counter()
+    first = None
+    evaluations = [None] * ANSWERS
+    async for index, evaluation in stream_evaluations(evaluate_one, ANSWERS):
+        first = first or time.perf_counter() - start
+        evaluations[index] = evaluation
+    total = time.perf_counter() - start
+    print(
+        f"per-answer  first score {first * 1000:7.0f} ms   "
+        f"total {total * 1000:7.0f} ms   "
+        f"overallScore {summarize_evaluations(evaluations)['overallScore']}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
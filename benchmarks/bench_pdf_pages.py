@@ -0,0 +1,63 @@
+"""Page-streaming PDF extraction versus parsing every page up front
+
+PyPDF2 page parsing is simulated with a fixed CPU cost per page so the
+benchmark runs without fixture PDFs; the first page carries a realistic
+resume header.
+
+Run with: python benchmarks/bench_pdf_pages.py
+"""
+
+import time
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _contact import contact_fields_complete
+from _extraction import HEADER_PAGES, LazyText
+
+PAGE_COST_SECONDS = 0.015
+HEADER = "Jane Doe\njane.doe@example.com | +1 (415) 555-0134\n\nExperience\n"
+BODY = "Led the migration of billing services to Kubernetes. " * 60
+
+
+def fake_pages(count, parsed):
+    for number in range(count):
+        # Stand-in for page.extract_text()
+        deadline = time.perf_counter() + PAGE_COST_SECONDS
+        while time.perf_counter() < deadline:
+            pass
+        parsed.append(number)
+        yield (HEADER if number == 0 else "") + BODY
+
+
+def legacy(count):
+    parsed = []
+    text = ""
+    for page_text in fake_pages(count, parsed):
+        text += page_text + "\n"
+    return text, len(parsed)
+
+
+def header_mode(count):
+    parsed = []
+    text = LazyText(fake_pages(count, parsed)).header(
+        HEADER_PAGES, contact_fields_complete
+    )
+    return text, len(parsed)
+
+
+def measure(extract, count, runs=3):
+    start = time.perf_counter()
+    for _ in range(runs):
+        _, parsed = extract(count)
+    return (time.perf_counter() - start) / runs, parsed
+
+
+if __name__ == "__main__":
+    print(f"{'pages':>5} {'legacy':>20} {'header mode':>24}")
+    for count in (1, 5, 10, 40):
+        legacy_time, legacy_pages = measure(legacy, count)
+        header_time, header_pages = measure(header_mode, count)
+        print(
+            f"{count:>5} {legacy_time * 1000:8.1f} ms ({legacy_pages:>2} pages) "
+            f"{header_time * 1000:11.1f} ms ({header_pages:>2} pages)"
+        )
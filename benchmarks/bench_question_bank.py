@@ -0,0 +1,95 @@
+"""Latency and diversity of the question bank versus direct generation
+
+Also counts the generations spent on one-off keys, such as candidates whose
+resume skills are unique, which are not refilled until requested again.
+
+Run with: python benchmarks/bench_question_bank.py
+"""
+
+import itertools
+import random
+import statistics
+import time
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _question_bank import DIFFICULTY_TIME_LIMITS, QuestionBank
+
+GENERATION_LATENCY = 0.3
+REQUESTS = 120
+ONE_OFF_CANDIDATES = 20
+KEYS = [
+    ("Full Stack Developer", "Mid-level", ["React", "Node.js", "JavaScript"]),
+    ("Backend Engineer", "Senior", ["Python", "PostgreSQL"]),
+    ("Frontend Developer", "Entry-level", ["React", "CSS"]),
+]
+_counter = itertools.count()
+
+
+def stub_generate(role, experience, skills, avoid=()):
+    """Stand-in for the Gemini call: slow and a little different every time"""
+    time.sleep(GENERATION_LATENCY)
+    batch = next(_counter)
+    return [
+        {
+            "question": f"{role} {difficulty} question {batch}.{n}",
+            "difficulty": difficulty,
+            "timeLimit": limit,
+            "category": skills[n % len(skills)],
+        }
+        for difficulty, limit in DIFFICULTY_TIME_LIMITS.items()
+        for n in range(2)
+    ]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(label, serve):
+    rng = random.Random(7)
+    latencies = []
+    served = []
+    for _ in range(REQUESTS):
+        role, experience, skills = rng.choice(KEYS)
+        # Equivalent spellings must share a pool
+        skills = rng.sample(skills, len(skills))
+        if rng.random() < 0.2:
+            role = role.upper()
+        start = time.perf_counter()
+        questions = serve(role, experience, skills)
+        latencies.append(time.perf_counter() - start)
+        served.append(tuple(sorted(q["question"] for q in questions)))
+        # Candidates arrive a little apart, giving background refills time to run
+        time.sleep(0.05)
+
+    duplicates = len(served) - len(set(served))
+    print(
+        f"{label:<8} p50 {percentile(latencies, 0.5) * 1000:8.1f} ms  "
+        f"p95 {percentile(latencies, 0.95) * 1000:8.1f} ms  "
+        f"identical sets served {duplicates}/{len(served)}"
+    )
+
+
+if __name__ == "__main__":
+    run("direct", stub_generate)
+    bank = QuestionBank(rng=random.Random(11))
+    run(
+        "bank",
+        lambda role, experience, skills: bank.get(
+            role, experience, skills, stub_generate
+        ),
+    )
+    print(bank.stats())
+
+    for label, refill_after in (("refill every key", 1), ("refill repeat keys", 2)):
+        bank = QuestionBank(rng=random.Random(11), refill_after=refill_after)
+        first = next(_counter)
+        for candidate in range(ONE_OFF_CANDIDATES):
+            skills = [f"Skill {candidate}"]
+            bank.get("Backend Engineer", "Senior", skills, stub_generate)
+        # Let the background refills finish
+        time.sleep(GENERATION_LATENCY * 5)
+        calls = next(_counter) - first - 1
+        print(f"{ONE_OFF_CANDIDATES} one-off keys, {label:<18} model calls {calls}")
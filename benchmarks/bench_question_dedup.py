@@ -0,0 +1,259 @@
+"""Near-duplicate question index: lookup cost and regeneration savings
+
+Lookup: fills ``QuestionIndex`` with up to 100k synthetic questions and
+times ``similarity`` against the whole index, next to a brute-force NumPy
+scan of every signature. Reworded copies of indexed questions measure
+recall, with a filler word added (+1) or a word also dropped (±1); unseen
+questions measure false positives.
+
+Bounded: one question set per candidate scope for many more candidates than
+the index keeps, reporting its size and memory once old scopes are dropped.
+
+Regeneration: a stub model that keeps returning questions from a small
+favourite pool per role serves 60 sessions. Without the index, repeats of
+earlier sessions reach candidates. With it, only the offending questions
+are re-asked (``generate_question_set`` with ``avoid``); the alternative of
+regenerating whole sets until none repeats is shown for comparison.
+
+Run with: python benchmarks/bench_question_dedup.py
+"""
+
+import json
+import random
+import re
+import time
+
+import numpy as np
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _question_bank import build_question_prompt, generate_question_set, role_scope
+from _question_index import QuestionIndex, question_index
+from _scheduler import CHARS_PER_TOKEN
+
+SIZES = (1000, 10000, 100000)
+LOOKUPS = 500
+CANDIDATES = 50000
+BOUNDED_ENTRIES = 20000
+SESSIONS = 60
+FULL_SET_ATTEMPTS = 5
+
+TEMPLATES = [
+    "How would you {} when {} and {}?",
+    "Explain the trade-offs between {} and {} for {}.",
+    "Describe a time you had to {} under {} with {}.",
+    "What happens to {} if {} fails during {}?",
+    "Walk me through debugging {} in a system that uses {} and {}.",
+]
+
+
+def make_vocabulary(size=5000):
+    rng = random.Random(0)
+    syllables = ["ka", "lo", "mi", "nu", "pe", "ra", "si", "to", "vu", "ze", "qu"]
+    return [
+        "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        for _ in range(size)
+    ]
+
+
+VOCABULARY = make_vocabulary()
+
+
+def synthetic_questions(count, seed):
+    rng = random.Random(seed)
+    vocabulary = VOCABULARY
+
+    def phrase():
+        return " ".join(rng.sample(vocabulary, rng.randint(1, 3)))
+
+    return [
+        rng.choice(TEMPLATES).format(phrase(), phrase(), phrase())
+        for _ in range(count)
+    ]
+
+
+def reword(text, rng, drop):
+    """``text`` with a filler word added and, if ``drop``, another word removed"""
+    words = text.split()
+    if drop:
+        words.pop(rng.randrange(1, len(words)))
+    words.insert(rng.randrange(len(words)), rng.choice(["exactly", "typically"]))
+    return " ".join(words)
+
+
+def lookup_benchmark():
+    print(
+        f"{'questions':>9} {'add µs':>7} {'lookup µs':>10} {'scan µs':>8}"
+        f" {'recall +1':>10} {'recall ±1':>10} {'false pos':>10} {'MB':>6}"
+    )
+    for size in SIZES:
+        # One scope holding every question, so nothing is dropped
+        index = QuestionIndex(scope_entries=size, max_entries=size)
+        questions = synthetic_questions(size, seed=size)
+        start = time.perf_counter()
+        for text in questions:
+            index.add(text, ["role:bench"])
+        add_us = (time.perf_counter() - start) / size * 1e6
+
+        rng = random.Random(1)
+        probes = [
+            reword(rng.choice(questions), rng, drop)
+            for drop in (False, True)
+            for _ in range(LOOKUPS)
+        ]
+        unseen = synthetic_questions(LOOKUPS, seed=f"unseen {size}")
+        signatures = [index.signature(text) for text in probes + unseen]
+
+        start = time.perf_counter()
+        scores = [index.similarity(s, ["role:bench"]) for s in signatures]
+        lookup_us = (time.perf_counter() - start) / len(signatures) * 1e6
+
+        stored = index._signatures[: index._count]
+        start = time.perf_counter()
+        for signature in signatures[:50]:
+            (stored == signature).mean(axis=1).max()
+        scan_us = (time.perf_counter() - start) / 50 * 1e6
+
+        found = np.array(scores) >= index.threshold
+        added, reworded, unseen_found = found.reshape(3, LOOKUPS).mean(axis=1)
+        print(
+            f"{size:>9} {add_us:>7.0f} {lookup_us:>10.0f} {scan_us:>8.0f}"
+            f" {added:>10.1%} {reworded:>10.1%} {unseen_found:>10.1%}"
+            f" {index_megabytes(index):>6.1f}"
+        )
+
+
+def index_megabytes(index):
+    return (
+        index._signatures.nbytes
+        + index._sorted_keys.nbytes
+        + index._sorted_ids.nbytes
+        + index._buffer_keys.nbytes
+        + index._buffer_ids.nbytes
+    ) / 1e6
+
+
+def bounded_benchmark():
+    index = QuestionIndex(max_entries=BOUNDED_ENTRIES)
+    questions = synthetic_questions(CANDIDATES * 6, seed="bounded")
+    print(f"\n{CANDIDATES} candidates x 6 questions, max_entries {BOUNDED_ENTRIES}")
+    print(f"{'candidates':>10} {'questions':>10} {'scopes':>7} {'add µs':>7} {'MB':>6}")
+    start = time.perf_counter()
+    for candidate in range(CANDIDATES):
+        for text in questions[candidate * 6 : candidate * 6 + 6]:
+            index.add(text, [f"candidate:{candidate}"])
+        if (candidate + 1) % (CANDIDATES // 5) == 0:
+            stats = index.stats()
+            add_us = (time.perf_counter() - start) / ((candidate + 1) * 6) * 1e6
+            print(
+                f"{candidate + 1:>10} {stats['questions']:>10} {stats['scopes']:>7}"
+                f" {add_us:>7.0f} {index_megabytes(index):>6.1f}"
+            )
+
+
+FAVOURITES = [
+    ("Easy", "What is the difference between let and const in JavaScript?"),
+    ("Easy", "Explain the difference between let and const in JavaScript."),
+    ("Easy", "What does the virtual DOM do in React?"),
+    ("Easy", "What is the purpose of the virtual DOM in React?"),
+    ("Easy", "What is a JavaScript closure?"),
+    ("Medium", "How do you prevent unnecessary re-renders in a React app?"),
+    ("Medium", "How would you prevent unnecessary re-renders in React components?"),
+    ("Medium", "How does the Node.js event loop handle asynchronous I/O?"),
+    ("Medium", "Explain how the Node.js event loop handles asynchronous I/O."),
+    ("Medium", "How would you structure error handling in an Express API?"),
+    ("Hard", "Design a rate limiter for a public REST API."),
+    ("Hard", "How would you design a rate limiter for a public REST API?"),
+    ("Hard", "How would you scale a Node.js service to 10k concurrent websockets?"),
+    ("Hard", "Design a caching strategy for a read-heavy React and Node.js app."),
+    ("Hard", "Design a caching layer for a read-heavy React and Node.js app."),
+]
+
+
+class FavouritesModel:
+    """Full sets come from a small pool; replacements are always new"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.tokens = 0
+        self.fresh = 0
+
+    def __call__(self, prompt):
+        self.calls += 1
+        wanted = re.search(r"Generate (.+?) interview question", prompt).group(1)
+        if wanted == "exactly 6":
+            items = []
+            for difficulty in ("Easy", "Medium", "Hard"):
+                pool = [text for level, text in FAVOURITES if level == difficulty]
+                items += [(difficulty, text) for text in self.rng.sample(pool, 2)]
+        else:
+            items = []
+            for count, difficulty in re.findall(r"(\d+) (Easy|Medium|Hard)", wanted):
+                for _ in range(int(count)):
+                    self.fresh += 1
+                    topic = f"component {self.fresh} of the platform"
+                    items.append((difficulty, f"How would you test {topic}?"))
+        output = json.dumps(
+            [
+                {"question": text, "difficulty": level, "category": "Technical"}
+                for level, text in items
+            ]
+        )
+        self.tokens += (len(prompt) + len(output)) // CHARS_PER_TOKEN
+        return output
+
+
+def repeats_served(sets, threshold):
+    """Questions similar to one in the same set or an earlier session"""
+    index = QuestionIndex(threshold=threshold)
+    count = 0
+    for questions in sets:
+        _, repeats = index.dedupe(questions, ["served"])
+        count += len(repeats)
+        index.add_many(questions, ["served"])
+    return count
+
+
+def regeneration_benchmark():
+    skills = ["React", "Node.js", "JavaScript"]
+
+    def without_index(model, role):
+        prompt = build_question_prompt(role, "Mid-level", skills)
+        return json.loads(model(prompt))
+
+    def replace_offending(model, role):
+        questions = generate_question_set(
+            model, role, "Mid-level", skills, avoid=(role_scope(role),)
+        )
+        question_index.add_many(questions, [role_scope(role)])
+        return questions
+
+    def regenerate_whole_set(model, role):
+        for _ in range(FULL_SET_ATTEMPTS):
+            questions = generate_question_set(model, role, "Mid-level", skills)
+            _, repeats = question_index.dedupe(questions, [role_scope(role)])
+            if not repeats:
+                break
+        question_index.add_many(questions, [role_scope(role)])
+        return questions
+
+    print(f"\n{SESSIONS} sessions for one role, model with favourite questions")
+    print(f"{'strategy':<18} {'calls':>6} {'tokens':>8} {'repeats served':>15}")
+    for label, serve in (
+        ("no index", without_index),
+        ("replace offending", replace_offending),
+        ("regenerate set", regenerate_whole_set),
+    ):
+        model = FavouritesModel(seed=3)
+        # A role per strategy keeps their histories apart in the shared index
+        role = f"Full Stack Developer ({label})"
+        sets = [serve(model, role) for _ in range(SESSIONS)]
+        repeats = repeats_served(sets, question_index.threshold)
+        print(f"{label:<18} {model.calls:>6} {model.tokens:>8} {repeats:>15}")
+
+
+if __name__ == "__main__":
+    lookup_benchmark()
+    bounded_benchmark()
+    regeneration_benchmark()
@@ -0,0 +1,216 @@
+"""Time to first question: streamed versus blocking question generation
+
+A chunked FakeGeminiServer stands in for Gemini. It answers after
+``FIRST_CHUNK_SECONDS`` and then writes the six-question JSON array in
+32-character chunks, ``CHUNK_SECONDS`` apart. The blocking path can only use
+a question once the whole array is back. The streaming path yields each
+question as soon as its object closes. Both are measured three ways:
+
+- sync: ``generate_question_set`` versus ``stream_question_set`` over
+  ``_core`` (the Vercel handlers' model calls)
+- async: the same over ``AsyncLLMClient`` (the FastAPI app)
+- handler: the Vercel ``generate-questions`` handler over HTTP, with
+  ``?mode=stream`` read as server-sent events by the client. Each request
+  uses a new role, so every request generates a fresh set
+
+Run with: python benchmarks/bench_question_streaming.py
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import threading
+import time
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+from _stubs import API_DIR, HTTPStubModel, unthrottled_scheduler
+from fake_gemini import FakeGeminiServer
+
+import _core
+from _llm import AsyncLLMClient
+from _question_bank import (
+    agenerate_question_set,
+    astream_question_set,
+    generate_question_set,
+    stream_question_set,
+)
+
+FIRST_CHUNK_SECONDS = 0.4
+CHUNK_SECONDS = 0.04
+RUNS = 10
+ROLE, EXPERIENCE, SKILLS = "Backend Engineer", "Senior", ["Python", "PostgreSQL"]
+
+QUESTIONS = [
+    ("Easy", "What is the difference between a list and a tuple in Python?"),
+    ("Easy", "What does an index do in PostgreSQL?"),
+    ("Medium", "How would you find and fix an N+1 query in a Django view?"),
+    ("Medium", "When would you use a partial index instead of a full one?"),
+    ("Hard", "Design a job queue on PostgreSQL that survives worker crashes."),
+    ("Hard", "How would you shard a multi-tenant Python service's database?"),
+]
+
+
+def respond(prompt, generation_config=None):
+    items = [
+        {
+            "question": text,
+            "difficulty": difficulty,
+            "timeLimit": 0,
+            "category": "Backend",
+        }
+        for difficulty, text in QUESTIONS
+    ]
+    return "```json\n" + json.dumps(items, indent=2) + "\n```"
+
+
+def summarize(label, samples):
+    firsts = [first for first, _ in samples]
+    totals = [total for _, total in samples]
+    print(
+        f"{label:<18} first question p50 {statistics.median(firsts) * 1000:6.0f} ms"
+        f"  max {max(firsts) * 1000:6.0f} ms"
+        f"  all six p50 {statistics.median(totals) * 1000:6.0f} ms"
+    )
+
+
+def timed(produce):
+    """(seconds to the first question, seconds to the last) of ``produce()``"""
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in produce():
+        count += 1
+        first = first or time.perf_counter() - start
+    assert count == 6, count
+    return first, time.perf_counter() - start
+
+
+async def atimed(produce):
+    start = time.perf_counter()
+    first = None
+    count = 0
+    async for _ in produce():
+        count += 1
+        first = first or time.perf_counter() - start
+    assert count == 6, count
+    return first, time.perf_counter() - start
+
+
+def sync_benchmark():
+    blocking = [
+        timed(
+            lambda: generate_question_set(_core.generate, ROLE, EXPERIENCE, SKILLS)
+        )
+        for _ in range(RUNS)
+    ]
+    streaming = [
+        timed(
+            lambda: stream_question_set(
+                _core.generate_stream, _core.generate, ROLE, EXPERIENCE, SKILLS
+            )
+        )
+        for _ in range(RUNS)
+    ]
+    summarize("sync blocking", blocking)
+    summarize("sync streaming", streaming)
+
+
+def async_benchmark(url):
+    llm = AsyncLLMClient(
+        lambda model_name: HTTPStubModel(url, model_name),
+        "fake-gemini",
+        scheduler=unthrottled_scheduler(),
+    )
+
+    async def blocking():
+        start = time.perf_counter()
+        questions = await agenerate_question_set(
+            llm.generate, ROLE, EXPERIENCE, SKILLS
+        )
+        assert len(questions) == 6
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed
+
+    async def main():
+        blocking_samples = [await blocking() for _ in range(RUNS)]
+        streaming_samples = [
+            await atimed(
+                lambda: astream_question_set(
+                    llm.stream, llm.generate, ROLE, EXPERIENCE, SKILLS
+                )
+            )
+            for _ in range(RUNS)
+        ]
+        summarize("async blocking", blocking_samples)
+        summarize("async streaming", streaming_samples)
+
+    asyncio.run(main())
+
+
+def load_handler():
+    path = os.path.join(API_DIR, "generate-questions.py")
+    spec = importlib.util.spec_from_file_location("generate_questions", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.handler.log_message = lambda *args: None
+    return module.handler
+
+
+def handler_benchmark():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), load_handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/generate-questions"
+
+    def post(query, run):
+        body = {"role": f"{ROLE} {query} {run}", "skills": SKILLS}
+        return urllib.request.urlopen(
+            urllib.request.Request(
+                url + query,
+                data=json.dumps(body).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+            ),
+            timeout=60,
+        )
+
+    def blocking(run):
+        start = time.perf_counter()
+        with post("", run) as response:
+            questions = json.loads(response.read())["questions"]
+        assert len(questions) == 6
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed
+
+    def streaming(run):
+        start = time.perf_counter()
+        first = None
+        with post("?mode=stream", run) as response:
+            for line in response:
+                if line.startswith(b"event: question"):
+                    first = first or time.perf_counter() - start
+                elif line.startswith(b"event: done"):
+                    break
+        return first, time.perf_counter() - start
+
+    summarize("handler blocking", [blocking(run) for run in range(RUNS)])
+    summarize("handler streaming", [streaming(run) for run in range(RUNS)])
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    with FakeGeminiServer(
+        respond, latency=FIRST_CHUNK_SECONDS, chunk_latency=CHUNK_SECONDS
+    ) as gemini:
+        _core.model_factory = lambda model_name: HTTPStubModel(gemini.url, model_name)
+        size = len(respond(""))
+        print(
+            f"output {size} characters in {-(-size // gemini.chunk_chars)} chunks:"
+            f" first after {FIRST_CHUNK_SECONDS * 1000:.0f} ms,"
+            f" then one every {CHUNK_SECONDS * 1000:.0f} ms"
+        )
+        sync_benchmark()
+        async_benchmark(gemini.url)
+        handler_benchmark()
@@ -0,0 +1,65 @@
+"""Contact prompt size before and after section-aware compaction
+
+Runs the multi-page resumes in fixtures/long_resumes.json through the same
+page assembly as PDF extraction (``LazyText``, which drops repeated page
+headers and footers) and ``compact_resume``. For each document it reports
+the tokens the contact prompt used to carry (the raw page text) against the
+compacted text, checks that the expected name, email and phone survived,
+and times the preprocessing.
+
+Run with: python benchmarks/bench_resume_compaction.py
+"""
+
+import json
+import os
+import time
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _extraction import LazyText
+from _resume_text import RESUME_TOKEN_BUDGET, compact_resume, count_tokens
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "long_resumes.json")
+ROUNDS = 200
+
+
+def main():
+    with open(FIXTURES, encoding="utf-8") as fixture:
+        documents = json.load(fixture)
+
+    print(f"token budget {RESUME_TOKEN_BUDGET}")
+    print(
+        f"{'document':<22} {'pages':>5} {'raw':>6} {'sent':>6} {'saved':>7}"
+        f" {'µs':>7}  fields kept"
+    )
+    total_raw = total_sent = 0
+    for document in documents:
+        pages = document["pages"]
+        raw = "\n".join(pages) + "\n"
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            compacted = compact_resume(LazyText(pages).full(), "contact")
+        micros = (time.perf_counter() - start) / ROUNDS * 1e6
+
+        kept = [
+            field
+            for field, value in document["expected"].items()
+            if value.lower() in compacted.lower()
+        ]
+        raw_tokens, sent_tokens = count_tokens(raw), count_tokens(compacted)
+        total_raw += raw_tokens
+        total_sent += sent_tokens
+        print(
+            f"{document['name']:<22} {len(pages):>5} {raw_tokens:>6} {sent_tokens:>6}"
+            f" {1 - sent_tokens / raw_tokens:>7.0%} {micros:>7.0f}"
+            f"  {len(kept)}/{len(document['expected'])}"
+        )
+    print(
+        f"{'total':<22} {'':>5} {total_raw:>6} {total_sent:>6}"
+        f" {1 - total_sent / total_raw:>7.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
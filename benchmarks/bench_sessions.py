@@ -0,0 +1,143 @@
+"""Incremental session scoring: completing an interview in the FastAPI app
+
+Drives ``/sessions`` through the app's route functions with a stub model,
+on both session stores. Answers are submitted one by one with a pause for
+the candidate's next answer, so each is scored in the background, and
+``/sessions/{id}/complete`` only has to assemble the result. For contrast,
+the same answers are also submitted right before completing, which leaves
+completion waiting on the scoring still in flight, and a session whose last
+question goes unanswered is completed too.
+
+Exits non-zero when a completion fails or scores the wrong answers, or when
+completing the same session again does not reuse every stored evaluation,
+the unanswered question's included.
+
+Run with: python benchmarks/bench_sessions.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from _stubs import StubModel, unthrottled_scheduler
+
+import main
+import _sessions
+from _llm import AsyncLLMClient
+from _models import Question, SessionAnswerRequest, SessionCreateRequest
+
+MODEL_LATENCY = 0.3
+THINK_SECONDS = 0.5
+SESSIONS = 5
+
+QUESTIONS = [
+    ("Easy", "What is the difference between let and const in JavaScript?"),
+    ("Easy", "What does the virtual DOM do in React?"),
+    ("Medium", "How do you prevent unnecessary re-renders in a React app?"),
+    ("Medium", "How does the Node.js event loop handle asynchronous I/O?"),
+    ("Hard", "Design a rate limiter for a public REST API."),
+    ("Hard", "Design a caching strategy for a read-heavy React and Node.js app."),
+]
+
+
+def respond(prompt, generation_config=None):
+    return json.dumps(
+        {
+            "score": 7,
+            "feedback": "Solid answer.",
+            "suggestions": "Add an example.",
+            "strengths": ["Clear structure"],
+            "improvements": ["More depth"],
+        }
+    )
+
+
+def questions():
+    return [
+        Question(question=text, difficulty=level, timeLimit=60, category="Web")
+        for level, text in QUESTIONS
+    ]
+
+
+def answer(run, index):
+    # Distinct, substantial answers, so neither the cache nor triage settles them
+    return (
+        f"In {_sessions.SESSION_STORE} session {run} I would approach question"
+        f" {index} by first measuring where the time goes, then changing the"
+        " design step by step and checking each change against the numbers"
+        " before moving on to the next one."
+    )
+
+
+async def complete_session(run, think_seconds, answered=len(QUESTIONS)):
+    """Seconds from the completion request to its response"""
+    created = await main.create_session(SessionCreateRequest(questions=questions()))
+    session_id = created["sessionId"]
+    for index in range(answered):
+        await main.submit_session_answer(
+            session_id, SessionAnswerRequest(index=index, answer=answer(run, index))
+        )
+        # The candidate reads and answers the next question meanwhile
+        await asyncio.sleep(think_seconds)
+    start = time.perf_counter()
+    result = await main.complete_session(session_id)
+    seconds = time.perf_counter() - start
+
+    scores = [evaluation["score"] for evaluation in result["evaluations"]]
+    expected = [7] * answered + [0] * (len(QUESTIONS) - answered)
+    if not result["success"] or scores != expected:
+        sys.exit(f"completion returned {result}")
+
+    again = await main.complete_session(session_id)
+    if again["precomputed"] != len(QUESTIONS):
+        sys.exit(f"completing again rescored answers: {again}")
+    return seconds, result["precomputed"]
+
+
+async def run_benchmark():
+    print(
+        f"{'store':<7} {'answers submitted':<24} {'complete ms':>12}"
+        f" {'precomputed':>12}"
+    )
+    run = 0
+    for label, think_seconds, answered in (
+        ("during the interview", THINK_SECONDS, len(QUESTIONS)),
+        ("just before completing", 0, len(QUESTIONS)),
+        ("all but the last", THINK_SECONDS, len(QUESTIONS) - 1),
+    ):
+        samples = []
+        for _ in range(SESSIONS):
+            run += 1
+            samples.append(await complete_session(run, think_seconds, answered))
+        seconds = sum(sample[0] for sample in samples) / len(samples)
+        precomputed = sum(sample[1] for sample in samples) / len(samples)
+        print(
+            f"{_sessions.SESSION_STORE:<7} {label:<24} {seconds * 1000:>12.0f}"
+            f" {precomputed:>12.1f}"
+        )
+
+
+def main_benchmark():
+    main.llm = AsyncLLMClient(
+        lambda model_name: StubModel(respond, MODEL_LATENCY),
+        "stub",
+        scheduler=unthrottled_scheduler(),
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for backend, store in (
+            ("memory", _sessions.MemorySessionStore()),
+            (
+                "sqlite",
+                _sessions.SQLiteSessionStore(os.path.join(directory, "sessions.db")),
+            ),
+        ):
+            _sessions.SESSION_STORE = backend
+            _sessions._store = store
+            asyncio.run(run_benchmark())
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,112 @@
+"""Skill extraction: Aho-Corasick token index versus naive per-term loops
+
+Matches the fixture resumes against the built-in taxonomy and against
+taxonomies padded with synthetic product names to thousands of terms.
+Compares three approaches per resume:
+
+- index: ``SkillIndex``, one pass over the resume's tokens
+- substring: ``term in text`` for every term (fast in C, but "java" matches
+  "javascript" and "go" matches "good")
+- regex: a whole-word regular expression per term, which is correct but
+  scans the resume once per term
+
+Reports build time, mean microseconds per resume and how many extra skills
+the substring loop reports that whole-word matching rejects.
+
+Run with: python benchmarks/bench_skill_index.py
+"""
+
+import json
+import os
+import random
+import re
+import time
+
+import _stubs  # noqa: F401  (puts api/ on sys.path)
+
+from _skill_taxonomy import ALIAS_ONLY, SKILL_TAXONOMY
+from _skills import SkillIndex, tokenize
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "long_resumes.json")
+SIZES = (0, 1000, 5000, 20000)
+ROUNDS = 20
+
+
+def padded_taxonomy(extra_terms):
+    """Built-in taxonomy plus synthetic multi-word product names"""
+    rng = random.Random(extra_terms)
+    syllables = ["ar", "bo", "cy", "da", "el", "fu", "gri", "hex", "io", "jet"]
+    taxonomy = dict(SKILL_TAXONOMY)
+    while len(taxonomy) < len(SKILL_TAXONOMY) + extra_terms:
+        words = [
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        taxonomy[" ".join(words).title()] = ()
+    return taxonomy
+
+
+def terms_of(taxonomy):
+    terms = []
+    for skill, aliases in taxonomy.items():
+        names = list(aliases) + ([] if skill in ALIAS_ONLY else [skill])
+        terms += [(" ".join(tokenize(name)), skill) for name in names]
+    return terms
+
+
+def substring_loop(terms, text):
+    lowered = text.lower()
+    return {skill for term, skill in terms if term in lowered}
+
+
+def compile_regexes(terms):
+    return [
+        (re.compile(r"(?<![\w.])" + re.escape(term) + r"(?![\w+#])"), skill)
+        for term, skill in terms
+    ]
+
+
+def regex_loop(patterns, text):
+    lowered = " ".join(tokenize(text))
+    return {skill for pattern, skill in patterns if pattern.search(lowered)}
+
+
+def timed(function, texts, rounds=ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [function(text) for text in texts]
+    return (time.perf_counter() - start) / rounds / len(texts) * 1e6, results
+
+
+def main():
+    with open(FIXTURES, encoding="utf-8") as fixture:
+        texts = ["\n".join(document["pages"]) for document in json.load(fixture)]
+    print(
+        f"{len(texts)} resumes, mean {sum(map(len, texts)) // len(texts)} characters"
+    )
+    print(
+        f"{'terms':>6} {'build ms':>9} {'index µs':>9} {'substring µs':>13}"
+        f" {'regex µs':>9}  substring false positives"
+    )
+    for extra in SIZES:
+        taxonomy = padded_taxonomy(extra)
+        start = time.perf_counter()
+        index = SkillIndex(taxonomy, ALIAS_ONLY)
+        build_ms = (time.perf_counter() - start) * 1000
+        terms = terms_of(taxonomy)
+        patterns = compile_regexes(terms)
+
+        index_us, found = timed(lambda text: set(index.extract(text)), texts)
+        substring_us, loose = timed(lambda text: substring_loop(terms, text), texts)
+        # One round is plenty for the slowest approach
+        regex_us, strict = timed(lambda text: regex_loop(patterns, text), texts, 1)
+        assert found == strict, "index and whole-word regexes disagree"
+        false_positives = sum(len(a - b) for a, b in zip(loose, strict))
+        print(
+            f"{index.terms:>6} {build_ms:>9.1f} {index_us:>9.0f} {substring_us:>13.0f}"
+            f" {regex_us:>9.0f}  {false_positives}"
+        )
+
+
+if __name__ == "__main__":
+    main()
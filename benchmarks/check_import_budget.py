@@ -0,0 +1,98 @@
+"""Fail when importing the FastAPI app gets slower than its budget
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and
+sums the cumulative time of every top-level import that a bare interpreter
+does not already pay for. Exits non-zero when the total exceeds the budget,
+or when a module that must stay lazy (document parsers, the Gemini SDK) is
+imported at all, and prints the slowest imports either way.
+
+Run with: python benchmarks/check_import_budget.py [--module main] [--budget-ms 900]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+API_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+)
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "900"))
+# Loaded only by the code paths that need them
+FORBIDDEN_MODULES = (
+    "google.generativeai",
+    "PyPDF2",
+    "docx",
+    "multiprocessing",
+    "numpy",
+)
+
+
+def import_times(statement: str) -> list:
+    """(module, self_us, cumulative_us, depth) per line of -X importtime output"""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.pop("GEMINI_API_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        cwd=API_DIR,
+        env=env,
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:]
+        raise SystemExit(f"`{statement}` failed: {''.join(tail)}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        # One separator space, then two spaces of indent per nesting level
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    baseline = {name for name, *_ in import_times("pass")}
+    entries = [
+        entry
+        for entry in import_times(f"import {args.module}")
+        if entry[0] not in baseline
+    ]
+    # Top-level entries are the shallowest ones; their cumulative times nest
+    # every import below them
+    top_depth = min(depth for *_, depth in entries)
+    total_ms = sum(cum for _, _, cum, depth in entries if depth == top_depth) / 1000
+    loaded = {name for name, *_ in entries}
+    forbidden = [name for name in FORBIDDEN_MODULES if name in loaded]
+
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print("slowest imports by self time:")
+    for name, self_us, cumulative_us, _ in sorted(entries, key=lambda e: -e[1])[:10]:
+        print(
+            f"  {name:<40} self {self_us / 1000:7.1f} ms"
+            f"  cumulative {cumulative_us / 1000:7.1f} ms"
+        )
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if forbidden:
+        print(f"FAIL: imported eagerly: {', '.join(forbidden)}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
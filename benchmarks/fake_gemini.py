@@ -0,0 +1,126 @@
+"""Local fake of the Gemini generateContent REST endpoint
+
+Serves ``POST /v1beta/models/<model>:generateContent`` with a configurable
+latency so the benchmarks can exercise real network round-trips without an
+API key. ``latency`` is either seconds or a function of the model name
+returning seconds, for latency distributions that differ per model.
+``fail`` can inject errors: it is called with the request number and
+returns None to answer normally, or an HTTP status to fail with (429s carry
+``retry_after`` as a ``Retry-After`` header when it is set).
+
+``latency`` is the time to the first output. The output itself is written
+in ``chunk_chars`` pieces taking ``chunk_latency`` each, which
+``:streamGenerateContent?alt=sse`` sends as server-sent events as they are
+ready and ``:generateContent`` sends together after the last one.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def candidate(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+class FakeGeminiServer:
+    def __init__(
+        self,
+        respond,
+        latency=0.2,
+        port=0,
+        fail=None,
+        retry_after=None,
+        chunk_chars=32,
+        chunk_latency=0.0,
+    ):
+        self.respond = respond
+        self.latency = latency
+        self.chunk_chars = chunk_chars
+        self.chunk_latency = chunk_latency
+        self.fail = fail
+        self.retry_after = retry_after
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                prompt = body["contents"][0]["parts"][0]["text"]
+                with server._lock:
+                    server.requests += 1
+                    number = server.requests
+                status = server.fail(number) if server.fail else None
+                if status is not None:
+                    with server._lock:
+                        server.errors += 1
+                    self.send_error_status(status)
+                    return
+                latency = server.latency
+                if callable(latency):
+                    model_name = self.path.rsplit("/", 1)[-1].split(":")[0]
+                    latency = latency(model_name)
+                time.sleep(latency)
+
+                text = server.respond(prompt, body.get("generationConfig"))
+                size = server.chunk_chars
+                chunks = [text[i : i + size] for i in range(0, len(text), size)]
+                if ":streamGenerateContent" in self.path:
+                    self.send_stream(chunks)
+                    return
+                time.sleep(len(chunks) * server.chunk_latency)
+                data = json.dumps(candidate(text)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_stream(self, chunks):
+                # No Content-Length: the response ends when the connection closes
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for chunk in chunks:
+                    time.sleep(server.chunk_latency)
+                    event = f"data: {json.dumps(candidate(chunk))}\r\n\r\n"
+                    self.wfile.write(event.encode("utf-8"))
+                    self.wfile.flush()
+                self.close_connection = True
+
+            def send_error_status(self, status):
+                data = json.dumps({"error": {"code": status}}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429 and server.retry_after is not None:
+                    self.send_header("Retry-After", str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.handle_error = self._handle_error
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def _handle_error(self, request, client_address):
+        # A client going away mid-response (a stopped load test server) is
+        # expected; anything else is reported as usual
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            ThreadingHTTPServer.handle_error(self._httpd, request, client_address)
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,638 @@
+"""Load test of the API endpoints against a deterministic fake Gemini
+
+Drives ``/parse-resume``, ``/generate-questions`` and ``/evaluate-answers``
+on both the Vercel handlers and the FastAPI app. Every (target, endpoint)
+scenario starts its server in a fresh child process whose model calls go
+to a ``FakeGeminiServer`` in this process, which answers with:
+
+- a lognormal time to first output: ``--latency-ms`` median, spread by
+  ``--latency-sigma`` (0 for a fixed latency)
+- injected errors: ``--error-rate`` of the model calls fail with one of
+  ``--error-statuses``, decided by the seeded call number so a rerun fails
+  the same calls
+- canned outputs per prompt: contact details, question sets and
+  replacements, batch and per-answer evaluations
+
+A fifth of the uploaded resumes lack a name line, so contact extraction
+consults the model for them. Question requests cycle through ``--roles``
+roles, so after the first few the question pool serves most of them.
+
+Reports throughput, p50/p95/p99 latency, status counts, model calls, and
+the server's CPU milliseconds (extraction workers included) and resident
+memory growth per request. Results are written as JSON, by default to
+``benchmarks/results/<commit>.json``; ``--compare`` prints each scenario's
+change against an earlier results file.
+
+The FastAPI target needs fastapi, python-multipart and uvicorn, and its
+``/parse-resume`` needs python-docx for the DOCX uploads; scenarios whose
+server cannot start are reported as skipped.
+
+Run with: python benchmarks/load_test.py [--requests 200] [--concurrency 8]
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_gemini import FakeGeminiServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+TARGETS = ("vercel", "fastapi")
+ENDPOINTS = ("parse-resume", "generate-questions", "evaluate-answers")
+# Share of resumes without a name line, whose contact details need the model
+MODEL_CONTACT_SHARE = 0.2
+ROLES = (
+    "Full Stack Developer",
+    "Backend Engineer",
+    "Frontend Engineer",
+    "Data Engineer",
+    "DevOps Engineer",
+    "Mobile Developer",
+    "Machine Learning Engineer",
+    "Site Reliability Engineer",
+)
+QUESTIONS = [
+    ("Easy", "Frontend", "What is the virtual DOM?"),
+    ("Easy", "JavaScript", "What is the difference between let and const?"),
+    ("Medium", "Backend", "How does the Node.js event loop handle I/O?"),
+    ("Medium", "Frontend", "How do you avoid unnecessary React re-renders?"),
+    ("Hard", "System Design", "Design a rate limiter for a public API."),
+    ("Hard", "Backend", "How would you shard a multi-tenant database?"),
+]
+
+
+class CannedGemini:
+    """Model outputs by prompt type, varied per call so no two sets repeat"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.calls = 0
+        self._lock = threading.Lock()
+        rng = random.Random(seed)
+        syllables = ["ka", "lo", "mi", "nu", "pe", "ra", "si", "to", "vu", "ze"]
+        self.vocabulary = [
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+            for _ in range(3000)
+        ]
+
+    def __call__(self, prompt, generation_config=None):
+        with self._lock:
+            self.calls += 1
+            rng = random.Random(f"{self.seed}:{self.calls}")
+        if "### Document" in prompt:
+            documents = re.findall(r"### Document (\d+)", prompt)
+            return json.dumps([self.contact(int(n)) for n in documents])
+        if "contact information" in prompt:
+            return json.dumps(self.contact())
+        if "individualScores" in prompt:
+            count = len(re.findall(r"\(questionIndex \d+\)", prompt))
+            return json.dumps(
+                {
+                    "overallScore": 7,
+                    "recommendation": "Consider",
+                    "summary": "Solid fundamentals with some gaps in depth.",
+                    "individualScores": [
+                        {"questionIndex": index, **self.evaluation(rng)}
+                        for index in range(count)
+                    ],
+                    "strengths": ["Clear communication"],
+                    "improvements": ["More production examples"],
+                }
+            )
+        if "evaluating one answer" in prompt:
+            return json.dumps(self.evaluation(rng))
+        if "interview question" in prompt:
+            return "```json\n" + json.dumps(self.questions(prompt, rng)) + "\n```"
+        return "{}"
+
+    def contact(self, document=None):
+        contact = {
+            "name": "Sam Lee",
+            "email": None,
+            "phone": None,
+            "confidence": {"name": 0.9, "email": 0.0, "phone": 0.0},
+        }
+        return contact if document is None else {"document": document, **contact}
+
+    def evaluation(self, rng):
+        return {
+            "score": rng.randint(3, 9),
+            "feedback": "Covers the main idea but misses edge cases.",
+            "suggestions": "Walk through a concrete example.",
+            "strengths": ["Correct core concept"],
+            "improvements": ["Discuss trade-offs"],
+        }
+
+    def questions(self, prompt, rng):
+        wanted = re.search(r"Generate (.+?) interview question", prompt).group(1)
+        if wanted == "exactly 6":
+            counts = [(2, level) for level in ("Easy", "Medium", "Hard")]
+        else:
+            counts = re.findall(r"(\d+) (\w+)", wanted)
+        return [
+            {
+                "question": "How would you "
+                + " ".join(rng.sample(self.vocabulary, 6))
+                + "?",
+                "difficulty": level,
+                "timeLimit": 0,
+                "category": "Technical",
+            }
+            for count, level in counts
+            for _ in range(int(count))
+        ]
+
+
+def lognormal_latency(median_ms, sigma, seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def latency(model_name):
+        with lock:
+            return median_ms / 1000 * math.exp(sigma * rng.gauss(0, 1))
+
+    return latency
+
+
+def injected_errors(rate, statuses, seed):
+    def fail(number):
+        rng = random.Random(f"{seed}:fail:{number}")
+        return rng.choice(statuses) if rng.random() < rate else None
+
+    return fail
+
+
+def resume_text(number) -> str:
+    """A short resume, unique per request so the resume cache never answers"""
+    needs_model = random.Random(number).random() < MODEL_CONTACT_SHARE
+    # No name line and an unlabelled phone, so the model is consulted
+    header = [] if needs_model else ["Jordan Avery", "Senior Software Engineer"]
+    return "\n".join(
+        header
+        + [
+            f"Contact: candidate{number}@example.com / 555{number:07d}",
+            "",
+            "Experience",
+            f"Engineer at Example Corp #{number}: built React and Node.js services,",
+            "ran PostgreSQL on AWS with Docker and Kubernetes.",
+            "",
+            "Skills: Python, TypeScript, React, Node.js, PostgreSQL, AWS",
+        ]
+    )
+
+
+def docx_bytes(text: str) -> bytes:
+    """The smallest DOCX python-docx opens: one paragraph per line"""
+    paragraphs = "".join(
+        f"<w:p><w:r><w:t xml:space=\"preserve\">{line}</w:t></w:r></w:p>"
+        for line in text.replace("&", "&amp;").replace("<", "&lt;").splitlines()
+    )
+    word = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    package = "http://schemas.openxmlformats.org/package/2006"
+    office = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "[Content_Types].xml",
+            f'<Types xmlns="{package}/content-types">'
+            '<Default Extension="rels" ContentType='
+            '"application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>",
+        )
+        archive.writestr(
+            "_rels/.rels",
+            f'<Relationships xmlns="{package}/relationships">'
+            f'<Relationship Id="rId1" Type="{office}/officeDocument"'
+            ' Target="word/document.xml"/></Relationships>',
+        )
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{word}"><w:body>{paragraphs}</w:body></w:document>',
+        )
+    return buffer.getvalue()
+
+
+def multipart(field: str, filename: str, content: bytes):
+    boundary = "loadtestboundary7MA4YWxkTrZu0gW"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\";"
+        f" filename=\"{filename}\"\r\nContent-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def build_request(target, endpoint, number, args):
+    """(path, body, content type) of request ``number``"""
+    prefix = "/api" if target == "vercel" else ""
+    if endpoint == "parse-resume":
+        text = resume_text(number)
+        if target == "vercel" and args.resume_format == "text":
+            return f"{prefix}/parse-resume", text.encode(), "text/plain"
+        body, content_type = multipart("resume", "resume.docx", docx_bytes(text))
+        return f"{prefix}/parse-resume", body, content_type
+
+    if endpoint == "generate-questions":
+        body = {
+            "role": ROLES[number % args.roles],
+            "experience": "Mid-level",
+            "skills": ["React", "Node.js", "PostgreSQL"],
+            "candidateId": f"candidate-{number}",
+        }
+    else:
+        questions = [
+            {"question": text, "difficulty": level, "timeLimit": 60, "category": kind}
+            for level, kind, text in QUESTIONS
+        ]
+        answers = [
+            f"Answer {number}.{index}: it depends on the workload, so I would"
+            " measure first and then pick the simpler option."
+            for index in range(len(questions))
+        ]
+        if target == "vercel":
+            answers = [{"answer": answer, "timeTaken": 45} for answer in answers]
+        body = {"questions": questions, "answers": answers}
+    return f"{prefix}/{endpoint}", json.dumps(body).encode(), "application/json"
+
+
+def send(base_url, request, timeout):
+    """(seconds, status) of one request; status "error" when none came back"""
+    path, body, content_type = request
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(
+            urllib.request.Request(
+                base_url + path, data=body, headers={"Content-Type": content_type}
+            ),
+            timeout=timeout,
+        ) as response:
+            response.read()
+            status = str(response.status)
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = str(e.code)
+    except (OSError, urllib.error.URLError):
+        status = "error"
+    return time.perf_counter() - started, status
+
+
+def worker_cpu_seconds() -> float:
+    """CPU time of this process's live children, e.g. the extraction pool
+
+    Read from /proc, so 0 where there is none.
+    """
+    total = 0.0
+    try:
+        pids = [name for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return total
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as stat:
+                # Fields after the parenthesised command name
+                fields = stat.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == os.getpid():
+            total += (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return total
+
+
+def process_stats() -> dict:
+    """CPU time, its worker processes' included, and memory of this process"""
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_kb = usage.ru_maxrss / (1024 if sys.platform == "darwin" else 1)
+    try:
+        with open("/proc/self/statm") as statm:
+            rss_kb = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except OSError:
+        rss_kb = peak_kb
+    return {
+        "cpuSeconds": usage.ru_utime + usage.ru_stime + worker_cpu_seconds(),
+        "rssKb": rss_kb,
+        "peakRssKb": peak_kb,
+    }
+
+
+def serve(target, endpoint, gemini_url):
+    """Child process: serve one endpoint, answer "stats" lines on stdin"""
+    # Handler logging goes to stderr so stdout only carries replies
+    replies, sys.stdout = sys.stdout, sys.stderr
+    from _stubs import API_DIR, HTTPStubModel
+
+    import _core
+
+    _core.model_factory = lambda model_name: HTTPStubModel(gemini_url, model_name)
+    if target == "vercel":
+        import importlib.util
+        from http.server import ThreadingHTTPServer
+
+        path = os.path.join(API_DIR, f"{endpoint}.py")
+        spec = importlib.util.spec_from_file_location(endpoint.replace("-", "_"), path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.handler.log_message = lambda *args: None
+        server = ThreadingHTTPServer(("127.0.0.1", 0), module.handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+    else:
+        import socket
+
+        import uvicorn
+
+        import main
+
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+        server = uvicorn.Server(
+            uvicorn.Config(main.app, log_level="warning", access_log=False)
+        )
+        thread = threading.Thread(
+            target=server.run, kwargs={"sockets": [listener]}, daemon=True
+        )
+        thread.start()
+        while not server.started:
+            if not thread.is_alive():
+                raise SystemExit("uvicorn did not start")
+            time.sleep(0.01)
+
+    print(json.dumps({"port": port}), file=replies, flush=True)
+    for _ in sys.stdin:
+        print(json.dumps(process_stats()), file=replies, flush=True)
+
+
+class Scenario:
+    """One endpoint of one target, served by its own child process"""
+
+    def __init__(self, target, endpoint, gemini, args):
+        self.target = target
+        self.endpoint = endpoint
+        env = {
+            **os.environ,
+            "CACHE_BACKEND": "memory",
+            "TRACE_LOG": "0",
+            # The quota is not under test
+            "LLM_RPM": str(args.llm_rpm),
+            "LLM_TPM": str(args.llm_rpm * 10000),
+        }
+        # A file rather than a pipe, so a chatty server never blocks on it
+        self.log = tempfile.TemporaryFile("w+")
+        self.child = subprocess.Popen(
+            [sys.executable, __file__, "--serve", target, endpoint, gemini.url],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.log,
+            text=True,
+            cwd=BENCH_DIR,
+            env=env,
+        )
+        line = self.child.stdout.readline()
+        if not line:
+            self.child.wait()
+            self.log.seek(0)
+            stderr = self.log.read().strip().splitlines()
+            self.skipped = stderr[-1] if stderr else "server did not start"
+            self.log.close()
+            return
+        self.skipped = None
+        self.url = f"http://127.0.0.1:{json.loads(line)['port']}"
+
+    def stats(self) -> dict:
+        self.child.stdin.write("stats\n")
+        self.child.stdin.flush()
+        return json.loads(self.child.stdout.readline())
+
+    def close(self):
+        if self.child.poll() is None:
+            self.child.stdin.close()
+            try:
+                self.child.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.child.kill()
+        self.log.close()
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_scenario(target, endpoint, gemini, args) -> dict:
+    result = {"target": target, "endpoint": endpoint}
+    scenario = Scenario(target, endpoint, gemini, args)
+    if scenario.skipped:
+        return {**result, "skipped": scenario.skipped}
+    try:
+        requests = [
+            build_request(target, endpoint, number, args)
+            for number in range(args.warmup + args.requests)
+        ]
+        for request in requests[: args.warmup]:
+            send(scenario.url, request, args.timeout)
+
+        before = scenario.stats()
+        calls, errors = gemini.requests, gemini.errors
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            samples = list(
+                executor.map(
+                    lambda request: send(scenario.url, request, args.timeout),
+                    requests[args.warmup :],
+                )
+            )
+        seconds = time.perf_counter() - started
+        after = scenario.stats()
+    finally:
+        scenario.close()
+
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    statuses = {}
+    for _, status in samples:
+        statuses[status] = statuses.get(status, 0) + 1
+    ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+    count = len(samples)
+    return {
+        **result,
+        "requests": count,
+        "concurrency": args.concurrency,
+        "seconds": round(seconds, 3),
+        "throughput": round(count / seconds, 2),
+        "latencyMs": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2),
+        },
+        "statuses": dict(sorted(statuses.items())),
+        "successRate": round(ok / count, 4),
+        "cpuMsPerRequest": round(
+            (after["cpuSeconds"] - before["cpuSeconds"]) * 1000 / count, 3
+        ),
+        "rssGrowthKbPerRequest": round((after["rssKb"] - before["rssKb"]) / count, 2),
+        "peakRssMb": round(after["peakRssKb"] / 1024, 1),
+        "modelCallsPerRequest": round((gemini.requests - calls) / count, 3),
+        "modelErrorsInjected": gemini.errors - errors,
+    }
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=BENCH_DIR,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_header():
+    print(
+        f"{'target':<8} {'endpoint':<19} {'req/s':>7} {'p50 ms':>7} {'p95 ms':>7}"
+        f" {'p99 ms':>7} {'ok':>6} {'cpu ms':>7} {'rss KB':>7} {'calls':>6}"
+    )
+
+
+def print_row(result):
+    """One scenario: per-request CPU, RSS growth and model calls at the end"""
+    label = f"{result['target']:<8} {result['endpoint']:<19}"
+    if "skipped" in result:
+        print(f"{label} skipped: {result['skipped']}")
+        return
+    latency = result["latencyMs"]
+    print(
+        f"{label} {result['throughput']:>7.1f} {latency['p50']:>7.0f}"
+        f" {latency['p95']:>7.0f} {latency['p99']:>7.0f}"
+        f" {result['successRate']:>6.1%} {result['cpuMsPerRequest']:>7.2f}"
+        f" {result['rssGrowthKbPerRequest']:>7.1f}"
+        f" {result['modelCallsPerRequest']:>6.2f}"
+    )
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    earlier = {
+        (result["target"], result["endpoint"]): result
+        for result in baseline["results"]
+        if "skipped" not in result
+    }
+    print(f"\nchange against {baseline.get('commit')} ({baseline_path})")
+    print(
+        f"{'target':<8} {'endpoint':<19} {'req/s':>8} {'p50':>8} {'p95':>8}"
+        f" {'p99':>8} {'cpu':>8}"
+    )
+
+    def change(new, old):
+        return f"{(new - old) / old:+8.1%}" if old else f"{'n/a':>8}"
+
+    for result in results:
+        old = earlier.get((result["target"], result["endpoint"]))
+        if old is None or "skipped" in result:
+            continue
+        print(
+            f"{result['target']:<8} {result['endpoint']:<19}"
+            f" {change(result['throughput'], old['throughput'])}"
+            + "".join(
+                f" {change(result['latencyMs'][p], old['latencyMs'][p])}"
+                for p in ("p50", "p95", "p99")
+            )
+            + f" {change(result['cpuMsPerRequest'], old['cpuMsPerRequest'])}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument(
+        "--error-statuses", type=int, nargs="+", default=[429, 500, 503]
+    )
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--roles", type=int, default=4, choices=range(1, 9))
+    parser.add_argument(
+        "--resume-format",
+        choices=("docx", "text"),
+        default="docx",
+        help="upload for the Vercel handler; FastAPI only accepts DOCX/PDF",
+    )
+    parser.add_argument("--llm-rpm", type=float, default=1e6)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="results file (default results/<commit>)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--serve", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(*args.serve)
+        return
+
+    with FakeGeminiServer(
+        CannedGemini(args.seed),
+        latency=lognormal_latency(args.latency_ms, args.latency_sigma, args.seed),
+        fail=injected_errors(args.error_rate, args.error_statuses, args.seed),
+        retry_after=args.retry_after,
+    ) as gemini:
+        print_header()
+        results = []
+        for target in args.targets:
+            for endpoint in args.endpoints:
+                results.append(run_scenario(target, endpoint, gemini, args))
+                print_row(results[-1])
+
+    report = {
+        "commit": commit(),
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("output", "compare", "serve")
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nresults written to {output}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
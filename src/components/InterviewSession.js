@@ -18,6 +18,7 @@ import { addCompletedInterview } from '../store/slices/dashboardSlice'
 export default function InterviewSession() {
   const { 
     questions, 
+    totalQuestions,
     currentQuestionIndex, 
     answers, 
     timeRemaining, 
@@ -25,7 +26,8 @@ export default function InterviewSession() {
     candidateInfo,
     sessionId,
     startTime,
-    loading
+    loading,
+    error
   } = useSelector((state) => state.interview)
   
   const dispatch = useDispatch()
@@ -35,7 +37,7 @@ export default function InterviewSession() {
   const questionStartTime = useRef(Date.now())
 
   const currentQuestion = questions[currentQuestionIndex]
-  const isLastQuestion = currentQuestionIndex === questions.length - 1
+  const isLastQuestion = currentQuestionIndex === totalQuestions - 1
 
   const evaluateInterview = async () => {
     dispatch(setSubmissionLoading(true))
@@ -134,6 +136,13 @@ export default function InterviewSession() {
     }
   }, [currentQuestionIndex, currentQuestion, dispatch])
 
+  // Question generation stopped early and every question that arrived is done
+  useEffect(() => {
+    if (!currentQuestion && totalQuestions > 0 && currentQuestionIndex >= totalQuestions) {
+      evaluateInterview()
+    }
+  }, [currentQuestion, currentQuestionIndex, totalQuestions])
+
   // Cleanup timer on unmount
   useEffect(() => {
     return () => {
@@ -201,6 +210,16 @@ export default function InterviewSession() {
 
   return (
     <div className="max-w-4xl mx-auto space-y-6">
+      {/* Question generation stopped early; the interview ends with what arrived */}
+      {error && (
+        <div className="bg-yellow-50 border border-yellow-200 rounded-lg p-4">
+          <p className="text-sm text-yellow-900">{error}</p>
+          <p className="text-sm text-yellow-800">
+            The interview continues with the {totalQuestions} questions generated.
+          </p>
+        </div>
+      )}
+
       {/* Interview Header */}
       <div className="bg-white rounded-lg shadow-sm border p-4">
         <div className="flex items-center justify-between">
@@ -208,7 +227,7 @@ export default function InterviewSession() {
             <div className="flex items-center space-x-2">
               <span className="text-sm font-medium text-gray-600">Question</span>
               <span className="bg-blue-100 text-blue-800 px-2 py-1 rounded text-sm font-medium">
-                {currentQuestionIndex + 1} of {questions.length}
+                {currentQuestionIndex + 1} of {totalQuestions}
               </span>
             </div>
             <span className={`px-2 py-1 rounded text-sm font-medium ${getDifficultyColor(currentQuestion.difficulty)}`}>
@@ -235,13 +254,13 @@ export default function InterviewSession() {
         <div className="flex items-center space-x-2 mb-2">
           <span className="text-sm font-medium text-gray-600">Progress</span>
           <span className="text-sm text-gray-500">
-            ({answers.length} answered, {questions.length - answers.length - 1} remaining)
+            ({answers.length} answered, {totalQuestions - answers.length - 1} remaining)
           </span>
         </div>
         <div className="w-full bg-gray-200 rounded-full h-2">
           <div 
             className="bg-blue-600 h-2 rounded-full transition-all duration-300"
-            style={{ width: `${((currentQuestionIndex) / questions.length) * 100}%` }}
+            style={{ width: `${((currentQuestionIndex) / totalQuestions) * 100}%` }}
           />
         </div>
       </div>
@@ -317,7 +336,7 @@ export default function InterviewSession() {
             <div className="text-xs text-gray-500">Minutes</div>
           </div>
           <div>
-            <div className="text-2xl font-bold text-purple-600">{questions.length - currentQuestionIndex - 1}</div>
+            <div className="text-2xl font-bold text-purple-600">{totalQuestions - currentQuestionIndex - 1}</div>
             <div className="text-xs text-gray-500">Remaining</div>
           </div>
         </div>
@@ -2,7 +2,10 @@
 
 import { useState } from 'react'
 import { useDispatch } from 'react-redux'
-import { startInterview, setError } from '../store/slices/interviewSlice'
+import { startInterview, addQuestion, endQuestionStream, setError } from '../store/slices/interviewSlice'
+
+// Every generated set has 2 Easy, 2 Medium and 2 Hard questions
+const QUESTIONS_PER_INTERVIEW = 6
 
 export default function InterviewSetup() {
   const dispatch = useDispatch()
@@ -87,7 +90,9 @@ export default function InterviewSetup() {
           ...formData,
           name: result.name || 'Candidate',
           email: result.email || 'candidate@example.com',
-          phone: result.phone || ''
+          phone: result.phone || '',
+          // Skills found in the resume replace the defaults; still editable
+          skills: result.skills?.length ? result.skills.join(', ') : formData.skills
         }
         
         console.log('📝 New formData after update:', newFormData)
@@ -128,8 +133,10 @@ export default function InterviewSetup() {
 
   const generateQuestions = async () => {
     setLoading(true)
+    let started = false
     try {
-      const response = await fetch('/api/generate-questions', {
+      // Streamed: the interview starts as soon as the first question is ready
+      const response = await fetch('/api/generate-questions?mode=stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'
@@ -137,31 +144,72 @@ export default function InterviewSetup() {
         body: JSON.stringify({
           role: formData.role,
           experience: formData.experience,
-          skills: formData.skills.split(',').map(s => s.trim())
+          skills: formData.skills.split(',').map(s => s.trim()),
+          candidateId: formData.email || undefined
         })
       })
 
-      const result = await response.json()
-      
-      if (result.success && result.questions) {
-        // Start the interview
-        const sessionId = Date.now().toString()
-        dispatch(startInterview({
-          sessionId,
-          candidateInfo: {
-            name: formData.name,
-            email: formData.email,
-            phone: formData.phone,
-            resume: resumeFile?.name
-          },
-          questions: result.questions
-        }))
-      } else {
-        dispatch(setError(result.error || 'Failed to generate questions'))
+      if (!response.ok || !response.body) {
+        const result = await response.json().catch(() => ({}))
+        dispatch(setError(result.error || result.detail || 'Failed to generate questions'))
+        setLoading(false)
+        return
+      }
+
+      let failed = false
+      const handleEvent = (event, data) => {
+        if (event === 'question') {
+          const { index, ...question } = data
+          if (started) {
+            dispatch(addQuestion(question))
+            return
+          }
+          started = true
+          setLoading(false)
+          dispatch(startInterview({
+            sessionId: Date.now().toString(),
+            candidateInfo: {
+              name: formData.name,
+              email: formData.email,
+              phone: formData.phone,
+              resume: resumeFile?.name
+            },
+            questions: [question],
+            totalQuestions: QUESTIONS_PER_INTERVIEW
+          }))
+        } else if (event === 'error') {
+          failed = true
+          dispatch(setError(data.error || 'Failed to generate questions'))
+        }
+      }
+
+      // Server-sent events: "event: <name>" and "data: <json>" lines, blank-line separated
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const messages = buffer.split('\n\n')
+        buffer = messages.pop()
+        for (const message of messages) {
+          const event = message.match(/^event: (.*)$/m)?.[1]
+          const data = message.match(/^data: (.*)$/m)?.[1]
+          if (event && data) handleEvent(event, JSON.parse(data))
+        }
+      }
+
+      if (!started && !failed) {
+        dispatch(setError('Failed to generate questions'))
       }
     } catch (error) {
       dispatch(setError('Failed to generate questions'))
     }
+    // However the stream ended, the interview is as long as what arrived
+    if (started) {
+      dispatch(endQuestionStream())
+    }
     setLoading(false)
   }
 
@@ -1,5 +1,9 @@
 import { createSlice } from '@reduxjs/toolkit'
 
+// Unknown difficulties are placed with the Medium questions
+const DIFFICULTY_RANK = { Easy: 0, Medium: 1, Hard: 2 }
+const difficultyRank = (question) => DIFFICULTY_RANK[question.difficulty] ?? 1
+
 const initialState = {
   // Interview session data
   sessionId: null,
@@ -12,6 +16,8 @@ const initialState = {
   
   // Questions and flow
   questions: [],
+  // Questions may still be streaming in when the interview starts
+  totalQuestions: 0,
   currentQuestionIndex: 0,
   answers: [],
   
@@ -42,6 +48,7 @@ const interviewSlice = createSlice({
       state.sessionId = action.payload.sessionId
       state.candidateInfo = action.payload.candidateInfo
       state.questions = action.payload.questions
+      state.totalQuestions = action.payload.totalQuestions || action.payload.questions.length
       state.status = 'in-progress'
       state.startTime = new Date().toISOString()
       state.currentQuestionIndex = 0
@@ -66,6 +73,25 @@ const interviewSlice = createSlice({
     resetInterview: (state) => {
       return initialState
     },
+
+    // Streamed questions arrive in the model's order; the ones not shown yet
+    // are kept ordered from Easy to Hard
+    addQuestion: (state, action) => {
+      const rank = difficultyRank(action.payload)
+      let position = state.questions.length
+      while (
+        position > state.currentQuestionIndex + 1 &&
+        difficultyRank(state.questions[position - 1]) > rank
+      ) {
+        position -= 1
+      }
+      state.questions.splice(position, 0, action.payload)
+    },
+
+    // The question stream ended; the interview has the questions that arrived
+    endQuestionStream: (state) => {
+      state.totalQuestions = state.questions.length
+    },
     
     // Question navigation
     setCurrentQuestion: (state, action) => {
@@ -78,7 +104,8 @@ const interviewSlice = createSlice({
     },
     
     nextQuestion: (state) => {
-      if (state.currentQuestionIndex < state.questions.length - 1) {
+      // The next question may not have arrived yet; its timer starts when it does
+      if (state.currentQuestionIndex < state.totalQuestions - 1) {
         state.currentQuestionIndex += 1
         const currentQuestion = state.questions[state.currentQuestionIndex]
         if (currentQuestion) {
@@ -174,6 +201,8 @@ export const {
   abandonInterview,
   completeInterview,
   resetInterview,
+  addQuestion,
+  endQuestionStream,
   setCurrentQuestion,
   nextQuestion,
   startTimer,